@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark the fast rule-based cleaning mode against the spaCy-based cleaning.
+Run this script with a recorded feed sample (the raw JSON body returned by
+the /active-freelance-1h endpoint) to compare throughput and output agreement.
+
+Usage:
+    python benchmark_cleaning.py data/feed_samples.json [--repeat 3]
+"""
+
+import argparse
+import json
+import sys
+import time
+from utils.web_scraper import UpworkScraper
+
+def load_samples(path):
+    """Load raw feed jobs from a recorded response body"""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    jobs = data if isinstance(data, list) else data.get("data", [])
+    return [job for job in jobs if isinstance(job, dict)]
+
+def clean_all(scraper, jobs):
+    """Clean every title and description, returning the outputs in order"""
+    return [
+        (scraper._clean_job_title(job.get('title', '')),
+         scraper._clean_job_description(job.get('description_text', '')))
+        for job in jobs
+    ]
+
+def time_cleaning(scraper, jobs, repeat):
+    """Return the best jobs/second over several runs, plus the outputs"""
+    best = None
+    outputs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        outputs = clean_all(scraper, jobs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(jobs) / best if best else 0.0, outputs
+
+def token_overlap(a, b):
+    """Jaccard similarity of the lowercase word sets of two strings"""
+    a_tokens, b_tokens = set(a.lower().split()), set(b.lower().split())
+    if not a_tokens and not b_tokens:
+        return 1.0
+    return len(a_tokens & b_tokens) / len(a_tokens | b_tokens)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare spaCy and fast job cleaning modes")
+    parser.add_argument("samples", help="Path to a recorded feed response (JSON)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per mode (best is reported)")
+    args = parser.parse_args()
+
+    jobs = load_samples(args.samples)
+    if not jobs:
+        print(f"❌ No jobs found in {args.samples}")
+        sys.exit(1)
+
+    print(f"Benchmarking cleaning on {len(jobs)} recorded jobs ({args.repeat} runs per mode)")
+    print("=" * 60)
+
+    spacy_rate, spacy_out = time_cleaning(UpworkScraper(cleaning_mode='spacy'), jobs, args.repeat)
+    fast_rate, fast_out = time_cleaning(UpworkScraper(cleaning_mode='fast'), jobs, args.repeat)
+
+    title_exact = sum(1 for s, f in zip(spacy_out, fast_out) if s[0] == f[0]) / len(jobs)
+    desc_exact = sum(1 for s, f in zip(spacy_out, fast_out) if s[1] == f[1]) / len(jobs)
+    title_overlap = sum(token_overlap(s[0], f[0]) for s, f in zip(spacy_out, fast_out)) / len(jobs)
+    desc_overlap = sum(token_overlap(s[1], f[1]) for s, f in zip(spacy_out, fast_out)) / len(jobs)
+
+    print(f"spaCy mode: {spacy_rate:10.1f} jobs/sec")
+    print(f"fast mode:  {fast_rate:10.1f} jobs/sec ({fast_rate / spacy_rate if spacy_rate else 0:.1f}x)")
+    print()
+    print(f"Title agreement:       {title_exact:.1%} exact, {title_overlap:.1%} mean token overlap")
+    print(f"Description agreement: {desc_exact:.1%} exact, {desc_overlap:.1%} mean token overlap")
+
+if __name__ == "__main__":
+    main()
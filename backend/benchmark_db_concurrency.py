@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark database access: ingesting a batch of jobs row by row versus in one
+executemany transaction, then reader threads listing scraped jobs while a writer
+thread inserts batches at a steady rate, as the API does during a scrape.
+Runs against a throwaway database in a temporary directory.
+
+Usage:
+    python benchmark_db_concurrency.py --seed 5000 --threads 1,2,4,8 --seconds 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+WORDS = ("python django react api scraper dashboard migrate deploy docker aws postgres sqlite "
+         "automation pipeline report design mobile payment search analytics chatbot crawler").split()
+
+def make_job(i):
+    # Distinct text per job, so near-duplicate detection sees realistic, mostly unrelated postings
+    rng = random.Random(i)
+    return {
+        'job_title': f"Benchmark job {i}: {' '.join(rng.sample(WORDS, 3))}",
+        'job_url': f"https://www.upwork.com/jobs/~bench{i:08d}",
+        'job_description': ' '.join(rng.choice(WORDS) for _ in range(40)),
+        'required_skills': ['Python', 'SQL', 'REST'],
+        'client_name': f"Client {i % 97}",
+        'client_rating': 4.5,
+        'client_total_jobs': i % 40,
+        'client_total_hires': i % 20,
+        'client_avg_review': 4.7,
+        'budget_range': '$20-$40',
+        'avg_pay_rate': 30.0,
+        'project_duration': '1 to 3 months',
+        'job_category': 'Web',
+        'posted_date': '2026-10-19T10:00:00Z'
+    }
+
+def bench_ingest(db, count, start):
+    """Time storing `count` jobs one commit per row and then as one batch, returning the next id"""
+    began = time.perf_counter()
+    for i in range(start, start + count):
+        job = make_job(i)
+        db.add_scraped_job(**job)
+    row_by_row = time.perf_counter() - began
+    start += count
+
+    began = time.perf_counter()
+    results = db.add_scraped_jobs([make_job(i) for i in range(start, start + count)])
+    batched = time.perf_counter() - began
+    inserted = sum(1 for result in results if result['status'] == 'inserted')
+    print(f"Ingest {count} jobs: {row_by_row * 1000:.0f} ms row by row, {batched * 1000:.0f} ms batched "
+          f"({inserted} inserted, {row_by_row / batched:.1f}x faster)")
+    return start + count
+
+def run_round(db, readers, seconds, read_limit, write_batch, write_rate, next_id):
+    """Run readers and one writer for the given time, returning (reads, rows written, failed writes, next id)"""
+    stop = threading.Event()
+    reads = [0] * readers
+    writes = {"rows": 0, "errors": 0, "next_id": next_id}
+
+    def reader(index):
+        while not stop.is_set():
+            db.get_scraped_jobs(limit=read_limit)
+            reads[index] += 1
+
+    def writer():
+        # Paced so the table grows by the same amount in every round
+        while not stop.wait(1 / write_rate):
+            start = writes["next_id"]
+            writes["next_id"] += write_batch
+            results = db.add_scraped_jobs([make_job(i) for i in range(start, start + write_batch)])
+            writes["rows"] += sum(1 for result in results if result['status'] == 'inserted')
+            writes["errors"] += sum(1 for result in results if result['status'] != 'inserted')
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(reads), writes["rows"], writes["errors"], writes["next_id"]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent SQLite reads during writes")
+    parser.add_argument("--seed", type=int, default=5000, help="Jobs stored before measuring")
+    parser.add_argument("--threads", default="1,2,4,8", help="Comma-separated reader thread counts")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Duration of each round")
+    parser.add_argument("--read-limit", type=int, default=50, help="Jobs per list query")
+    parser.add_argument("--write-batch", type=int, default=10, help="Jobs per write transaction")
+    parser.add_argument("--write-rate", type=float, default=20, help="Write transactions per second")
+    parser.add_argument("--ingest", type=int, default=1000, help="Jobs per ingest timing (0 to skip)")
+    args = parser.parse_args()
+
+    # Database() opens data/freelancer.db relative to the working directory
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    workdir = tempfile.mkdtemp(prefix="db-bench-")
+    os.chdir(workdir)
+    os.environ.setdefault('NEAR_DUPLICATE_MODE', 'off')
+    from models.database import Database
+
+    db = Database()
+    print(f"Seeding {args.seed} jobs in {workdir}")
+    for start in range(0, args.seed, 500):
+        db.add_scraped_jobs([make_job(i) for i in range(start, min(start + 500, args.seed))])
+    journal_mode = db.conn.execute('PRAGMA journal_mode').fetchone()[0]
+    print(f"Journal mode: {journal_mode}, {args.seconds:.0f}s per round, "
+          f"one writer at {args.write_rate:.0f} transactions/sec, {os.cpu_count()} CPUs")
+    print("=" * 60)
+
+    next_id = args.seed
+    if args.ingest:
+        next_id = bench_ingest(db, args.ingest, next_id)
+
+    baseline = None
+    for readers in [int(n) for n in args.threads.split(',') if n.strip()]:
+        reads, rows, errors, next_id = run_round(db, readers, args.seconds, args.read_limit,
+                                                 args.write_batch, args.write_rate, next_id)
+        reads_per_sec = reads / args.seconds
+        baseline = baseline or reads_per_sec
+        print(f"{readers:>2} readers: {reads_per_sec:8.1f} reads/sec ({reads_per_sec / baseline:.2f}x), "
+              f"{rows / args.seconds:8.1f} rows written/sec, {errors} failed writes, "
+              f"{db.connection_count()} connections")
+
+    db.cleanup()
+    print("✅ Benchmark finished")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark event loop lag of the API under mixed load: concurrent job list reads and
+proposal status writes go through the ASGI app while another connection holds the
+SQLite write lock for a while at a time, as a long ingest commit does. Each round
+sets DB_EXECUTOR_WORKERS; 0 runs database calls on the event loop (the old behaviour).
+Runs against a throwaway database in a temporary directory.
+
+Usage:
+    python benchmark_event_loop_lag.py --workers 0,4 --seconds 5 --lock-ms 200
+"""
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0.0
+
+def hold_write_lock(db_path, hold_ms, every_ms, stop):
+    """Take the write lock for `hold_ms` every `every_ms` until stopped"""
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        while not stop.wait(every_ms / 1000):
+            conn.execute('BEGIN IMMEDIATE')
+            time.sleep(hold_ms / 1000)
+            conn.execute('COMMIT')
+    finally:
+        conn.close()
+
+async def run_round(app, monitor, seconds, readers, writers, proposal_id):
+    """Drive readers and writers for the given time, returning per-kind latencies in ms"""
+    import httpx
+
+    latencies = {"read": [], "write": []}
+    deadline = time.perf_counter() + seconds
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def reader():
+            while time.perf_counter() < deadline:
+                began = time.perf_counter()
+                response = await client.get("/api/v1/jobs/scraped", params={"limit": 50})
+                response.raise_for_status()
+                latencies["read"].append((time.perf_counter() - began) * 1000)
+
+        async def writer(index):
+            while time.perf_counter() < deadline:
+                began = time.perf_counter()
+                response = await client.put(f"/api/v1/proposals/{proposal_id}",
+                                            json={"status": f"Viewed {index}"})
+                response.raise_for_status()
+                latencies["write"].append((time.perf_counter() - began) * 1000)
+                await asyncio.sleep(0.05)
+
+        monitor.start()
+        await asyncio.gather(*[reader() for _ in range(readers)], *[writer(i) for i in range(writers)])
+        await monitor.stop()
+    return latencies
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark event loop lag with blocking and pooled database calls")
+    parser.add_argument("--seed", type=int, default=5000, help="Jobs stored before measuring")
+    parser.add_argument("--workers", default="0,4", help="Comma-separated DB_EXECUTOR_WORKERS values")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Duration of each round")
+    parser.add_argument("--readers", type=int, default=8, help="Concurrent job list readers")
+    parser.add_argument("--writers", type=int, default=2, help="Concurrent proposal status writers")
+    parser.add_argument("--lock-ms", type=float, default=200, help="How long the competing writer holds the lock")
+    parser.add_argument("--lock-every-ms", type=float, default=300, help="Pause between competing lock holds")
+    args = parser.parse_args()
+
+    # Database() opens data/freelancer.db relative to the working directory
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    workdir = tempfile.mkdtemp(prefix="loop-lag-bench-")
+    os.chdir(workdir)
+    os.environ.setdefault('NEAR_DUPLICATE_MODE', 'off')
+    from benchmark_db_concurrency import make_job
+    from models.database import Database, DB_PATH
+    from models.async_database import shutdown_db_executor
+    from utils.loop_monitor import EventLoopLagMonitor
+    import main as api
+
+    db = Database()
+    print(f"Seeding {args.seed} jobs in {workdir}")
+    for start in range(0, args.seed, 500):
+        db.add_scraped_jobs([make_job(i) for i in range(start, min(start + 500, args.seed))])
+    profile_id = db.add_freelancer_profile("Benchmark", "bench@example.com", 40, ["Python"], 5)
+    proposal_id = db.add_successful_proposal(profile_id, "Benchmark job", "Proposal text")
+    print(f"{args.readers} readers, {args.writers} writers, {args.seconds:.0f}s per round, "
+          f"write lock held {args.lock_ms:.0f} ms every {args.lock_every_ms:.0f} ms, {os.cpu_count()} CPUs")
+    print("=" * 60)
+
+    for workers in [int(n) for n in args.workers.split(',') if n.strip()]:
+        os.environ['DB_EXECUTOR_WORKERS'] = str(workers)
+        shutdown_db_executor()
+        monitor = EventLoopLagMonitor(interval_ms=10, window=100000, warn_ms=float('inf'))
+
+        stop = threading.Event()
+        locker = threading.Thread(target=hold_write_lock, args=(str(DB_PATH), args.lock_ms, args.lock_every_ms, stop))
+        locker.start()
+        try:
+            latencies = asyncio.run(run_round(api.app, monitor, args.seconds, args.readers, args.writers,
+                                              proposal_id))
+        finally:
+            stop.set()
+            locker.join()
+
+        lag = monitor.status()
+        reads, writes = latencies["read"], latencies["write"]
+        print(f"{workers} workers: loop lag p50 {lag['p50_lag_ms']} ms, p99 {lag['p99_lag_ms']} ms, "
+              f"max {lag['max_lag_ms']} ms")
+        print(f"   {len(reads) / args.seconds:7.1f} reads/sec (p50 {percentile(reads, 0.5):.1f} ms, "
+              f"p99 {percentile(reads, 0.99):.1f} ms), {len(writes) / args.seconds:5.1f} writes/sec "
+              f"(p99 {percentile(writes, 0.99):.1f} ms)")
+
+    shutdown_db_executor()
+    db.cleanup()
+    print("✅ Benchmark finished")
+
+if __name__ == "__main__":
+    main()
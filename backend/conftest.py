@@ -0,0 +1,15 @@
+"""
+pytest setup for the offline checks in this directory (python -m pytest).
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Database() opens data/freelancer.db relative to the working directory, and the
+# singleton is shared by every test module, so the whole session uses one throwaway copy
+os.chdir(tempfile.mkdtemp(prefix="backend-checks-"))
+
+# Scripts that drive a running server or the Groq API, run by hand with python
+collect_ignore = ["test_endpoints.py", "test_groq.py", "test_profiles.py", "cli_test.py"]
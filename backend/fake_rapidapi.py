@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the upwork-jobs-api2 RapidAPI endpoints used by UpworkScraper
+(/active-freelance-1h and /job/{id}). Use it to load-test scraping without
+network access or spending quota.
+
+Multi-key testing: --keys accepts only the listed API keys (others get 401), and
+--key-quota / --key-rps give each key its own quota and per-second limit (429).
+
+Modes:
+    synthetic  Generate jobs on the fly (default)
+    replay     Serve responses recorded earlier (--replay DIR)
+    record     Proxy to the real API and save each response (--record DIR)
+
+Usage:
+    python fake_rapidapi.py --latency-ms 300 --rate-429 0.1 --jobs 200
+    python fake_rapidapi.py --record recordings/   # needs RAPIDAPI_KEY
+    python fake_rapidapi.py --replay recordings/
+    python fake_rapidapi.py --keys k1,k2,k3 --key-rps 2 --key-quota 500
+
+Then point the backend at it:
+    RAPIDAPI_BASE_URL=http://localhost:8081 uvicorn main:app
+"""
+
+import argparse
+import asyncio
+import itertools
+from collections import defaultdict, deque
+import json
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from fastapi import FastAPI, Header, Response
+
+UPSTREAM_URL = "https://upwork-jobs-api2.p.rapidapi.com"
+UPSTREAM_HOST = "upwork-jobs-api2.p.rapidapi.com"
+
+SKILLS = ["Python", "JavaScript", "React", "Node.js", "Django", "FastAPI", "SQL", "AWS",
+          "Docker", "Web Scraping", "Machine Learning", "WordPress", "Shopify", "UI/UX Design"]
+CATEGORIES = ["Web Development", "Data Science & Analytics", "Mobile Development", "Design & Creative"]
+WORDS = ("we need an experienced developer to build maintain and improve our platform with clean "
+         "tested code the project includes api integration database design deployment and support").split()
+
+class FakeRapidAPI:
+    """Configurable fake with latency, 429 injection, per-key limits, payload sizing and record/replay"""
+
+    def __init__(self, latency_ms=0, jitter_ms=0, rate_429=0.0, retry_after=2, jobs=50,
+                 description_chars=1200, quota=1000, replay_dir=None, record_dir=None, seed=1,
+                 keys=None, key_quota=None, key_rps=0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.jobs = jobs
+        self.description_chars = description_chars
+        self.quota = quota
+        self.replay_dir = Path(replay_dir) if replay_dir else None
+        self.record_dir = Path(record_dir) if record_dir else None
+        self.random = random.Random(seed)
+        self.counter = itertools.count()
+        # Each generated job is posted one second after the previous one, like a live feed
+        self.started = datetime.now(timezone.utc)
+        self.keys = set(keys) if keys else None
+        self.key_quota = key_quota
+        self.key_rps = key_rps
+        self._replay_feeds = None
+        self.reset()
+
+    def reset(self):
+        self.remaining = self.quota
+        self.key_remaining = defaultdict(lambda: self.key_quota)
+        self._key_windows = defaultdict(deque)
+        self.stats = {"requests": 0, "throttled": 0, "unauthorized": 0, "served": 0}
+        self.key_stats = defaultdict(lambda: {"requests": 0, "throttled": 0, "unauthorized": 0})
+
+    def _rate_limit_headers(self, api_key=None):
+        if self.key_quota is not None:
+            limit, remaining = self.key_quota, self.key_remaining[api_key]
+        else:
+            limit, remaining = self.quota, self.remaining
+        return {
+            "X-RateLimit-Requests-Limit": str(limit),
+            "X-RateLimit-Requests-Remaining": str(max(remaining, 0)),
+            "X-RateLimit-Requests-Reset": "3600"
+        }
+
+    async def _simulate_latency(self):
+        delay = self.latency_ms + self.random.uniform(0, self.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+    def _key_over_rps(self, api_key):
+        """Sliding one-second window of requests per key"""
+        if not self.key_rps:
+            return False
+        window = self._key_windows[api_key]
+        now = time.monotonic()
+        while window and window[0] <= now - 1:
+            window.popleft()
+        if len(window) >= self.key_rps:
+            return True
+        window.append(now)
+        return False
+
+    def _throttle(self, api_key=None):
+        """Return a 401 or 429 response if this request should be rejected"""
+        self.stats["requests"] += 1
+        key_stats = self.key_stats[api_key or "-"]
+        key_stats["requests"] += 1
+        if self.keys is not None and api_key not in self.keys:
+            self.stats["unauthorized"] += 1
+            key_stats["unauthorized"] += 1
+            return Response(json.dumps({"message": "You are not subscribed to this API."}), status_code=401,
+                            media_type="application/json")
+        remaining = self.key_remaining[api_key] if self.key_quota is not None else self.remaining
+        if remaining <= 0 or self._key_over_rps(api_key) or self.random.random() < self.rate_429:
+            self.stats["throttled"] += 1
+            key_stats["throttled"] += 1
+            headers = self._rate_limit_headers(api_key)
+            headers["Retry-After"] = str(self.retry_after)
+            return Response(json.dumps({"message": "Too many requests"}), status_code=429,
+                            media_type="application/json", headers=headers)
+        if self.key_quota is not None:
+            self.key_remaining[api_key] -= 1
+        else:
+            self.remaining -= 1
+        return None
+
+    def make_job(self, job_id=None):
+        n = next(self.counter)
+        job_id = job_id or f"0{1000000000000000000 + n}"
+        words = []
+        while sum(len(w) + 1 for w in words) < self.description_chars:
+            words.append(self.random.choice(WORDS))
+        sentences = [' '.join(words[i:i + 12]).capitalize() + '.' for i in range(0, len(words), 12)]
+        hourly = self.random.random() < 0.6
+        job = {
+            "id": job_id,
+            "title": f"{self.random.choice(['Need', 'Looking for', 'Hiring'])} {self.random.choice(SKILLS)} developer - {self.random.choice(['long term', 'urgent', 'small fix'])}",
+            "url": f"https://www.upwork.com/jobs/~{job_id}",
+            "description_text": ' '.join(sentences),
+            "skills": [{"name": s} for s in self.random.sample(SKILLS, 4)],
+            "category": self.random.choice(CATEGORIES),
+            "client_score": round(self.random.uniform(3.0, 5.0), 2),
+            "client_open_jobs": self.random.randint(0, 20),
+            "client_jobs_with_hires": self.random.randint(0, 50),
+            "date_posted": (self.started + timedelta(seconds=n)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            "engagement_duration": {"label": self.random.choice(["Less than 1 month", "1 to 3 months", "More than 6 months"])},
+            "project_budget_currency": "USD"
+        }
+        if hourly:
+            low = self.random.randint(10, 60)
+            job.update({"project_budget_hourly_min": low, "project_budget_hourly_max": low + self.random.randint(5, 40)})
+        else:
+            job["project_budget_total"] = self.random.randint(50, 5000)
+        return job
+
+    def _replay_feed_body(self):
+        """Cycle through recorded feed responses"""
+        if self._replay_feeds is None:
+            files = sorted((self.replay_dir / "active-freelance-1h").glob("*.json"))
+            self._replay_feeds = itertools.cycle(files) if files else None
+        if self._replay_feeds is None:
+            return None
+        return next(self._replay_feeds).read_bytes()
+
+    def _record(self, *parts, body: bytes):
+        path = self.record_dir.joinpath(*parts)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(body)
+
+    async def _proxy(self, path, params):
+        """Forward a request to the real API (record mode)"""
+        import requests
+        headers = {"X-RapidAPI-Key": os.getenv("RAPIDAPI_KEY", ""), "X-RapidAPI-Host": UPSTREAM_HOST}
+        upstream = await asyncio.to_thread(requests.get, f"{UPSTREAM_URL}{path}", headers=headers,
+                                           params=params, timeout=30)
+        return upstream.status_code, upstream.content
+
+    async def feed(self, limit: int, api_key: str = None):
+        await self._simulate_latency()
+        throttled = self._throttle(api_key)
+        if throttled:
+            return throttled
+        if self.record_dir:
+            status, body = await self._proxy("/active-freelance-1h", {"limit": limit})
+            if status == 200:
+                self._record("active-freelance-1h", f"{int(time.time() * 1000)}.json", body=body)
+            return Response(body, status_code=status, media_type="application/json")
+        if self.replay_dir:
+            body = self._replay_feed_body()
+            if body is None:
+                return Response(json.dumps({"message": "No recorded feed responses"}), status_code=404,
+                                media_type="application/json")
+        else:
+            body = json.dumps([self.make_job() for _ in range(min(limit, self.jobs))]).encode()
+        self.stats["served"] += 1
+        return Response(body, media_type="application/json", headers=self._rate_limit_headers(api_key))
+
+    async def job(self, job_id: str, api_key: str = None):
+        await self._simulate_latency()
+        throttled = self._throttle(api_key)
+        if throttled:
+            return throttled
+        if self.record_dir:
+            status, body = await self._proxy(f"/job/{job_id}", None)
+            if status == 200:
+                self._record("job", f"{job_id}.json", body=body)
+            return Response(body, status_code=status, media_type="application/json")
+        if self.replay_dir:
+            path = self.replay_dir / "job" / f"{job_id}.json"
+            if not path.exists():
+                return Response(json.dumps({"message": "Job not found"}), status_code=404,
+                                media_type="application/json")
+            body = path.read_bytes()
+        else:
+            body = json.dumps(self.make_job(job_id)).encode()
+        self.stats["served"] += 1
+        return Response(body, media_type="application/json", headers=self._rate_limit_headers(api_key))
+
+def create_app(fake: FakeRapidAPI) -> FastAPI:
+    app = FastAPI(title="Fake upwork-jobs-api2")
+
+    @app.get("/active-freelance-1h")
+    async def active_freelance(limit: int = 10, x_rapidapi_key: str = Header(None)):
+        return await fake.feed(limit, x_rapidapi_key)
+
+    @app.get("/job/{job_id}")
+    async def job_details(job_id: str, x_rapidapi_key: str = Header(None)):
+        return await fake.job(job_id, x_rapidapi_key)
+
+    @app.get("/_stats")
+    async def stats():
+        return {**fake.stats, "quota_remaining": fake.remaining, "per_key": dict(fake.key_stats)}
+
+    @app.post("/_reset")
+    async def reset():
+        fake.reset()
+        return {"status": "ok"}
+
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the upwork-jobs-api2 RapidAPI endpoints")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Base latency added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Random extra latency (0..jitter)")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Probability of answering 429")
+    parser.add_argument("--retry-after", type=int, default=2, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--jobs", type=int, default=50, help="Maximum jobs per feed response")
+    parser.add_argument("--description-chars", type=int, default=1200, help="Approximate description length")
+    parser.add_argument("--quota", type=int, default=1000, help="Requests before every call returns 429")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--keys", default=None, help="Comma-separated API keys to accept (others get 401)")
+    parser.add_argument("--key-quota", type=int, default=None, help="Requests per key before it gets 429")
+    parser.add_argument("--key-rps", type=float, default=0, help="Requests per second allowed per key")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--replay", metavar="DIR", help="Serve responses recorded with --record")
+    mode.add_argument("--record", metavar="DIR", help="Proxy to the real API and save responses")
+    args = parser.parse_args()
+
+    fake = FakeRapidAPI(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, rate_429=args.rate_429,
+                        retry_after=args.retry_after, jobs=args.jobs, description_chars=args.description_chars,
+                        quota=args.quota, replay_dir=args.replay, record_dir=args.record, seed=args.seed,
+                        keys=args.keys.split(',') if args.keys else None, key_quota=args.key_quota,
+                        key_rps=args.key_rps)
+
+    import uvicorn
+    uvicorn.run(create_app(fake), host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
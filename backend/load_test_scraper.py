@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Load-test the scrape pipeline against the local RapidAPI stand-in.
+Start fake_rapidapi.py first, then run this script to measure concurrency,
+rate limiting behaviour and mapping throughput of UpworkScraper.
+
+Usage:
+    python fake_rapidapi.py --latency-ms 200 --rate-429 0.05 &
+    python load_test_scraper.py --base-url http://localhost:8081 --workers 4 --rounds 10
+
+Key pool rotation (one token bucket per key):
+    python fake_rapidapi.py --keys k1,k2,k3 --key-rps 2 &
+    python load_test_scraper.py --keys k1,k2,k3,bad-key --min-delay 0.5
+"""
+
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+
+def run_worker(base_url, rounds, max_jobs, min_delay, cleaning_mode):
+    """Run one scraper through several feed pulls, returning per-round (latency, jobs) pairs"""
+    os.environ['RAPIDAPI_BASE_URL'] = base_url
+    from utils.web_scraper import UpworkScraper
+    scraper = UpworkScraper(cleaning_mode=cleaning_mode)
+    for key in scraper.key_pool.keys:
+        key.rate_limiter.min_interval = key.rate_limiter.interval = min_delay
+
+    results = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        jobs = list(scraper.iter_jobs("load-test", max_jobs))
+        results.append((time.perf_counter() - start, len(jobs)))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test UpworkScraper against fake_rapidapi.py")
+    parser.add_argument("--base-url", default="http://localhost:8081")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent scraper instances")
+    parser.add_argument("--rounds", type=int, default=5, help="Feed pulls per worker")
+    parser.add_argument("--max-jobs", type=int, default=50, help="Jobs requested per pull")
+    parser.add_argument("--min-delay", type=float, default=0.0, help="Scraper minimum delay between requests")
+    parser.add_argument("--cleaning-mode", default="fast", choices=["spacy", "fast"])
+    parser.add_argument("--keys", default=None, help="Comma-separated API keys for the key pool (RAPIDAPI_KEYS)")
+    args = parser.parse_args()
+    if args.keys:
+        os.environ['RAPIDAPI_KEYS'] = args.keys
+
+    try:
+        requests.post(f"{args.base_url}/_reset", timeout=5)
+    except requests.exceptions.RequestException:
+        print(f"❌ Could not reach the fake API at {args.base_url}. Start fake_rapidapi.py first.")
+        return
+
+    print(f"Load testing {args.base_url} with {args.workers} workers x {args.rounds} rounds")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(run_worker, args.base_url, args.rounds, args.max_jobs,
+                               args.min_delay, args.cleaning_mode) for _ in range(args.workers)]
+        results = [r for f in futures for r in f.result()]
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, _ in results)
+    total_jobs = sum(count for _, count in results)
+    empty = sum(1 for _, count in results if count == 0)
+    stats = requests.get(f"{args.base_url}/_stats", timeout=5).json()
+
+    print(f"Pulls:            {len(results)} ({empty} returned no jobs)")
+    print(f"Jobs mapped:      {total_jobs} in {elapsed:.2f}s ({total_jobs / elapsed:.1f} jobs/sec)")
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(f"Pull latency:     p50 {statistics.median(latencies):.3f}s, p95 {p95:.3f}s, max {latencies[-1]:.3f}s")
+    print(f"Upstream calls:   {stats['requests']} ({stats['throttled']} answered with 429, "
+          f"{stats.get('unauthorized', 0)} with 401)")
+    for key, key_stats in sorted(stats.get('per_key', {}).items()):
+        print(f"  key {key[-4:]:>6}:    {key_stats['requests']} calls, {key_stats['throttled']} x 429, "
+              f"{key_stats['unauthorized']} x 401")
+
+if __name__ == "__main__":
+    main()
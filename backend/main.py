@@ -1,11 +1,35 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from routers import profiles, jobs, proposals, analytics
+from routers import profiles, jobs, proposals, analytics, admin
+from models.async_database import shutdown_db_executor
+from utils.ingester import get_ingester
+from utils.scrape_tasks import get_task_worker
+from utils.loop_monitor import get_loop_monitor
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Sample event loop lag for /api/v1/admin/event-loop
+    loop_monitor = get_loop_monitor()
+    loop_monitor.start()
+    # Resume background scrape tasks left unfinished by a previous worker
+    task_worker = get_task_worker()
+    task_worker.start()
+    # Start the optional background feed ingester (INGESTER_ENABLED=true)
+    ingester = get_ingester()
+    if ingester.enabled:
+        ingester.start()
+    yield
+    ingester.stop()
+    task_worker.stop()
+    await loop_monitor.stop()
+    shutdown_db_executor()
 
 app = FastAPI(
     title="Upwork Job Analyzer API",
     description="AI-powered job analysis and proposal generation for freelancers",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware for frontend integration
@@ -20,6 +44,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Lets the browser read pagination cursors and task status URLs
+    expose_headers=["X-Next-Cursor", "Location"],
 )
 
 @app.get("/")
@@ -44,6 +70,7 @@ app.include_router(profiles.router, prefix="/api/v1")
 app.include_router(jobs.router, prefix="/api/v1")
 app.include_router(proposals.router, prefix="/api/v1")
 app.include_router(analytics.router, prefix="/api/v1")
+app.include_router(admin.router, prefix="/api/v1")
 
 if __name__ == "__main__":
     import uvicorn
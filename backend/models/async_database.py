@@ -0,0 +1,72 @@
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+from models.database import Database
+
+_executor = None
+_executor_lock = threading.Lock()
+_stats = {"calls": 0, "in_flight": 0}
+
+def get_db_executor():
+    """
+    Return the process-wide pool that runs database calls for async code, sized by
+    DB_EXECUTOR_WORKERS. With 0 workers there is no pool and calls run on the event loop.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = int(os.getenv('DB_EXECUTOR_WORKERS', '4'))
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="db") if workers > 0 else False
+        return _executor or None
+
+def shutdown_db_executor():
+    """Wait for queued database calls and drop the pool (the next call creates a new one)"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor:
+        executor.shutdown(wait=True)
+
+def db_executor_status() -> Dict:
+    executor = get_db_executor()
+    return {
+        "workers": executor._max_workers if executor else 0,
+        "calls": _stats["calls"],
+        "in_flight": _stats["in_flight"]
+    }
+
+async def run_db(func, *args, **kwargs):
+    """Run a blocking database call in the database pool and await its result"""
+    _stats["calls"] += 1
+    executor = get_db_executor()
+    if executor is None:
+        return func(*args, **kwargs)
+    _stats["in_flight"] += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(executor, functools.partial(func, *args, **kwargs))
+    finally:
+        _stats["in_flight"] -= 1
+
+class AsyncDatabase:
+    """
+    Awaitable view of Database for the async routes: every public Database method is
+    available under the same name and arguments, returning a coroutine that runs the call
+    in the database pool. A commit waiting on the write lock then holds up only its own
+    request, not every request on the event loop. Pool threads keep their own connection.
+    """
+
+    def __init__(self, db: Database = None):
+        self.sync = db or Database()
+
+    def __getattr__(self, name):
+        attr = getattr(self.sync, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def call(*args, **kwargs):
+            return await run_db(attr, *args, **kwargs)
+        return call
@@ -1,11 +1,36 @@
 import sqlite3
 import json
+import os
+import re
 from pathlib import Path
 from datetime import datetime
 import threading
 import atexit
+from utils.near_duplicates import (
+    NEAR_DUPLICATE_MODE, NEAR_DUPLICATE_THRESHOLD, minhash_signature, signature_to_blob,
+    signature_from_blob, lsh_buckets, estimate_similarity
+)
+from utils.seen_urls import get_seen_urls
+from models.migrations import migrate
+
+# Search terms are matched as quoted FTS5 strings; a trailing * keeps prefix matching
+_SEARCH_TERM_RE = re.compile(r'(\w+)(\*?)')
+# Column weights for bm25(): title, description, skills
+SEARCH_WEIGHTS = (10.0, 1.0, 5.0)
+
+DB_PATH = Path("data/freelancer.db")
+# Connection tuning: how long a writer waits for the lock, page cache per connection, memory-mapped I/O
+DB_BUSY_TIMEOUT_MS = int(os.getenv('DB_BUSY_TIMEOUT_MS', '5000'))
+DB_CACHE_SIZE_KB = int(os.getenv('DB_CACHE_SIZE_KB', '8192'))
+DB_MMAP_SIZE = int(os.getenv('DB_MMAP_SIZE', str(64 * 1024 * 1024)))
 
 class Database:
+    """
+    Process-wide database access. Each thread gets its own SQLite connection
+    (opened on first use), so concurrent requests neither serialize on nor
+    interleave transactions on a shared connection. The database runs in WAL
+    mode, which lets readers proceed while a write is being committed.
+    """
     _instance = None
     _lock = threading.Lock()
     _initialized = False
@@ -26,26 +51,75 @@ class Database:
                 return
                 
             try:
-                db_path = Path("data/freelancer.db")
-                db_path.parent.mkdir(parents=True, exist_ok=True)
-                
-                self.conn = sqlite3.connect(str(db_path), check_same_thread=False)
-                self.conn.row_factory = sqlite3.Row
-                
+                DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+                self._local = threading.local()
+                self._connections = []
+                self._connections_lock = threading.Lock()
+                # WAL is persistent in the database file, so setting it once is enough
+                self.conn.execute('PRAGMA journal_mode=WAL')
+
                 # Register cleanup on program exit
                 atexit.register(self.cleanup)
                 
                 self.create_tables()
+                get_seen_urls().load(self.get_scraped_job_urls())
                 self._initialized = True
             except sqlite3.Error as e:
                 print(f"Database initialization error: {e}")
                 raise
     
+    @property
+    def conn(self):
+        """The calling thread's connection, opened on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._connections_lock:
+                self._close_dead_connections()
+                self._connections.append((threading.current_thread(), conn))
+        return conn
+
+    def _connect(self):
+        # check_same_thread=False only so cleanup can close connections of other threads;
+        # each connection is otherwise used by the thread that opened it
+        conn = sqlite3.connect(str(DB_PATH), check_same_thread=False, timeout=DB_BUSY_TIMEOUT_MS / 1000)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f'PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS}')
+        # NORMAL is durable in WAL mode except for the last commits on power loss
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA cache_size=-{DB_CACHE_SIZE_KB}')
+        conn.execute(f'PRAGMA mmap_size={DB_MMAP_SIZE}')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        return conn
+
+    def _close_dead_connections(self):
+        # Pipeline and task threads come and go; drop the connections they left behind
+        alive = []
+        for thread, conn in self._connections:
+            if thread.is_alive():
+                alive.append((thread, conn))
+            else:
+                conn.close()
+        self._connections = alive
+
+    def connection_count(self):
+        """Number of open per-thread connections"""
+        with self._connections_lock:
+            return len(self._connections)
+
     def cleanup(self):
         """Cleanup database resources"""
         try:
-            if hasattr(self, 'conn'):
-                self.conn.close()
+            if hasattr(self, '_connections_lock'):
+                with self._connections_lock:
+                    for _, conn in self._connections:
+                        # Refreshes planner statistics where queries would benefit
+                        conn.execute('PRAGMA optimize')
+                        conn.close()
+                    self._connections = []
+                self._local = threading.local()
         except Exception as e:
             print(f"Error during cleanup: {e}")
     
@@ -59,145 +133,20 @@ class Database:
             return self.conn.cursor()
         except sqlite3.Error as e:
             print(f"Error getting cursor: {e}")
-            # Try to reconnect
-            self.conn = sqlite3.connect(str(Path("data/freelancer.db")), check_same_thread=False)
-            self.conn.row_factory = sqlite3.Row
+            # Try to reconnect this thread's connection
+            with self._connections_lock:
+                self._connections = [(thread, conn) for thread, conn in self._connections
+                                     if conn is not self._local.conn]
+            self._local.conn = None
             return self.conn.cursor()
 
     def create_tables(self):
-        cursor = self._get_cursor()
-        
+        """Bring the schema up to date by applying pending migrations"""
         try:
-            # Create freelancer profiles table with enhanced fields
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS freelancer_profiles (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                email TEXT,
-                hourly_rate REAL NOT NULL,
-                skills TEXT NOT NULL,
-                experience_years INTEGER NOT NULL,
-                bio TEXT,
-                portfolio_url TEXT,
-                github_url TEXT,
-                linkedin_url TEXT,
-                relevant_experience TEXT,
-                timezone TEXT,
-                availability_status TEXT DEFAULT 'Available',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            ''')
-
-            # Create past projects table with enhanced fields
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS past_projects (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                freelancer_id INTEGER,
-                title TEXT NOT NULL,
-                description TEXT NOT NULL,
-                tech_stack TEXT NOT NULL,
-                outcomes TEXT NOT NULL,
-                project_url TEXT,
-                client_name TEXT,
-                project_duration TEXT,
-                project_budget REAL,
-                completion_date DATE,
-                project_rating REAL,
-                client_feedback TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (freelancer_id) REFERENCES freelancer_profiles (id)
-            )
-            ''')
-
-            # Create successful proposals table with enhanced fields
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS successful_proposals (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                freelancer_id INTEGER,
-                job_title TEXT NOT NULL,
-                job_url TEXT,
-                proposal_text TEXT NOT NULL,
-                client_response TEXT,
-                proposal_status TEXT DEFAULT 'Submitted',
-                submission_date DATE,
-                response_date DATE,
-                job_budget REAL,
-                client_rating REAL,
-                client_name TEXT,
-                job_category TEXT,
-                keywords_used TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (freelancer_id) REFERENCES freelancer_profiles (id)
-            )
-            ''')
-
-            # Create job analysis history table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS job_analysis_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                freelancer_id INTEGER,
-                job_title TEXT NOT NULL,
-                job_url TEXT,
-                job_description TEXT,
-                required_skills TEXT,
-                client_rating REAL,
-                avg_pay_rate REAL,
-                analysis_result TEXT,
-                analysis_reasons TEXT,
-                recommendation TEXT,
-                analyzed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (freelancer_id) REFERENCES freelancer_profiles (id)
-            )
-            ''')
-
-            # Create scraped job data table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS scraped_jobs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                job_title TEXT NOT NULL,
-                job_url TEXT UNIQUE,
-                job_description TEXT,
-                required_skills TEXT,
-                client_name TEXT,
-                client_rating REAL,
-                client_total_jobs INTEGER,
-                client_total_hires INTEGER,
-                client_avg_review REAL,
-                budget_range TEXT,
-                avg_pay_rate REAL,
-                project_duration TEXT,
-                job_category TEXT,
-                posted_date DATE,
-                scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            ''')
-
-            # Create relevant experience projects table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS relevant_experience_projects (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                freelancer_id INTEGER,
-                project_title TEXT NOT NULL,
-                project_description TEXT NOT NULL,
-                project_url TEXT,
-                company_name TEXT,
-                project_type TEXT,
-                technologies_used TEXT,
-                key_achievements TEXT,
-                project_duration TEXT,
-                completion_date DATE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (freelancer_id) REFERENCES freelancer_profiles (id)
-            )
-            ''')
-
-            self.conn.commit()
+            self.schema_version = migrate(self.conn)
         except sqlite3.Error as e:
             print(f"Error creating tables: {e}")
             raise
-        finally:
-            cursor.close()
 
     def add_freelancer_profile(self, name, email, hourly_rate, skills, experience_years, bio=None, portfolio_url=None, github_url=None, linkedin_url=None, relevant_experience=None, timezone=None):
         cursor = self._get_cursor()
@@ -314,10 +263,12 @@ class Database:
         finally:
             cursor.close()
 
-    def get_past_projects(self, freelancer_id):
+    def get_past_projects(self, freelancer_id, limit=None):
         cursor = self._get_cursor()
         try:
-            cursor.execute('SELECT * FROM past_projects WHERE freelancer_id = ? ORDER BY completion_date DESC', (freelancer_id,))
+            # LIMIT -1 means no limit in SQLite
+            cursor.execute('SELECT * FROM past_projects WHERE freelancer_id = ? ORDER BY completion_date DESC LIMIT ?',
+                           (freelancer_id, -1 if limit is None else limit))
             projects = cursor.fetchall()
             return [{
                 'id': project[0],
@@ -368,34 +319,82 @@ class Database:
         finally:
             cursor.close()
 
-    def get_successful_proposals(self, freelancer_id):
+    def get_successful_proposals(self, freelancer_id, limit=None):
         cursor = self._get_cursor()
         try:
-            cursor.execute('SELECT * FROM successful_proposals WHERE freelancer_id = ? ORDER BY created_at DESC', (freelancer_id,))
-            proposals = cursor.fetchall()
-            return [{
-                'id': proposal[0],
-                'freelancer_id': proposal[1],
-                'job_title': proposal[2],
-                'job_url': proposal[3],
-                'proposal_text': proposal[4],
-                'client_response': proposal[5],
-                'proposal_status': proposal[6],
-                'submission_date': proposal[7],
-                'response_date': proposal[8],
-                'job_budget': self._safe_float(proposal[9]),
-                'client_rating': self._safe_float(proposal[10]),
-                'client_name': proposal[11],
-                'job_category': proposal[12],
-                'keywords_used': self._format_keywords_used(proposal[13]),
-                'created_at': proposal[14]
-            } for proposal in proposals]
+            cursor.execute('SELECT * FROM successful_proposals WHERE freelancer_id = ? ORDER BY created_at DESC LIMIT ?',
+                           (freelancer_id, -1 if limit is None else limit))
+            return [self._proposal_from_row(proposal) for proposal in cursor.fetchall()]
         except sqlite3.Error as e:
             print(f"Error getting successful proposals: {e}")
             return []
         finally:
             cursor.close()
 
+    def get_proposal(self, proposal_id):
+        cursor = self._get_cursor()
+        try:
+            cursor.execute('SELECT * FROM successful_proposals WHERE id = ?', (proposal_id,))
+            proposal = cursor.fetchone()
+            return self._proposal_from_row(proposal) if proposal else None
+        except sqlite3.Error as e:
+            print(f"Error getting proposal: {e}")
+            return None
+        finally:
+            cursor.close()
+
+    def update_proposal_status(self, proposal_id, status, client_response=None):
+        """Set a proposal's status; a client response is stored with today's date as the response date"""
+        cursor = self._get_cursor()
+        try:
+            if client_response is None:
+                cursor.execute('UPDATE successful_proposals SET proposal_status = ? WHERE id = ?',
+                               (status, proposal_id))
+            else:
+                cursor.execute('''
+                UPDATE successful_proposals SET proposal_status = ?, client_response = ?, response_date = ?
+                WHERE id = ?
+                ''', (status, client_response, datetime.now().date().isoformat(), proposal_id))
+            self.conn.commit()
+            return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            print(f"Error updating proposal status: {e}")
+            self.conn.rollback()
+            return False
+        finally:
+            cursor.close()
+
+    def get_recent_proposals(self, limit=10):
+        """Newest proposals across all profiles"""
+        cursor = self._get_cursor()
+        try:
+            cursor.execute('SELECT * FROM successful_proposals ORDER BY created_at DESC, id DESC LIMIT ?', (limit,))
+            return [self._proposal_from_row(proposal) for proposal in cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"Error getting recent proposals: {e}")
+            return []
+        finally:
+            cursor.close()
+
+    def _proposal_from_row(self, proposal):
+        return {
+            'id': proposal[0],
+            'freelancer_id': proposal[1],
+            'job_title': proposal[2],
+            'job_url': proposal[3],
+            'proposal_text': proposal[4],
+            'client_response': proposal[5],
+            'proposal_status': proposal[6],
+            'submission_date': proposal[7],
+            'response_date': proposal[8],
+            'job_budget': self._safe_float(proposal[9]),
+            'client_rating': self._safe_float(proposal[10]),
+            'client_name': proposal[11],
+            'job_category': proposal[12],
+            'keywords_used': self._format_keywords_used(proposal[13]),
+            'created_at': proposal[14]
+        }
+
     def _format_keywords_used(self, keywords_data):
         """Format keywords_used field to be a string"""
         if not keywords_data:
@@ -433,60 +432,692 @@ class Database:
     def add_scraped_job(self, job_title, job_url, job_description, required_skills, client_name,
                        client_rating, client_total_jobs, client_total_hires, client_avg_review,
                        budget_range, avg_pay_rate, project_duration, job_category, posted_date):
+        """Insert one scraped job. Returns its row id, or None if it was not added."""
+        result = self.add_scraped_jobs([{
+            'job_title': job_title, 'job_url': job_url, 'job_description': job_description,
+            'required_skills': required_skills, 'client_name': client_name, 'client_rating': client_rating,
+            'client_total_jobs': client_total_jobs, 'client_total_hires': client_total_hires,
+            'client_avg_review': client_avg_review, 'budget_range': budget_range, 'avg_pay_rate': avg_pay_rate,
+            'project_duration': project_duration, 'job_category': job_category, 'posted_date': posted_date
+        }])[0]
+        return result['id']
+
+    def add_scraped_jobs(self, jobs):
+        """
+        Insert many mapped jobs with executemany in one transaction. Returns one
+        {'id', 'status', 'duplicate_of'} dict per job, in order. Status is 'inserted',
+        'duplicate' (URL already stored, or repeated earlier in the batch), 'near_duplicate'
+        (collapsed, not stored) or 'error'; id is only set for inserted jobs.
+        """
+        results = [{'id': None, 'status': 'duplicate', 'duplicate_of': None} for _ in jobs]
         cursor = self._get_cursor()
         try:
-            cursor.execute('''
-            INSERT OR IGNORE INTO scraped_jobs (job_title, job_url, job_description, required_skills, client_name,
+            # Take the write lock before the URL check so it stays valid until commit
+            cursor.execute('BEGIN IMMEDIATE')
+            urls = [job.get('job_url', '') for job in jobs]
+            seen = set(self._job_ids_by_url(cursor, urls))
+
+            rows = []
+            signatures = {}
+            batch_buckets = {}
+            batch_duplicates = {}
+            for index, job in enumerate(jobs):
+                if urls[index] in seen:
+                    continue
+                seen.add(urls[index])
+
+                signature = None
+                duplicate_of = None
+                if NEAR_DUPLICATE_MODE != 'off':
+                    signature = minhash_signature(job.get('job_title', ''), job.get('job_description', ''))
+                if signature is not None:
+                    duplicate_of = self._find_near_duplicate(cursor, signature, urls[index])
+                    # Jobs earlier in this batch are not in the LSH index yet
+                    batch_match = None
+                    if duplicate_of is None:
+                        batch_match = self._find_batch_near_duplicate(signature, batch_buckets, signatures)
+                    if (duplicate_of or batch_match is not None) and NEAR_DUPLICATE_MODE == 'collapse':
+                        results[index]['status'] = 'near_duplicate'
+                        results[index]['duplicate_of'] = duplicate_of
+                        continue
+                    if batch_match is not None:
+                        batch_duplicates[index] = batch_match
+                    elif duplicate_of is None:
+                        signatures[index] = signature
+                        for key in lsh_buckets(signature):
+                            batch_buckets.setdefault(key, []).append(index)
+
+                rows.append((index, (
+                    job.get('job_title', ''), urls[index], job.get('job_description', ''),
+                    json.dumps(job.get('required_skills', [])), job.get('client_name', ''),
+                    job.get('client_rating', 0.0), job.get('client_total_jobs', 0),
+                    job.get('client_total_hires', 0), job.get('client_avg_review', 0.0),
+                    job.get('budget_range', ''), job.get('avg_pay_rate', 0.0), job.get('project_duration', ''),
+                    job.get('job_category', ''), job.get('posted_date', ''),
+                    signature_to_blob(signature) if signature is not None else None, duplicate_of
+                )))
+                results[index]['duplicate_of'] = duplicate_of
+
+            cursor.executemany('''
+            INSERT INTO scraped_jobs (job_title, job_url, job_description, required_skills, client_name,
                                     client_rating, client_total_jobs, client_total_hires, client_avg_review,
-                                    budget_range, avg_pay_rate, project_duration, job_category, posted_date)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (job_title, job_url, job_description, json.dumps(required_skills), client_name,
-                 client_rating, client_total_jobs, client_total_hires, client_avg_review,
-                 budget_range, avg_pay_rate, project_duration, job_category, posted_date))
+                                    budget_range, avg_pay_rate, project_duration, job_category, posted_date,
+                                    minhash, duplicate_of)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [row for _, row in rows])
+
+            # executemany has no lastrowid; the write lock guarantees these rows are ours
+            ids = self._job_ids_by_url(cursor, [urls[index] for index, _ in rows])
+            for index, _ in rows:
+                results[index]['id'] = ids.get(urls[index])
+                results[index]['status'] = 'inserted'
+            for index, match in batch_duplicates.items():
+                results[index]['duplicate_of'] = results[match]['id']
+            if batch_duplicates:
+                cursor.executemany('UPDATE scraped_jobs SET duplicate_of = ? WHERE id = ?',
+                                   [(results[match]['id'], results[index]['id'])
+                                    for index, match in batch_duplicates.items()])
+            # Only canonical jobs are indexed, so every LSH candidate is an original posting
+            cursor.executemany(
+                'INSERT OR IGNORE INTO scraped_job_lsh (band, bucket, job_id) VALUES (?, ?, ?)',
+                [(band, bucket, results[index]['id'])
+                 for index, signature in signatures.items() for band, bucket in lsh_buckets(signature)]
+            )
+            self.conn.commit()
+            for url in urls:
+                get_seen_urls().add(url)
+            return results
+        except sqlite3.Error as e:
+            print(f"Error adding scraped jobs: {e}")
+            self.conn.rollback()
+            return [{'id': None, 'status': 'error', 'duplicate_of': None} for _ in jobs]
+        finally:
+            cursor.close()
+
+    def _find_batch_near_duplicate(self, signature, batch_buckets, signatures):
+        """Return the batch index of an earlier canonical job in the same batch that is a near-duplicate"""
+        candidates = {index for key in lsh_buckets(signature) for index in batch_buckets.get(key, [])}
+        best_index, best_similarity = None, NEAR_DUPLICATE_THRESHOLD
+        for index in sorted(candidates):
+            similarity = estimate_similarity(signature, signatures[index])
+            if similarity >= best_similarity:
+                best_index, best_similarity = index, similarity
+        return best_index
+
+    def _job_ids_by_url(self, cursor, urls):
+        """Map the given job URLs that are stored in scraped_jobs to their row ids"""
+        urls = list(dict.fromkeys(urls))
+        ids = {}
+        # Stay well under SQLite's bound-parameter limit
+        for i in range(0, len(urls), 500):
+            chunk = urls[i:i + 500]
+            cursor.execute(
+                f"SELECT id, job_url FROM scraped_jobs WHERE job_url IN ({', '.join('?' * len(chunk))})",
+                chunk
+            )
+            ids.update((row['job_url'], row['id']) for row in cursor.fetchall())
+        return ids
+
+    def upsert_scraped_jobs(self, jobs):
+        """
+        Re-derive stored jobs by job_url in one transaction and insert the rest through
+        add_scraped_jobs (used when re-mapping archived payloads). Existing rows keep their id,
+        scraped_at and duplicate flag. Returns (inserted, updated).
+        """
+        cursor = self._get_cursor()
+        new_jobs = []
+        try:
+            updated = 0
+            for job in jobs:
+                cursor.execute('SELECT id, duplicate_of FROM scraped_jobs WHERE job_url = ?', (job['job_url'],))
+                row = cursor.fetchone()
+                if row is None:
+                    new_jobs.append(job)
+                    continue
+
+                signature = None
+                if NEAR_DUPLICATE_MODE != 'off':
+                    signature = minhash_signature(job['job_title'], job['job_description'])
+                cursor.execute('''
+                UPDATE scraped_jobs SET job_title = ?, job_description = ?, required_skills = ?, client_name = ?,
+                                        client_rating = ?, client_total_jobs = ?, client_total_hires = ?,
+                                        client_avg_review = ?, budget_range = ?, avg_pay_rate = ?,
+                                        project_duration = ?, job_category = ?, posted_date = ?, minhash = ?
+                WHERE id = ?
+                ''', (job['job_title'], job['job_description'], json.dumps(job['required_skills']), job['client_name'],
+                     job['client_rating'], job['client_total_jobs'], job['client_total_hires'],
+                     job['client_avg_review'], job['budget_range'], job['avg_pay_rate'],
+                     job['project_duration'], job['job_category'], job['posted_date'],
+                     signature_to_blob(signature) if signature is not None else None, row['id']))
+                # The signature may have changed, so rebuild this job's LSH rows
+                cursor.execute('DELETE FROM scraped_job_lsh WHERE job_id = ?', (row['id'],))
+                if signature is not None and row['duplicate_of'] is None:
+                    cursor.executemany(
+                        'INSERT OR IGNORE INTO scraped_job_lsh (band, bucket, job_id) VALUES (?, ?, ?)',
+                        [(band, bucket, row['id']) for band, bucket in lsh_buckets(signature)]
+                    )
+                updated += 1
+            self.conn.commit()
+        except sqlite3.Error as e:
+            print(f"Error upserting scraped jobs: {e}")
+            self.conn.rollback()
+            return None
+        finally:
+            cursor.close()
+
+        # New jobs take the same insert path as scrapes (near-duplicates, LSH rows, seen URLs)
+        results = self.add_scraped_jobs(new_jobs) if new_jobs else []
+        if any(result['status'] == 'error' for result in results):
+            return None
+        return sum(1 for result in results if result['status'] == 'inserted'), updated
+
+    def get_scraped_job_urls(self):
+        """Every stored job URL (used to load the seen-URL set)"""
+        cursor = self._get_cursor()
+        try:
+            cursor.execute('SELECT job_url FROM scraped_jobs')
+            return [row[0] for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"Error getting scraped job URLs: {e}")
+            return []
+        finally:
+            cursor.close()
+
+    def get_existing_job_urls(self, urls):
+        """Return the subset of the given job URLs already stored in scraped_jobs"""
+        cursor = self._get_cursor()
+        try:
+            return set(self._job_ids_by_url(cursor, urls))
+        except sqlite3.Error as e:
+            print(f"Error checking existing job URLs: {e}")
+            return set()
+        finally:
+            cursor.close()
+
+    def _find_near_duplicate(self, cursor, signature, job_url):
+        """Return the id of a stored job whose signature is a near-duplicate, using the LSH index"""
+        buckets = lsh_buckets(signature)
+        cursor.execute(
+            'SELECT DISTINCT job_id FROM scraped_job_lsh WHERE ' +
+            ' OR '.join(['(band = ? AND bucket = ?)'] * len(buckets)),
+            [value for key in buckets for value in key]
+        )
+        candidate_ids = [row['job_id'] for row in cursor.fetchall()]
+        if not candidate_ids:
+            return None
+
+        cursor.execute(
+            f"SELECT id, job_url, minhash FROM scraped_jobs WHERE id IN ({', '.join('?' * len(candidate_ids))})",
+            candidate_ids
+        )
+        best_id, best_similarity = None, NEAR_DUPLICATE_THRESHOLD
+        for row in cursor.fetchall():
+            if row['job_url'] == job_url or row['minhash'] is None:
+                continue
+            similarity = estimate_similarity(signature, signature_from_blob(row['minhash']))
+            if similarity >= best_similarity:
+                best_id, best_similarity = row['id'], similarity
+        return best_id
+
+    def get_scraped_jobs(self, limit=50, include_duplicates=False, after=None, category=None, min_pay_rate=None,
+                         min_client_rating=None, posted_after=None, posted_before=None, skill=None):
+        """
+        Newest scraped jobs first, ordered by (scraped_at, id). `after` is the (scraped_at, id)
+        of the last job of the previous page (keyset pagination); the other arguments filter.
+        """
+        conditions = []
+        params = []
+        if not include_duplicates:
+            conditions.append('duplicate_of IS NULL')
+        if after is not None:
+            conditions.append('(scraped_at, id) < (?, ?)')
+            params.extend(after)
+        if category:
+            conditions.append('job_category = ?')
+            params.append(category)
+        if min_pay_rate is not None:
+            conditions.append('avg_pay_rate >= ?')
+            params.append(min_pay_rate)
+        if min_client_rating is not None:
+            conditions.append('client_rating >= ?')
+            params.append(min_client_rating)
+        if posted_after:
+            conditions.append('posted_date >= ?')
+            params.append(posted_after)
+        if posted_before:
+            conditions.append('posted_date < ?')
+            params.append(posted_before)
+        if skill:
+            conditions.append('id IN (SELECT job_skills.job_id FROM job_skills '
+                              'JOIN skills ON skills.id = job_skills.skill_id WHERE skills.normalized = lower(trim(?)))')
+            params.append(skill)
+
+        cursor = self._get_cursor()
+        try:
+            # Explicit columns keep the MinHash blob out of list queries
+            cursor.execute(f'''
+            SELECT id, job_title, job_url, job_description, required_skills, client_name, client_rating,
+                   client_total_jobs, client_total_hires, client_avg_review, budget_range, avg_pay_rate,
+                   project_duration, job_category, posted_date, scraped_at, duplicate_of
+            FROM scraped_jobs
+            {'WHERE ' + ' AND '.join(conditions) if conditions else ''}
+            ORDER BY scraped_at DESC, id DESC LIMIT ?
+            ''', params + [limit])
+            return [self._scraped_job_from_row(job) for job in cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"Error getting scraped jobs: {e}")
+            return []
+        finally:
+            cursor.close()
+
+    def search_scraped_jobs(self, query, limit=20, offset=0, include_duplicates=False):
+        """
+        Full-text search over job titles, descriptions and skills, best bm25 match first.
+        Each job gets its 'rank' (lower is better) and a 'snippet' of the description.
+        """
+        match = ' '.join(f'"{term}"{star}' for term, star in _SEARCH_TERM_RE.findall(query or ''))
+        if not match:
+            return []
+        cursor = self._get_cursor()
+        try:
+            cursor.execute(f'''
+            SELECT j.id, j.job_title, j.job_url, j.job_description, j.required_skills, j.client_name,
+                   j.client_rating, j.client_total_jobs, j.client_total_hires, j.client_avg_review,
+                   j.budget_range, j.avg_pay_rate, j.project_duration, j.job_category, j.posted_date,
+                   j.scraped_at, j.duplicate_of,
+                   bm25(scraped_jobs_fts, ?, ?, ?) AS rank,
+                   snippet(scraped_jobs_fts, 1, '<mark>', '</mark>', '…', 24) AS snippet
+            FROM scraped_jobs_fts
+            JOIN scraped_jobs j ON j.id = scraped_jobs_fts.rowid
+            WHERE scraped_jobs_fts MATCH ? {'' if include_duplicates else 'AND j.duplicate_of IS NULL'}
+            ORDER BY rank, j.id LIMIT ? OFFSET ?
+            ''', (*SEARCH_WEIGHTS, match, limit, offset))
+            jobs = []
+            for row in cursor.fetchall():
+                job = self._scraped_job_from_row(row)
+                job['rank'] = row['rank']
+                job['snippet'] = row['snippet']
+                jobs.append(job)
+            return jobs
+        except sqlite3.Error as e:
+            print(f"Error searching scraped jobs: {e}")
+            return []
+        finally:
+            cursor.close()
+
+    def get_dashboard_counts(self):
+        """Exact row counts for the dashboard from the rollup counters (near-duplicate jobs are not counted)"""
+        cursor = self._get_cursor()
+        try:
+            cursor.execute('SELECT name, value FROM analytics_counters')
+            counts = {'profiles': 0, 'scraped_jobs': 0, 'job_analyses': 0, 'proposals': 0}
+            counts.update((row['name'], row['value']) for row in cursor.fetchall())
+            return counts
+        except sqlite3.Error as e:
+            print(f"Error getting dashboard counts: {e}")
+            return {'profiles': 0, 'scraped_jobs': 0, 'job_analyses': 0, 'proposals': 0}
+        finally:
+            cursor.close()
+
+    def get_profile_stats(self, freelancer_id):
+        """Project and proposal totals for one profile (ratings of 0 or NULL are left out of the average)"""
+        cursor = self._get_cursor()
+        try:
+            cursor.execute('''
+            SELECT COUNT(*) AS total_projects,
+                   COALESCE(AVG(NULLIF(project_rating, 0)), 0) AS avg_project_rating,
+                   COALESCE(SUM(project_budget), 0) AS total_earnings,
+                   COALESCE((SELECT proposal_count FROM profile_proposal_counts WHERE freelancer_id = ?), 0)
+                       AS total_proposals
+            FROM past_projects WHERE freelancer_id = ?
+            ''', (freelancer_id, freelancer_id))
+            return dict(cursor.fetchone())
+        except sqlite3.Error as e:
+            print(f"Error getting profile stats: {e}")
+            return {'total_projects': 0, 'avg_project_rating': 0, 'total_earnings': 0, 'total_proposals': 0}
+        finally:
+            cursor.close()
+
+    def get_job_trends(self, top_skills=10, recent_since=None):
+        """
+        Totals, averages and category counts over all canonical scraped jobs, plus the most
+        required skills, read from the per category and day rollup. Pay rates and client
+        ratings of 0 or NULL are left out of the averages. `recent_since` is a 'YYYY-MM-DD' day.
+        """
+        cursor = self._get_cursor()
+        try:
+            cursor.execute('''
+            SELECT category, SUM(job_count) AS job_count,
+                   SUM(pay_rate_sum) AS pay_rate_sum, SUM(pay_rate_count) AS pay_rate_count,
+                   SUM(client_rating_sum) AS client_rating_sum, SUM(client_rating_count) AS client_rating_count,
+                   SUM(CASE WHEN day >= ? THEN job_count ELSE 0 END) AS recent_jobs
+            FROM job_category_daily
+            GROUP BY category
+            ''', (recent_since or '',))
+            rows = cursor.fetchall()
+            pay_rate_count = sum(row['pay_rate_count'] for row in rows)
+            client_rating_count = sum(row['client_rating_count'] for row in rows)
+            trends = {
+                'total_jobs': sum(row['job_count'] for row in rows),
+                'avg_pay_rate': sum(row['pay_rate_sum'] for row in rows) / pay_rate_count if pay_rate_count else 0,
+                'avg_client_rating': (sum(row['client_rating_sum'] for row in rows) / client_rating_count
+                                      if client_rating_count else 0),
+                'recent_jobs': sum(row['recent_jobs'] for row in rows)
+            }
+            categories = {row['category']: row['job_count'] for row in rows if row['job_count'] > 0}
+            trends['categories'] = dict(sorted(categories.items(), key=lambda item: (-item[1], item[0])))
+            trends['top_skills'] = [(skill['skill'], skill['job_count'])
+                                    for skill in self.get_skill_counts(limit=top_skills)]
+            return trends
+        except sqlite3.Error as e:
+            print(f"Error getting job trends: {e}")
+            return None
+        finally:
+            cursor.close()
+
+    def get_skill_counts(self, limit=50, include_duplicates=False):
+        """Skills ranked by how many scraped jobs require them"""
+        cursor = self._get_cursor()
+        try:
+            # Canonical jobs per skill are kept in a rollup; near-duplicates are counted from the links
+            counts = '''
+                SELECT skill_id, COUNT(*) AS job_count FROM job_skills GROUP BY skill_id
+            ''' if include_duplicates else 'SELECT skill_id, job_count FROM skill_job_counts'
+            cursor.execute(f'''
+            SELECT skills.name, counts.job_count
+            FROM ({counts}) AS counts
+            JOIN skills ON skills.id = counts.skill_id
+            WHERE counts.job_count > 0
+            ORDER BY counts.job_count DESC, skills.name
+            LIMIT ?
+            ''', (limit,))
+            return [{'skill': row['name'], 'job_count': row['job_count']} for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"Error getting skill counts: {e}")
+            return []
+        finally:
+            cursor.close()
+
+    def get_jobs_matching_profile(self, freelancer_id, limit=20):
+        """Scraped jobs sharing the most skills with a profile, with the shared skill names"""
+        cursor = self._get_cursor()
+        try:
+            cursor.execute('''
+            SELECT j.id, j.job_title, j.job_url, j.job_description, j.required_skills, j.client_name,
+                   j.client_rating, j.client_total_jobs, j.client_total_hires, j.client_avg_review,
+                   j.budget_range, j.avg_pay_rate, j.project_duration, j.job_category, j.posted_date,
+                   j.scraped_at, j.duplicate_of, matches.overlap, matches.skill_ids
+            FROM (
+                SELECT job_skills.job_id, COUNT(*) AS overlap, group_concat(job_skills.skill_id) AS skill_ids
+                FROM profile_skills
+                JOIN job_skills ON job_skills.skill_id = profile_skills.skill_id
+                WHERE profile_skills.profile_id = ?
+                GROUP BY job_skills.job_id
+            ) AS matches
+            JOIN scraped_jobs j ON j.id = matches.job_id
+            WHERE j.duplicate_of IS NULL
+            ORDER BY matches.overlap DESC, j.scraped_at DESC, j.id DESC
+            LIMIT ?
+            ''', (freelancer_id, limit))
+            rows = cursor.fetchall()
+            skill_ids = {int(skill_id) for row in rows for skill_id in row['skill_ids'].split(',')}
+            names = {}
+            if skill_ids:
+                cursor.execute(f"SELECT id, name FROM skills WHERE id IN ({', '.join('?' * len(skill_ids))})",
+                               list(skill_ids))
+                names = {row['id']: row['name'] for row in cursor.fetchall()}
+            jobs = []
+            for row in rows:
+                job = self._scraped_job_from_row(row)
+                job['matching_skills'] = sorted(names[int(skill_id)] for skill_id in row['skill_ids'].split(','))
+                job['skill_overlap'] = row['overlap']
+                jobs.append(job)
+            return jobs
+        except sqlite3.Error as e:
+            print(f"Error getting jobs matching profile: {e}")
+            return []
+        finally:
+            cursor.close()
+
+    def _scraped_job_from_row(self, job):
+        """Map a scraped_jobs row (columns in table order) to the API dict"""
+        # required_skills is read from the JSON column rather than rebuilt from job_skills: the
+        # column keeps the provider's order and casing, and parsing it costs less than a
+        # per-row group_concat over the link table
+        return {
+            'id': job[0],
+            'job_title': job[1],
+            'job_url': job[2],
+            'job_description': job[3],
+            'required_skills': self._parse_json_field(job[4]),
+            'client_name': job[5],
+            'client_rating': self._safe_float(job[6]),
+            'client_total_jobs': self._safe_int(job[7]),
+            'client_total_hires': self._safe_int(job[8]),
+            'client_avg_review': self._safe_float(job[9]),
+            'budget_range': job[10],
+            'avg_pay_rate': self._safe_float(job[11]),
+            'project_duration': job[12],
+            'job_category': job[13],
+            'posted_date': job[14],
+            'scraped_at': job[15],
+            'duplicate_of': job['duplicate_of']
+        }
+
+    def get_ingest_watermark(self, name):
+        """Get the newest posted_date/job_url recorded by an ingester"""
+        cursor = self._get_cursor()
+        try:
+            cursor.execute('SELECT posted_date, job_url, updated_at FROM ingest_state WHERE name = ?', (name,))
+            row = cursor.fetchone()
+            if row:
+                return {
+                    'posted_date': row['posted_date'],
+                    'job_url': row['job_url'],
+                    'updated_at': row['updated_at']
+                }
+            return None
+        except sqlite3.Error as e:
+            print(f"Error getting ingest watermark: {e}")
+            return None
+        finally:
+            cursor.close()
+
+    def set_ingest_watermark(self, name, posted_date, job_url):
+        """Record the newest posted_date/job_url ingested by an ingester"""
+        cursor = self._get_cursor()
+        try:
+            cursor.execute('''
+            INSERT INTO ingest_state (name, posted_date, job_url, updated_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET posted_date = excluded.posted_date,
+                                            job_url = excluded.job_url,
+                                            updated_at = excluded.updated_at
+            ''', (name, posted_date, job_url, datetime.now()))
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"Error setting ingest watermark: {e}")
+            self.conn.rollback()
+            return False
+        finally:
+            cursor.close()
+
+    def add_scrape_task(self, task_id, request, keywords_total):
+        """Persist a queued background scrape task"""
+        cursor = self._get_cursor()
+        try:
+            cursor.execute('''
+            INSERT INTO scrape_tasks (id, status, request, keywords_total, errors)
+            VALUES (?, 'queued', ?, ?, '[]')
+            ''', (task_id, json.dumps(request), keywords_total))
+            self.conn.commit()
+            return task_id
+        except sqlite3.Error as e:
+            print(f"Error adding scrape task: {e}")
+            self.conn.rollback()
+            return None
+        finally:
+            cursor.close()
+
+    def update_scrape_task(self, task_id, **kwargs):
+        cursor = self._get_cursor()
+        try:
+            update_fields = []
+            values = []
+
+            for key, value in kwargs.items():
+                if key in ['status', 'keywords_total', 'keywords_done', 'total_count', 'added_count',
+                           'message', 'started_at', 'finished_at']:
+                    update_fields.append(f"{key} = ?")
+                    values.append(value)
+                elif key == 'errors':
+                    update_fields.append("errors = ?")
+                    values.append(json.dumps(value))
+
+            if update_fields:
+                update_fields.append("updated_at = ?")
+                values.append(datetime.now())
+                values.append(task_id)
+                query = f"UPDATE scrape_tasks SET {', '.join(update_fields)} WHERE id = ?"
+                cursor.execute(query, values)
+                self.conn.commit()
+                return cursor.rowcount > 0
+            return False
+        except sqlite3.Error as e:
+            print(f"Error updating scrape task: {e}")
+            self.conn.rollback()
+            return False
+        finally:
+            cursor.close()
+
+    def _scrape_task_from_row(self, task):
+        return {
+            'id': task['id'],
+            'status': task['status'],
+            'request': self._parse_json_field(task['request']),
+            'keywords_total': task['keywords_total'],
+            'keywords_done': task['keywords_done'],
+            'total_count': task['total_count'],
+            'added_count': task['added_count'],
+            'message': task['message'],
+            'errors': self._parse_json_field(task['errors']),
+            'created_at': task['created_at'],
+            'started_at': task['started_at'],
+            'finished_at': task['finished_at'],
+            'updated_at': task['updated_at']
+        }
+
+    def get_scrape_task(self, task_id):
+        cursor = self._get_cursor()
+        try:
+            cursor.execute('SELECT * FROM scrape_tasks WHERE id = ?', (task_id,))
+            task = cursor.fetchone()
+            return self._scrape_task_from_row(task) if task else None
+        except sqlite3.Error as e:
+            print(f"Error getting scrape task: {e}")
+            return None
+        finally:
+            cursor.close()
+
+    def get_unfinished_scrape_tasks(self):
+        """Queued or interrupted tasks, oldest first, so they can be resumed after a restart"""
+        cursor = self._get_cursor()
+        try:
+            cursor.execute("SELECT * FROM scrape_tasks WHERE status IN ('queued', 'running') ORDER BY created_at, rowid")
+            return [self._scrape_task_from_row(task) for task in cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"Error getting unfinished scrape tasks: {e}")
+            return []
+        finally:
+            cursor.close()
+
+    def add_api_call(self, endpoint, purpose, status_code, latency_ms, quota_remaining=None, quota_limit=None):
+        """Record one upstream job API call"""
+        cursor = self._get_cursor()
+        try:
+            cursor.execute('''
+            INSERT INTO api_calls (endpoint, purpose, status_code, latency_ms, quota_remaining, quota_limit)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ''', (endpoint, purpose, status_code, latency_ms, quota_remaining, quota_limit))
             self.conn.commit()
             return cursor.lastrowid
         except sqlite3.Error as e:
-            print(f"Error adding scraped job: {e}")
+            print(f"Error adding API call: {e}")
             self.conn.rollback()
             return None
         finally:
             cursor.close()
 
-    def get_scraped_jobs(self, limit=50):
+    def get_api_call_counts(self, since):
+        """Upstream calls per purpose made at or after `since` (UTC 'YYYY-MM-DD HH:MM:SS')"""
+        cursor = self._get_cursor()
+        try:
+            cursor.execute('SELECT purpose, COUNT(*) FROM api_calls WHERE called_at >= ? GROUP BY purpose', (since,))
+            return {row[0]: row[1] for row in cursor.fetchall()}
+        except sqlite3.Error as e:
+            print(f"Error counting API calls: {e}")
+            return {}
+        finally:
+            cursor.close()
+
+    def get_api_call_stats(self, since):
+        """Call count, failures and latency per endpoint and purpose since `since`"""
         cursor = self._get_cursor()
         try:
-            cursor.execute('SELECT * FROM scraped_jobs ORDER BY scraped_at DESC LIMIT ?', (limit,))
-            jobs = cursor.fetchall()
+            cursor.execute('''
+            SELECT endpoint, purpose, COUNT(*) AS calls,
+                   SUM(CASE WHEN status_code = 200 THEN 0 ELSE 1 END) AS failures,
+                   SUM(CASE WHEN status_code = 429 THEN 1 ELSE 0 END) AS throttled,
+                   AVG(latency_ms) AS avg_latency_ms, MAX(latency_ms) AS max_latency_ms
+            FROM api_calls WHERE called_at >= ?
+            GROUP BY endpoint, purpose ORDER BY calls DESC
+            ''', (since,))
             return [{
-                'id': job[0],
-                'job_title': job[1],
-                'job_url': job[2],
-                'job_description': job[3],
-                'required_skills': self._parse_json_field(job[4]),
-                'client_name': job[5],
-                'client_rating': self._safe_float(job[6]),
-                'client_total_jobs': self._safe_int(job[7]),
-                'client_total_hires': self._safe_int(job[8]),
-                'client_avg_review': self._safe_float(job[9]),
-                'budget_range': job[10],
-                'avg_pay_rate': self._safe_float(job[11]),
-                'project_duration': job[12],
-                'job_category': job[13],
-                'posted_date': job[14],
-                'scraped_at': job[15]
-            } for job in jobs]
+                'endpoint': row['endpoint'],
+                'purpose': row['purpose'],
+                'calls': row['calls'],
+                'failures': row['failures'],
+                'throttled': row['throttled'],
+                'avg_latency_ms': round(row['avg_latency_ms'], 1) if row['avg_latency_ms'] is not None else None,
+                'max_latency_ms': round(row['max_latency_ms'], 1) if row['max_latency_ms'] is not None else None
+            } for row in cursor.fetchall()]
         except sqlite3.Error as e:
-            print(f"Error getting scraped jobs: {e}")
+            print(f"Error getting API call stats: {e}")
             return []
         finally:
             cursor.close()
 
+    def get_latest_api_quota(self):
+        """Most recent remaining/limit quota reported by the provider"""
+        cursor = self._get_cursor()
+        try:
+            cursor.execute('''
+            SELECT quota_remaining, quota_limit, called_at FROM api_calls
+            WHERE quota_remaining IS NOT NULL ORDER BY id DESC LIMIT 1
+            ''')
+            row = cursor.fetchone()
+            if row:
+                return {
+                    'quota_remaining': row['quota_remaining'],
+                    'quota_limit': row['quota_limit'],
+                    'reported_at': row['called_at']
+                }
+            return None
+        except sqlite3.Error as e:
+            print(f"Error getting latest API quota: {e}")
+            return None
+        finally:
+            cursor.close()
+
     def clear_scraped_jobs(self):
         """Clear all scraped jobs from the database"""
         cursor = self._get_cursor()
         try:
             cursor.execute('DELETE FROM scraped_jobs')
+            cursor.execute('DELETE FROM scraped_job_lsh')
             self.conn.commit()
+            get_seen_urls().clear()
             return True
         except sqlite3.Error as e:
             print(f"Error clearing scraped jobs: {e}")
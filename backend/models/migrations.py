@@ -0,0 +1,582 @@
+"""
+Versioned schema migrations. Each migration runs once, in its own transaction,
+and is recorded in the schema_version table. Add new schema changes as a new
+function at the end of MIGRATIONS; never edit one that has shipped.
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+
+# (table, JSON skill column, link table, link column) for every table that lists skills
+SKILL_LINKS = (
+    ('freelancer_profiles', 'skills', 'profile_skills', 'profile_id'),
+    ('scraped_jobs', 'required_skills', 'job_skills', 'job_id'),
+    ('past_projects', 'tech_stack', 'past_project_skills', 'project_id'),
+    ('relevant_experience_projects', 'technologies_used', 'experience_project_skills', 'project_id'),
+)
+
+def _ensure_column(cursor, table, column, definition):
+    """Add a column to an existing table if it is missing"""
+    cursor.execute(f"PRAGMA table_info({table})")
+    if column not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+def _baseline(cursor):
+    """
+    The schema create_tables() used to build. Statements are idempotent, so databases
+    created before migrations existed are adopted as version 1 without changes.
+    """
+    # Create freelancer profiles table with enhanced fields
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS freelancer_profiles (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        email TEXT,
+        hourly_rate REAL NOT NULL,
+        skills TEXT NOT NULL,
+        experience_years INTEGER NOT NULL,
+        bio TEXT,
+        portfolio_url TEXT,
+        github_url TEXT,
+        linkedin_url TEXT,
+        relevant_experience TEXT,
+        timezone TEXT,
+        availability_status TEXT DEFAULT 'Available',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+
+    # Create past projects table with enhanced fields
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS past_projects (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        freelancer_id INTEGER,
+        title TEXT NOT NULL,
+        description TEXT NOT NULL,
+        tech_stack TEXT NOT NULL,
+        outcomes TEXT NOT NULL,
+        project_url TEXT,
+        client_name TEXT,
+        project_duration TEXT,
+        project_budget REAL,
+        completion_date DATE,
+        project_rating REAL,
+        client_feedback TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (freelancer_id) REFERENCES freelancer_profiles (id)
+    )
+    ''')
+
+    # Create successful proposals table with enhanced fields
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS successful_proposals (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        freelancer_id INTEGER,
+        job_title TEXT NOT NULL,
+        job_url TEXT,
+        proposal_text TEXT NOT NULL,
+        client_response TEXT,
+        proposal_status TEXT DEFAULT 'Submitted',
+        submission_date DATE,
+        response_date DATE,
+        job_budget REAL,
+        client_rating REAL,
+        client_name TEXT,
+        job_category TEXT,
+        keywords_used TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (freelancer_id) REFERENCES freelancer_profiles (id)
+    )
+    ''')
+
+    # Create job analysis history table
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS job_analysis_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        freelancer_id INTEGER,
+        job_title TEXT NOT NULL,
+        job_url TEXT,
+        job_description TEXT,
+        required_skills TEXT,
+        client_rating REAL,
+        avg_pay_rate REAL,
+        analysis_result TEXT,
+        analysis_reasons TEXT,
+        recommendation TEXT,
+        analyzed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (freelancer_id) REFERENCES freelancer_profiles (id)
+    )
+    ''')
+
+    # Create scraped job data table
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS scraped_jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        job_title TEXT NOT NULL,
+        job_url TEXT UNIQUE,
+        job_description TEXT,
+        required_skills TEXT,
+        client_name TEXT,
+        client_rating REAL,
+        client_total_jobs INTEGER,
+        client_total_hires INTEGER,
+        client_avg_review REAL,
+        budget_range TEXT,
+        avg_pay_rate REAL,
+        project_duration TEXT,
+        job_category TEXT,
+        posted_date DATE,
+        scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+
+    # Create relevant experience projects table
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS relevant_experience_projects (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        freelancer_id INTEGER,
+        project_title TEXT NOT NULL,
+        project_description TEXT NOT NULL,
+        project_url TEXT,
+        company_name TEXT,
+        project_type TEXT,
+        technologies_used TEXT,
+        key_achievements TEXT,
+        project_duration TEXT,
+        completion_date DATE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (freelancer_id) REFERENCES freelancer_profiles (id)
+    )
+    ''')
+
+    # Create ingestion watermark table for the background feed ingester
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS ingest_state (
+        name TEXT PRIMARY KEY,
+        posted_date TEXT,
+        job_url TEXT,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+
+    # MinHash signature and near-duplicate link for scraped jobs
+    _ensure_column(cursor, 'scraped_jobs', 'minhash', 'BLOB')
+    _ensure_column(cursor, 'scraped_jobs', 'duplicate_of', 'INTEGER')
+
+    # Create LSH band index over scraped job signatures
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS scraped_job_lsh (
+        band INTEGER NOT NULL,
+        bucket INTEGER NOT NULL,
+        job_id INTEGER NOT NULL,
+        PRIMARY KEY (band, bucket, job_id)
+    ) WITHOUT ROWID
+    ''')
+
+    # Create persistent queue of background scrape tasks
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS scrape_tasks (
+        id TEXT PRIMARY KEY,
+        status TEXT NOT NULL DEFAULT 'queued',
+        request TEXT NOT NULL,
+        keywords_total INTEGER DEFAULT 0,
+        keywords_done INTEGER DEFAULT 0,
+        total_count INTEGER DEFAULT 0,
+        added_count INTEGER DEFAULT 0,
+        message TEXT,
+        errors TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        started_at TIMESTAMP,
+        finished_at TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+
+    # Create log of upstream job API calls for quota accounting
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS api_calls (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        endpoint TEXT NOT NULL,
+        purpose TEXT NOT NULL,
+        status_code INTEGER,
+        latency_ms REAL,
+        quota_remaining INTEGER,
+        quota_limit INTEGER,
+        called_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_api_calls_called_at ON api_calls (called_at, purpose)')
+
+def _profile_and_job_indexes(cursor):
+    # Per-profile lists filter by freelancer_id and sort, so both go in the index
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_past_projects_freelancer '
+                   'ON past_projects (freelancer_id, completion_date DESC)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_successful_proposals_freelancer '
+                   'ON successful_proposals (freelancer_id, created_at DESC)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_relevant_experience_freelancer '
+                   'ON relevant_experience_projects (freelancer_id, completion_date DESC)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_job_analysis_freelancer '
+                   'ON job_analysis_history (freelancer_id, analyzed_at)')
+
+    # Newest-first job lists; the partial index serves the default view without near-duplicates
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_scraped_jobs_scraped_at ON scraped_jobs (scraped_at)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_scraped_jobs_canonical_scraped_at '
+                   'ON scraped_jobs (scraped_at) WHERE duplicate_of IS NULL')
+
+    # LSH rows are deleted by job id when a job is re-mapped
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_scraped_job_lsh_job ON scraped_job_lsh (job_id)')
+    # Unfinished tasks are picked up oldest first on startup
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_scrape_tasks_unfinished '
+                   "ON scrape_tasks (created_at) WHERE status IN ('queued', 'running')")
+
+def _scraped_job_filter_indexes(cursor):
+    # Filters on the job list. Category is an equality match, so scraped_at after it keeps the
+    # newest-first order sort-free; the range filters get single-column indexes.
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_scraped_jobs_category '
+                   'ON scraped_jobs (job_category, scraped_at)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_scraped_jobs_pay_rate ON scraped_jobs (avg_pay_rate)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_scraped_jobs_client_rating ON scraped_jobs (client_rating)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_scraped_jobs_posted_date ON scraped_jobs (posted_date)')
+
+def _scraped_jobs_fts(cursor):
+    # External-content FTS5 index: text lives in scraped_jobs only, triggers keep the index in step
+    cursor.execute('''
+    CREATE VIRTUAL TABLE IF NOT EXISTS scraped_jobs_fts USING fts5(
+        job_title, job_description, required_skills,
+        content='scraped_jobs', content_rowid='id', tokenize='porter unicode61'
+    )
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS scraped_jobs_fts_insert AFTER INSERT ON scraped_jobs BEGIN
+        INSERT INTO scraped_jobs_fts (rowid, job_title, job_description, required_skills)
+        VALUES (new.id, new.job_title, new.job_description, new.required_skills);
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS scraped_jobs_fts_delete AFTER DELETE ON scraped_jobs BEGIN
+        INSERT INTO scraped_jobs_fts (scraped_jobs_fts, rowid, job_title, job_description, required_skills)
+        VALUES ('delete', old.id, old.job_title, old.job_description, old.required_skills);
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS scraped_jobs_fts_update
+    AFTER UPDATE OF job_title, job_description, required_skills ON scraped_jobs BEGIN
+        INSERT INTO scraped_jobs_fts (scraped_jobs_fts, rowid, job_title, job_description, required_skills)
+        VALUES ('delete', old.id, old.job_title, old.job_description, old.required_skills);
+        INSERT INTO scraped_jobs_fts (rowid, job_title, job_description, required_skills)
+        VALUES (new.id, new.job_title, new.job_description, new.required_skills);
+    END
+    ''')
+    # Index the jobs stored before this migration
+    cursor.execute("INSERT INTO scraped_jobs_fts (scraped_jobs_fts) VALUES ('rebuild')")
+
+def _skill_link_statements(link, fk, row, column):
+    # Skill names in a JSON array column, deduplicated case-insensitively in the skills table
+    values = f"json_each(CASE WHEN json_valid({row}.{column}) THEN {row}.{column} ELSE '[]' END)"
+    return f'''
+        INSERT OR IGNORE INTO skills (name, normalized)
+        SELECT trim(value), lower(trim(value)) FROM {values} WHERE type = 'text' AND trim(value) != '';
+        INSERT OR IGNORE INTO {link} ({fk}, skill_id)
+        SELECT {row}.id, skills.id FROM {values} JOIN skills ON skills.normalized = lower(trim(value))
+        WHERE type = 'text';
+    '''
+
+def _normalized_skills(cursor):
+    """
+    A skills dictionary and one link table per skill column, so skills can be queried
+    with indexed joins. The JSON columns stay as the ordered copy that the API returns;
+    triggers keep the link tables in step with every write to them.
+    """
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS skills (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        normalized TEXT NOT NULL UNIQUE
+    )
+    ''')
+    for table, column, link, fk in SKILL_LINKS:
+        cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {link} (
+            {fk} INTEGER NOT NULL,
+            skill_id INTEGER NOT NULL,
+            PRIMARY KEY ({fk}, skill_id)
+        ) WITHOUT ROWID
+        ''')
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS idx_{link}_skill ON {link} (skill_id, {fk})')
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_skills_insert AFTER INSERT ON {table} BEGIN
+            {_skill_link_statements(link, fk, 'new', column)}
+        END
+        ''')
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_skills_update AFTER UPDATE OF {column} ON {table} BEGIN
+            DELETE FROM {link} WHERE {fk} = old.id;
+            {_skill_link_statements(link, fk, 'new', column)}
+        END
+        ''')
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_skills_delete AFTER DELETE ON {table} BEGIN
+            DELETE FROM {link} WHERE {fk} = old.id;
+        END
+        ''')
+
+        # Backfill; older rows may hold comma-separated text instead of JSON
+        cursor.execute(f'SELECT id, {column} FROM {table} WHERE {column} IS NOT NULL')
+        for row_id, value in cursor.fetchall():
+            try:
+                names = json.loads(value)
+            except (TypeError, ValueError):
+                names = value.split(',') if isinstance(value, str) else []
+            if not isinstance(names, list):
+                names = [names]
+            for name in names:
+                if not isinstance(name, str) or not name.strip():
+                    continue
+                cursor.execute('INSERT OR IGNORE INTO skills (name, normalized) VALUES (trim(?), lower(trim(?)))',
+                               (name, name))
+                cursor.execute(f'''
+                INSERT OR IGNORE INTO {link} ({fk}, skill_id)
+                SELECT ?, id FROM skills WHERE normalized = lower(trim(?))
+                ''', (row_id, name))
+
+def _analytics_indexes(cursor):
+    # Covers the job trend aggregates, so they scan the index instead of the job rows; categories
+    # lead so GROUP BY needs no sort, and duplicate_of comes last so list queries keep their own index
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_scraped_jobs_trends '
+                   'ON scraped_jobs (job_category, avg_pay_rate, client_rating, scraped_at, duplicate_of)')
+    # Near-duplicates are few; counts over canonical jobs subtract theirs
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_scraped_jobs_duplicates '
+                   'ON scraped_jobs (duplicate_of) WHERE duplicate_of IS NOT NULL')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_successful_proposals_created_at '
+                   'ON successful_proposals (created_at)')
+
+# Rollup key for a scraped job: missing categories count as 'Unknown', days are UTC dates
+def _job_rollup_key(row):
+    return f"COALESCE(NULLIF({row}.job_category, ''), 'Unknown')", f"COALESCE(date({row}.scraped_at), '')"
+
+def _job_rollup_statements(row, sign):
+    """Add (sign 1) or remove (sign -1) a canonical scraped job from the category/day and counter rollups"""
+    category, day = _job_rollup_key(row)
+    canonical = f"{row}.duplicate_of IS NULL"
+    pay_rated = f"({row}.avg_pay_rate IS NOT NULL AND {row}.avg_pay_rate != 0)"
+    client_rated = f"({row}.client_rating IS NOT NULL AND {row}.client_rating != 0)"
+    return f'''
+        INSERT INTO job_category_daily (category, day, job_count, pay_rate_sum, pay_rate_count,
+                                        client_rating_sum, client_rating_count)
+        SELECT {category}, {day}, {sign}, {sign} * COALESCE({row}.avg_pay_rate, 0), {sign} * {pay_rated},
+               {sign} * COALESCE({row}.client_rating, 0), {sign} * {client_rated}
+        WHERE {canonical}
+        ON CONFLICT (category, day) DO UPDATE SET
+            job_count = job_count + excluded.job_count,
+            pay_rate_sum = pay_rate_sum + excluded.pay_rate_sum,
+            pay_rate_count = pay_rate_count + excluded.pay_rate_count,
+            client_rating_sum = client_rating_sum + excluded.client_rating_sum,
+            client_rating_count = client_rating_count + excluded.client_rating_count;
+        DELETE FROM job_category_daily WHERE category = {category} AND day = {day} AND job_count <= 0;
+        UPDATE analytics_counters SET value = value + {sign} WHERE name = 'scraped_jobs' AND {canonical};
+    '''
+
+def _skill_rollup_statements(job_id, sign):
+    """Add or remove one canonical job's skill links from skill_job_counts"""
+    return f'''
+        INSERT INTO skill_job_counts (skill_id, job_count)
+        SELECT skill_id, {sign} FROM job_skills WHERE job_id = {job_id}
+        ON CONFLICT (skill_id) DO UPDATE SET job_count = job_count + excluded.job_count;
+    '''
+
+def _analytics_rollups(cursor):
+    """
+    Rollup tables for the dashboard and trends, kept in step by triggers inside each write's
+    transaction: row counters, canonical jobs per category and day with pay rate and client
+    rating sums, canonical jobs per skill and proposals per profile. Reads touch a handful
+    of rows however many jobs are stored.
+    """
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS analytics_counters (
+        name TEXT PRIMARY KEY,
+        value INTEGER NOT NULL DEFAULT 0
+    ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS job_category_daily (
+        category TEXT NOT NULL,
+        day TEXT NOT NULL,
+        job_count INTEGER NOT NULL DEFAULT 0,
+        pay_rate_sum REAL NOT NULL DEFAULT 0,
+        pay_rate_count INTEGER NOT NULL DEFAULT 0,
+        client_rating_sum REAL NOT NULL DEFAULT 0,
+        client_rating_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (category, day)
+    ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS skill_job_counts (
+        skill_id INTEGER PRIMARY KEY,
+        job_count INTEGER NOT NULL DEFAULT 0
+    )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_skill_job_counts_count ON skill_job_counts (job_count DESC)')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS profile_proposal_counts (
+        freelancer_id INTEGER PRIMARY KEY,
+        proposal_count INTEGER NOT NULL DEFAULT 0
+    )
+    ''')
+
+    # Row counters
+    for table, name in (('freelancer_profiles', 'profiles'), ('job_analysis_history', 'job_analyses')):
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_rollup_insert AFTER INSERT ON {table} BEGIN
+            UPDATE analytics_counters SET value = value + 1 WHERE name = '{name}';
+        END
+        ''')
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_rollup_delete AFTER DELETE ON {table} BEGIN
+            UPDATE analytics_counters SET value = value - 1 WHERE name = '{name}';
+        END
+        ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS successful_proposals_rollup_insert AFTER INSERT ON successful_proposals BEGIN
+        UPDATE analytics_counters SET value = value + 1 WHERE name = 'proposals';
+        INSERT INTO profile_proposal_counts (freelancer_id, proposal_count) VALUES (new.freelancer_id, 1)
+        ON CONFLICT (freelancer_id) DO UPDATE SET proposal_count = proposal_count + 1;
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS successful_proposals_rollup_delete AFTER DELETE ON successful_proposals BEGIN
+        UPDATE analytics_counters SET value = value - 1 WHERE name = 'proposals';
+        UPDATE profile_proposal_counts SET proposal_count = proposal_count - 1 WHERE freelancer_id = old.freelancer_id;
+    END
+    ''')
+
+    # Jobs per category and day; near-duplicates are left out, as in the job lists
+    cursor.execute(f'''
+    CREATE TRIGGER IF NOT EXISTS scraped_jobs_rollup_insert AFTER INSERT ON scraped_jobs BEGIN
+        {_job_rollup_statements('new', 1)}
+    END
+    ''')
+    cursor.execute(f'''
+    CREATE TRIGGER IF NOT EXISTS scraped_jobs_rollup_delete AFTER DELETE ON scraped_jobs BEGIN
+        {_job_rollup_statements('old', -1)}
+    END
+    ''')
+    cursor.execute(f'''
+    CREATE TRIGGER IF NOT EXISTS scraped_jobs_rollup_update
+    AFTER UPDATE OF job_category, avg_pay_rate, client_rating, scraped_at, duplicate_of ON scraped_jobs BEGIN
+        {_job_rollup_statements('old', -1)}
+        {_job_rollup_statements('new', 1)}
+    END
+    ''')
+
+    # Jobs per skill. Links written while their job exists count if the job is canonical. A deleted
+    # job's links are removed after the row is gone, so the job is taken out before the delete.
+    canonical_job = 'EXISTS (SELECT 1 FROM scraped_jobs WHERE id = {}.job_id AND duplicate_of IS NULL)'
+    cursor.execute(f'''
+    CREATE TRIGGER IF NOT EXISTS job_skills_rollup_insert AFTER INSERT ON job_skills
+    WHEN {canonical_job.format('new')} BEGIN
+        INSERT INTO skill_job_counts (skill_id, job_count) VALUES (new.skill_id, 1)
+        ON CONFLICT (skill_id) DO UPDATE SET job_count = job_count + 1;
+    END
+    ''')
+    cursor.execute(f'''
+    CREATE TRIGGER IF NOT EXISTS job_skills_rollup_delete AFTER DELETE ON job_skills
+    WHEN {canonical_job.format('old')} BEGIN
+        UPDATE skill_job_counts SET job_count = job_count - 1 WHERE skill_id = old.skill_id;
+    END
+    ''')
+    cursor.execute(f'''
+    CREATE TRIGGER IF NOT EXISTS scraped_jobs_skill_rollup_delete BEFORE DELETE ON scraped_jobs
+    WHEN old.duplicate_of IS NULL BEGIN
+        {_skill_rollup_statements('old.id', -1)}
+    END
+    ''')
+    cursor.execute(f'''
+    CREATE TRIGGER IF NOT EXISTS scraped_jobs_skill_rollup_update AFTER UPDATE OF duplicate_of ON scraped_jobs
+    WHEN (old.duplicate_of IS NULL) != (new.duplicate_of IS NULL) BEGIN
+        {_skill_rollup_statements('new.id', 'CASE WHEN new.duplicate_of IS NULL THEN 1 ELSE -1 END')}
+    END
+    ''')
+
+    # Backfill from the rows stored before this migration
+    cursor.execute('''
+    INSERT OR REPLACE INTO analytics_counters (name, value)
+    SELECT 'profiles', COUNT(*) FROM freelancer_profiles
+    UNION ALL SELECT 'scraped_jobs', COUNT(*) FROM scraped_jobs WHERE duplicate_of IS NULL
+    UNION ALL SELECT 'job_analyses', COUNT(*) FROM job_analysis_history
+    UNION ALL SELECT 'proposals', COUNT(*) FROM successful_proposals
+    ''')
+    category, day = _job_rollup_key('scraped_jobs')
+    cursor.execute(f'''
+    INSERT OR REPLACE INTO job_category_daily (category, day, job_count, pay_rate_sum, pay_rate_count,
+                                               client_rating_sum, client_rating_count)
+    SELECT {category}, {day}, COUNT(*),
+           COALESCE(SUM(avg_pay_rate), 0), SUM(avg_pay_rate IS NOT NULL AND avg_pay_rate != 0),
+           COALESCE(SUM(client_rating), 0), SUM(client_rating IS NOT NULL AND client_rating != 0)
+    FROM scraped_jobs WHERE duplicate_of IS NULL
+    GROUP BY 1, 2
+    ''')
+    cursor.execute('''
+    INSERT OR REPLACE INTO skill_job_counts (skill_id, job_count)
+    SELECT job_skills.skill_id, COUNT(*) FROM job_skills
+    JOIN scraped_jobs ON scraped_jobs.id = job_skills.job_id
+    WHERE scraped_jobs.duplicate_of IS NULL
+    GROUP BY job_skills.skill_id
+    ''')
+    cursor.execute('''
+    INSERT OR REPLACE INTO profile_proposal_counts (freelancer_id, proposal_count)
+    SELECT freelancer_id, COUNT(*) FROM successful_proposals WHERE freelancer_id IS NOT NULL GROUP BY freelancer_id
+    ''')
+
+    # The trend aggregates no longer scan scraped_jobs, so their indexes only slow down writes
+    cursor.execute('DROP INDEX IF EXISTS idx_scraped_jobs_trends')
+    cursor.execute('DROP INDEX IF EXISTS idx_scraped_jobs_duplicates')
+
+# (version, description, function) in the order they are applied
+MIGRATIONS = [
+    (1, "baseline schema", _baseline),
+    (2, "indexes for per-profile lists, job ordering and task lookup", _profile_and_job_indexes),
+    (3, "indexes for scraped job list filters", _scraped_job_filter_indexes),
+    (4, "full-text search index over scraped jobs", _scraped_jobs_fts),
+    (5, "normalized skills with link tables for profiles, jobs and projects", _normalized_skills),
+    (6, "indexes for analytics aggregates", _analytics_indexes),
+    (7, "trigger-maintained analytics rollup tables", _analytics_rollups),
+]
+
+def current_version(conn: sqlite3.Connection) -> int:
+    """Highest applied migration version (0 for a new database)"""
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        description TEXT NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+    row = conn.execute('SELECT MAX(version) FROM schema_version').fetchone()
+    return row[0] or 0
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """Apply pending migrations in order, returning the resulting schema version"""
+    version = current_version(conn)
+    conn.commit()
+    for migration_version, description, apply in MIGRATIONS:
+        if migration_version <= version:
+            continue
+        cursor = conn.cursor()
+        try:
+            # Explicit BEGIN so DDL and the version row commit (or roll back) together
+            cursor.execute('BEGIN')
+            apply(cursor)
+            cursor.execute('INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)',
+                           (migration_version, description, datetime.now()))
+            conn.commit()
+            print(f"Applied schema migration {migration_version}: {description}")
+            version = migration_version
+        except sqlite3.Error as e:
+            conn.rollback()
+            print(f"Error applying schema migration {migration_version}: {e}")
+            raise
+        finally:
+            cursor.close()
+    return version
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Rebuild scraped_jobs from the raw payload archive without refetching anything.
+Run it after fixing a mapping bug in UpworkScraper: the latest archived payload
+of every job is re-mapped on a process pool and upserted by job URL.
+
+Usage:
+    python remap_jobs.py --workers 4
+    python remap_jobs.py --dry-run --cleaning-mode fast
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+_scraper = None
+
+def init_worker(cleaning_mode):
+    """Load one scraper (and its spaCy pipeline) per worker process"""
+    global _scraper
+    from utils.web_scraper import UpworkScraper
+    _scraper = UpworkScraper(cleaning_mode=cleaning_mode)
+
+def map_chunk(payloads: List[Dict]) -> List[Dict]:
+    return _scraper._map_api_jobs(payloads)
+
+def chunked(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-map archived raw payloads into scraped_jobs")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Mapping processes")
+    parser.add_argument("--chunk-size", type=int, default=200, help="Payloads per task sent to a worker")
+    parser.add_argument("--cleaning-mode", choices=["spacy", "fast"], default=None,
+                        help="Defaults to SCRAPER_CLEANING_MODE")
+    parser.add_argument("--archive-dir", default=None, help="Defaults to PAYLOAD_ARCHIVE_DIR")
+    parser.add_argument("--dry-run", action="store_true", help="Map everything but do not write to the database")
+    args = parser.parse_args()
+
+    from utils.payload_archive import PayloadArchive
+    archive = PayloadArchive(directory=args.archive_dir)
+    segments = archive.segments()
+    if not segments:
+        print(f"❌ No archive segments found in {archive.directory}")
+        return
+
+    start = time.perf_counter()
+    payloads = list(archive.latest_payloads().values())
+    print(f"Loaded {len(payloads)} jobs from {len(segments)} segments in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    mapped = []
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker,
+                             initargs=(args.cleaning_mode,)) as pool:
+        for jobs in pool.map(map_chunk, chunked(payloads, args.chunk_size)):
+            mapped.extend(job for job in jobs if job.get('job_url'))
+    print(f"Mapped {len(mapped)} jobs with {args.workers} workers in {time.perf_counter() - start:.2f}s")
+
+    if args.dry_run:
+        print("✅ Dry run, database not modified")
+        return
+
+    from models.database import Database
+    result = Database().upsert_scraped_jobs(mapped)
+    if result is None:
+        print("❌ Failed to write re-mapped jobs")
+        return
+    inserted, updated = result
+    print(f"✅ scraped_jobs rebuilt: {updated} updated, {inserted} inserted")
+
+if __name__ == "__main__":
+    main()
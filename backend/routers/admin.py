@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta, timezone
+from fastapi import APIRouter, HTTPException
+from models.async_database import AsyncDatabase, db_executor_status, run_db
+from utils.ingester import get_ingester
+from utils.ingest_pipeline import pipeline_status
+from utils.loop_monitor import get_loop_monitor
+from utils.rate_limiter import get_circuit_breaker
+from utils.request_budget import get_request_budget
+from utils.web_scraper import RAPIDAPI_HOST, get_scraper_key_pool
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+@router.get("/ingester")
+async def get_ingester_status():
+    """Get background feed ingester lag, throughput and last error"""
+    try:
+        # Reads the watermark from the database, so it runs in the database pool
+        return await run_db(get_ingester().status)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/pipeline")
+async def get_pipeline_status():
+    """Get scrape pipeline stage settings, queue depths and counters"""
+    try:
+        return pipeline_status()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/upstream")
+async def get_upstream_status():
+    """Get the job API key pool (per-key rate limit and health) and circuit breaker state"""
+    try:
+        return {
+            "key_pool": get_scraper_key_pool().status(),
+            "circuit_breaker": get_circuit_breaker(RAPIDAPI_HOST).status()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/quota")
+async def get_quota_status():
+    """Get today's request budget plan and upstream call statistics for the last 24 hours"""
+    try:
+        since = (datetime.now(timezone.utc) - timedelta(hours=24)).strftime('%Y-%m-%d %H:%M:%S')
+        return {
+            "budget": await run_db(get_request_budget().status),
+            "last_24h": await AsyncDatabase().get_api_call_stats(since)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/event-loop")
+async def get_event_loop_status():
+    """Get event loop lag (how long requests wait behind blocking work) and database pool usage"""
+    try:
+        return {
+            "event_loop": get_loop_monitor().status(),
+            "db_executor": db_executor_status()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
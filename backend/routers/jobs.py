@@ -1,18 +1,38 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import StreamingResponse, JSONResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List, Optional
-from models.database import Database
+from models.async_database import AsyncDatabase
 from utils.web_scraper import UpworkScraper
 from utils.job_analyzer import JobAnalyzer
+from utils.scrape_runner import iter_scrape_events, SCRAPE_MODES
+from utils.scrape_tasks import get_task_worker
+from utils.bulk_scrape import iter_bulk_scrape_events
 from datetime import datetime
+import base64
+import binascii
+import json
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
+MAX_BULK_URLS = 1000
+MAX_PAGE_SIZE = 1000
+
 # Pydantic models
 class ScrapingRequest(BaseModel):
     keywords: List[str]
     max_jobs_per_keyword: int = 10
     category_filter: Optional[str] = None
+    # Queue the scrape as a background task and return 202 with a task id
+    background: bool = False
+    # 'feed' stores every feed item; 'two_tier' pre-filters against profiles and fetches details for the shortlist
+    mode: str = "feed"
+
+class BulkUrlScrapingRequest(BaseModel):
+    urls: List[str]
+    # Detail calls in flight at once (defaults to SCRAPER_BULK_CONCURRENCY)
+    max_concurrency: Optional[int] = None
 
 class JobAnalysisRequest(BaseModel):
     job_title: str
@@ -25,7 +45,7 @@ class JobAnalysisRequest(BaseModel):
 
 # Dependencies
 def get_db():
-    return Database()
+    return AsyncDatabase()
 
 def get_scraper():
     return UpworkScraper()
@@ -33,90 +53,198 @@ def get_scraper():
 def get_analyzer():
     return JobAnalyzer()
 
+def _valid_keywords(keywords: List[str]) -> List[str]:
+    # Filter out empty or whitespace-only keywords
+    valid_keywords = [k.strip() for k in keywords if k.strip()]
+    if not valid_keywords:
+        # If no valid keywords, use a generic keyword to fetch latest jobs
+        valid_keywords = ["latest"]
+        print("No valid keywords provided. Using default keyword: 'latest'")
+    return valid_keywords
+
+def _encode_cursor(*key) -> str:
+    # Opaque to clients: the position after the last job on the page
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode()
+
+def _decode_cursor(cursor: str, *types) -> tuple:
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if len(key) != len(types):
+            raise ValueError(cursor)
+        return tuple(kind(value) for kind, value in zip(types, key))
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _check_mode(mode: str):
+    if mode not in SCRAPE_MODES:
+        raise HTTPException(status_code=400, detail=f"Invalid mode '{mode}', expected one of {list(SCRAPE_MODES)}")
+
 @router.post("/scrape")
-async def scrape_jobs(request: ScrapingRequest, db: Database = Depends(get_db)):
+async def scrape_jobs(request: ScrapingRequest, http_request: Request, db: AsyncDatabase = Depends(get_db)):
     """Scrape jobs from Upwork based on keywords"""
     print("Received scrape request:", request)
     try:
-        # Filter out empty or whitespace-only keywords
-        valid_keywords = [k.strip() for k in request.keywords if k.strip()]
-        if not valid_keywords:
-            # If no valid keywords, use a generic keyword to fetch latest jobs
-            valid_keywords = ["latest"]
-            print("No valid keywords provided. Using default keyword: 'latest'")
-
-        scraper = get_scraper()
-        scraped_jobs = []
-        added_count = 0
-        
-        print(f"Processing {len(valid_keywords)} keywords: {valid_keywords}")
-        
-        for keyword in valid_keywords:
-            print(f"Searching for keyword: {keyword}")
-            jobs = scraper.search_jobs(
-                keywords=[keyword],
-                max_jobs=request.max_jobs_per_keyword,
-                category_filter=request.category_filter
+        _check_mode(request.mode)
+        valid_keywords = _valid_keywords(request.keywords)
+        if request.background:
+            task_id = get_task_worker().enqueue(valid_keywords, request.max_jobs_per_keyword,
+                                                request.category_filter, request.mode)
+            status_url = str(http_request.url_for("get_scrape_task", task_id=task_id))
+            return JSONResponse(
+                status_code=202,
+                content={"task_id": task_id, "status": "queued", "status_url": status_url},
+                headers={"Location": status_url}
             )
-            print(f"Found {len(jobs)} jobs for keyword '{keyword}'")
-            
-            for job in jobs:
-                job_id = db.add_scraped_job(
-                    job_title=job.get('job_title', ''),
-                    job_url=job.get('job_url', ''),
-                    job_description=job.get('job_description', ''),
-                    required_skills=job.get('required_skills', []),
-                    client_name=job.get('client_name', ''),
-                    client_rating=job.get('client_rating', 0.0),
-                    client_total_jobs=job.get('client_total_jobs', 0),
-                    client_total_hires=job.get('client_total_hires', 0),
-                    client_avg_review=job.get('client_avg_review', 0.0),
-                    budget_range=job.get('budget_range', ''),
-                    avg_pay_rate=job.get('avg_pay_rate', 0.0),
-                    project_duration=job.get('project_duration', ''),
-                    job_category=job.get('job_category', ''),
-                    posted_date=job.get('posted_date', '')
-                )
-                if job_id:
-                    added_count += 1
-                scraped_jobs.append(job)
-        
-        total_jobs = len(scraped_jobs)
-        duplicate_count = total_jobs - added_count
-        
-        if total_jobs == 0:
-            message = (f"No jobs found for the given keywords. Possible reasons: "
-                       f"- No relevant jobs available at this time. "
-                       f"- API may be rate limited or unavailable. "
-                       f"- The keyword(s) may be too specific. "
-                       f"Try different keywords or check your API settings.")
-            print(message)
-            return {"message": message, "jobs": [], "added_count": 0, "total_count": 0}
-        
-        message = f"Scraped {total_jobs} jobs"
-        if duplicate_count > 0:
-            message += f" ({added_count} new, {duplicate_count} duplicates ignored)"
-        
-        print(f"Final result: {message}")
-        return {"message": message, "jobs": scraped_jobs, "added_count": added_count, "total_count": total_jobs}
+
+        print(f"Processing {len(valid_keywords)} keywords: {valid_keywords}")
+
+        def run_scrape():
+            scraped_jobs = []
+            result = {}
+            for event in iter_scrape_events(get_scraper(), db.sync, valid_keywords,
+                                            request.max_jobs_per_keyword, request.category_filter, request.mode):
+                if event["type"] == "job":
+                    scraped_jobs.append(event["job"])
+                elif event["type"] == "done":
+                    result = event
+            return scraped_jobs, result
+
+        # Scraper and database calls block, so the whole scrape runs off the event loop
+        scraped_jobs, result = await run_in_threadpool(run_scrape)
+
+        print(f"Final result: {result['message']}")
+        return {"message": result["message"], "jobs": scraped_jobs,
+                "added_count": result["added_count"], "total_count": result["total_count"],
+                "skipped_count": result.get("skipped_count", 0),
+                "filtered_count": result.get("filtered_count", 0), "source": result["source"]}
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in scrape_jobs: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/scrape/stream")
+async def scrape_jobs_stream(request: ScrapingRequest, db: AsyncDatabase = Depends(get_db)):
+    """Scrape jobs and stream each stored job and per-keyword progress as NDJSON"""
+    print("Received streaming scrape request:", request)
+    _check_mode(request.mode)
+    valid_keywords = _valid_keywords(request.keywords)
+
+    def event_stream():
+        try:
+            for event in iter_scrape_events(get_scraper(), db.sync, valid_keywords,
+                                            request.max_jobs_per_keyword, request.category_filter,
+                                            request.mode):
+                yield json.dumps(event) + "\n"
+        except Exception as e:
+            print(f"Error in scrape_jobs_stream: {e}")
+            yield json.dumps({"type": "error", "detail": str(e)}) + "\n"
+
+    # Starlette iterates this sync generator in its threadpool, so blocking scraper
+    # calls do not stall the event loop
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@router.post("/scrape-urls")
+async def scrape_job_urls(request: BulkUrlScrapingRequest, db: AsyncDatabase = Depends(get_db)):
+    """Fetch many job URLs concurrently, store new ones and stream per-URL status as NDJSON"""
+    if not request.urls:
+        raise HTTPException(status_code=400, detail="No URLs provided")
+    if len(request.urls) > MAX_BULK_URLS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_URLS} URLs per request")
+    print(f"Received bulk URL scrape request for {len(request.urls)} URLs")
+
+    def event_stream():
+        try:
+            for event in iter_bulk_scrape_events(get_scraper(), db.sync, request.urls, request.max_concurrency):
+                yield json.dumps(event) + "\n"
+        except Exception as e:
+            print(f"Error in scrape_job_urls: {e}")
+            yield json.dumps({"type": "error", "detail": str(e)}) + "\n"
+
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@router.get("/scrape/{task_id}")
+async def get_scrape_task(task_id: str, db: AsyncDatabase = Depends(get_db)):
+    """Get progress, counts and errors of a background scrape task"""
+    try:
+        task = await db.get_scrape_task(task_id)
+        if not task:
+            raise HTTPException(status_code=404, detail="Scrape task not found")
+        return task
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/scraped")
-async def get_scraped_jobs(limit: int = 50, db: Database = Depends(get_db)):
-    """Get scraped jobs from database"""
+async def get_scraped_jobs(limit: int = 50, include_duplicates: bool = False, cursor: Optional[str] = None,
+                           category: Optional[str] = None, min_pay_rate: Optional[float] = None,
+                           min_client_rating: Optional[float] = None, posted_after: Optional[str] = None,
+                           posted_before: Optional[str] = None, skill: Optional[str] = None,
+                           db: AsyncDatabase = Depends(get_db)):
+    """
+    Get scraped jobs from database, newest first (near-duplicates are hidden unless requested).
+    When there are more jobs, the X-Next-Cursor header holds the cursor for the next page.
+    """
+    try:
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_PAGE_SIZE}")
+        after = _decode_cursor(cursor, str, int) if cursor else None
+        # One extra row tells whether another page exists
+        jobs = await db.get_scraped_jobs(limit=limit + 1, include_duplicates=include_duplicates, after=after,
+                                   category=category, min_pay_rate=min_pay_rate,
+                                   min_client_rating=min_client_rating, posted_after=posted_after,
+                                   posted_before=posted_before, skill=skill)
+        headers = {}
+        if len(jobs) > limit:
+            jobs = jobs[:limit]
+            headers["X-Next-Cursor"] = _encode_cursor(jobs[-1]['scraped_at'], jobs[-1]['id'])
+        return JSONResponse(content=jobs, headers=headers)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/skills")
+async def get_skill_counts(limit: int = 50, include_duplicates: bool = False, db: AsyncDatabase = Depends(get_db)):
+    """Skills ranked by the number of scraped jobs requiring them"""
     try:
-        jobs = db.get_scraped_jobs(limit=limit)
-        return jobs
+        return await db.get_skill_counts(limit=limit, include_duplicates=include_duplicates)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/search")
+async def search_jobs(q: str, limit: int = 20, cursor: Optional[str] = None, include_duplicates: bool = False,
+                      db: AsyncDatabase = Depends(get_db)):
+    """
+    Full-text search over scraped job titles, descriptions and skills, best match first.
+    Jobs carry a bm25 'rank' and a highlighted 'snippet'; X-Next-Cursor points to the next page.
+    """
+    try:
+        if not q.strip():
+            raise HTTPException(status_code=400, detail="Search query must not be empty")
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_PAGE_SIZE}")
+        # Rank order has no stable key across inserts, so search pages by offset
+        offset = _decode_cursor(cursor, int)[0] if cursor else 0
+        jobs = await db.search_scraped_jobs(q, limit=limit + 1, offset=offset, include_duplicates=include_duplicates)
+        headers = {}
+        if len(jobs) > limit:
+            jobs = jobs[:limit]
+            headers["X-Next-Cursor"] = _encode_cursor(offset + limit)
+        return JSONResponse(content=jobs, headers=headers)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/scraped")
-async def clear_scraped_jobs(db: Database = Depends(get_db)):
+async def clear_scraped_jobs(db: AsyncDatabase = Depends(get_db)):
     """Clear all scraped jobs from database"""
     try:
-        success = db.clear_scraped_jobs()
+        success = await db.clear_scraped_jobs()
         if success:
             return {"message": "All scraped jobs cleared successfully"}
         else:
@@ -125,15 +253,17 @@ async def clear_scraped_jobs(db: Database = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/analyze")
-async def analyze_job(request: JobAnalysisRequest, db: Database = Depends(get_db)):
+async def analyze_job(request: JobAnalysisRequest, db: AsyncDatabase = Depends(get_db)):
     """Analyze a job for fit and generate recommendations"""
     try:
-        profile = db.get_freelancer_profile(request.freelancer_id)
+        profile = await db.get_freelancer_profile(request.freelancer_id)
         if not profile:
             raise HTTPException(status_code=404, detail="Freelancer profile not found")
         
-        analyzer = get_analyzer()
-        analysis_result = analyzer.analyze_job_fit(
+        # Loading spaCy and the similarity scoring are CPU-bound, so both run off the event loop
+        analyzer = await run_in_threadpool(get_analyzer)
+        analysis_result = await run_in_threadpool(
+            analyzer.analyze_job_fit,
             job_title=request.job_title,
             job_description=request.job_description,
             required_skills=request.required_skills,
@@ -144,7 +274,7 @@ async def analyze_job(request: JobAnalysisRequest, db: Database = Depends(get_db
             freelancer_experience=profile['experience_years']
         )
         
-        analysis_id = db.add_job_analysis(
+        analysis_id = await db.add_job_analysis(
             freelancer_id=request.freelancer_id,
             job_title=request.job_title,
             job_url=request.job_url,
@@ -170,8 +300,9 @@ async def analyze_job(request: JobAnalysisRequest, db: Database = Depends(get_db
 async def scrape_job_from_url(url: str):
     """Scrape a specific job from URL"""
     try:
-        scraper = get_scraper()
-        job_data = scraper.scrape_job_from_url(url)
+        # Building the scraper loads spaCy and the detail call blocks on the network
+        scraper = await run_in_threadpool(get_scraper)
+        job_data = await run_in_threadpool(scraper.scrape_job_from_url, url)
         if not job_data:
             raise HTTPException(status_code=404, detail="Could not scrape job from URL")
         return job_data
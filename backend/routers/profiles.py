@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import List, Optional
-from models.database import Database
+from models.async_database import AsyncDatabase
 import json
 
 router = APIRouter(prefix="/profiles", tags=["profiles"])
@@ -90,13 +90,13 @@ class RelevantExperienceProjectResponse(BaseModel):
 
 # Dependency to get database instance
 def get_db():
-    return Database()
+    return AsyncDatabase()
 
 @router.post("/", response_model=ProfileResponse)
-async def create_profile(profile: ProfileCreate, db: Database = Depends(get_db)):
+async def create_profile(profile: ProfileCreate, db: AsyncDatabase = Depends(get_db)):
     """Create a new freelancer profile"""
     try:
-        profile_id = db.add_freelancer_profile(
+        profile_id = await db.add_freelancer_profile(
             name=profile.name,
             email=profile.email,
             hourly_rate=profile.hourly_rate,
@@ -111,7 +111,7 @@ async def create_profile(profile: ProfileCreate, db: Database = Depends(get_db))
         )
         
         # Get the created profile
-        created_profile = db.get_freelancer_profile(profile_id)
+        created_profile = await db.get_freelancer_profile(profile_id)
         if not created_profile:
             raise HTTPException(status_code=500, detail="Failed to create profile")
         
@@ -120,11 +120,11 @@ async def create_profile(profile: ProfileCreate, db: Database = Depends(get_db))
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/", response_model=List[ProfileResponse])
-async def get_all_profiles(db: Database = Depends(get_db)):
+async def get_all_profiles(db: AsyncDatabase = Depends(get_db)):
     """Get all freelancer profiles"""
     try:
         print("DEBUG: Starting get_all_profiles")
-        profiles = db.get_all_freelancer_profiles()
+        profiles = await db.get_all_freelancer_profiles()
         print(f"DEBUG: Retrieved {len(profiles)} profiles from database")
         
         # Convert each profile to ProfileResponse with error handling
@@ -148,10 +148,10 @@ async def get_all_profiles(db: Database = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{profile_id}", response_model=ProfileResponse)
-async def get_profile(profile_id: int, db: Database = Depends(get_db)):
+async def get_profile(profile_id: int, db: AsyncDatabase = Depends(get_db)):
     """Get a specific freelancer profile"""
     try:
-        profile = db.get_freelancer_profile(profile_id)
+        profile = await db.get_freelancer_profile(profile_id)
         if not profile:
             raise HTTPException(status_code=404, detail="Profile not found")
         return ProfileResponse(**profile)
@@ -161,11 +161,11 @@ async def get_profile(profile_id: int, db: Database = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.put("/{profile_id}", response_model=ProfileResponse)
-async def update_profile(profile_id: int, profile_update: ProfileUpdate, db: Database = Depends(get_db)):
+async def update_profile(profile_id: int, profile_update: ProfileUpdate, db: AsyncDatabase = Depends(get_db)):
     """Update a freelancer profile"""
     try:
         # Check if profile exists
-        existing_profile = db.get_freelancer_profile(profile_id)
+        existing_profile = await db.get_freelancer_profile(profile_id)
         if not existing_profile:
             raise HTTPException(status_code=404, detail="Profile not found")
         
@@ -179,12 +179,12 @@ async def update_profile(profile_id: int, profile_update: ProfileUpdate, db: Dat
             raise HTTPException(status_code=400, detail="No fields to update")
         
         # Update profile
-        success = db.update_freelancer_profile(profile_id, **update_data)
+        success = await db.update_freelancer_profile(profile_id, **update_data)
         if not success:
             raise HTTPException(status_code=500, detail="Failed to update profile")
         
         # Get updated profile
-        updated_profile = db.get_freelancer_profile(profile_id)
+        updated_profile = await db.get_freelancer_profile(profile_id)
         if not updated_profile:
             print(f"[ERROR] Updated profile not found for id {profile_id} after update.")
             raise HTTPException(status_code=500, detail="Failed to fetch updated profile")
@@ -195,16 +195,16 @@ async def update_profile(profile_id: int, profile_update: ProfileUpdate, db: Dat
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/{profile_id}")
-async def delete_profile(profile_id: int, db: Database = Depends(get_db)):
+async def delete_profile(profile_id: int, db: AsyncDatabase = Depends(get_db)):
     """Delete a freelancer profile and all related data"""
     try:
         # Check if profile exists
-        existing_profile = db.get_freelancer_profile(profile_id)
+        existing_profile = await db.get_freelancer_profile(profile_id)
         if not existing_profile:
             raise HTTPException(status_code=404, detail="Profile not found")
         
         # Delete only the specific profile and related data
-        success = db.delete_freelancer_profile(profile_id)
+        success = await db.delete_freelancer_profile(profile_id)
         if not success:
             raise HTTPException(status_code=500, detail="Failed to delete profile")
         
@@ -219,17 +219,17 @@ async def delete_profile(profile_id: int, db: Database = Depends(get_db)):
 async def add_relevant_experience_project(
     profile_id: int, 
     project: RelevantExperienceProjectCreate, 
-    db: Database = Depends(get_db)
+    db: AsyncDatabase = Depends(get_db)
 ):
     """Add a relevant experience project to a freelancer profile"""
     try:
         # Check if profile exists
-        existing_profile = db.get_freelancer_profile(profile_id)
+        existing_profile = await db.get_freelancer_profile(profile_id)
         if not existing_profile:
             raise HTTPException(status_code=404, detail="Profile not found")
         
         # Add the project
-        project_id = db.add_relevant_experience_project(
+        project_id = await db.add_relevant_experience_project(
             freelancer_id=profile_id,
             project_title=project.project_title,
             project_description=project.project_description,
@@ -246,7 +246,7 @@ async def add_relevant_experience_project(
             raise HTTPException(status_code=500, detail="Failed to add relevant experience project")
         
         # Get the added project
-        projects = db.get_relevant_experience_projects(profile_id)
+        projects = await db.get_relevant_experience_projects(profile_id)
         for proj in projects:
             if proj['id'] == project_id:
                 return RelevantExperienceProjectResponse(**proj)
@@ -259,32 +259,46 @@ async def add_relevant_experience_project(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{profile_id}/relevant-experience", response_model=List[RelevantExperienceProjectResponse])
-async def get_relevant_experience_projects(profile_id: int, db: Database = Depends(get_db)):
+async def get_relevant_experience_projects(profile_id: int, db: AsyncDatabase = Depends(get_db)):
     """Get all relevant experience projects for a freelancer profile"""
     try:
         # Check if profile exists
-        existing_profile = db.get_freelancer_profile(profile_id)
+        existing_profile = await db.get_freelancer_profile(profile_id)
         if not existing_profile:
             raise HTTPException(status_code=404, detail="Profile not found")
         
-        projects = db.get_relevant_experience_projects(profile_id)
+        projects = await db.get_relevant_experience_projects(profile_id)
         return [RelevantExperienceProjectResponse(**project) for project in projects]
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/{profile_id}/matching-jobs")
+async def get_matching_jobs(profile_id: int, limit: int = 20, db: AsyncDatabase = Depends(get_db)):
+    """Get scraped jobs that share the most skills with a freelancer profile"""
+    try:
+        existing_profile = await db.get_freelancer_profile(profile_id)
+        if not existing_profile:
+            raise HTTPException(status_code=404, detail="Profile not found")
+
+        return await db.get_jobs_matching_profile(profile_id, limit=limit)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.put("/{profile_id}/relevant-experience/{project_id}", response_model=RelevantExperienceProjectResponse)
 async def update_relevant_experience_project(
     profile_id: int,
     project_id: int,
     project_update: RelevantExperienceProjectUpdate,
-    db: Database = Depends(get_db)
+    db: AsyncDatabase = Depends(get_db)
 ):
     """Update a relevant experience project"""
     try:
         # Check if profile exists
-        existing_profile = db.get_freelancer_profile(profile_id)
+        existing_profile = await db.get_freelancer_profile(profile_id)
         if not existing_profile:
             raise HTTPException(status_code=404, detail="Profile not found")
         
@@ -298,12 +312,12 @@ async def update_relevant_experience_project(
             raise HTTPException(status_code=400, detail="No fields to update")
         
         # Update the project
-        success = db.update_relevant_experience_project(project_id, **update_data)
+        success = await db.update_relevant_experience_project(project_id, **update_data)
         if not success:
             raise HTTPException(status_code=500, detail="Failed to update project")
         
         # Get the updated project
-        projects = db.get_relevant_experience_projects(profile_id)
+        projects = await db.get_relevant_experience_projects(profile_id)
         for proj in projects:
             if proj['id'] == project_id:
                 return RelevantExperienceProjectResponse(**proj)
@@ -316,16 +330,16 @@ async def update_relevant_experience_project(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/{profile_id}/relevant-experience/{project_id}")
-async def delete_relevant_experience_project(profile_id: int, project_id: int, db: Database = Depends(get_db)):
+async def delete_relevant_experience_project(profile_id: int, project_id: int, db: AsyncDatabase = Depends(get_db)):
     """Delete a relevant experience project"""
     try:
         # Check if profile exists
-        existing_profile = db.get_freelancer_profile(profile_id)
+        existing_profile = await db.get_freelancer_profile(profile_id)
         if not existing_profile:
             raise HTTPException(status_code=404, detail="Profile not found")
         
         # Delete the project
-        success = db.delete_relevant_experience_project(project_id)
+        success = await db.delete_relevant_experience_project(project_id)
         if not success:
             raise HTTPException(status_code=500, detail="Failed to delete project")
         
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import List, Optional
-from models.database import Database
+from models.async_database import AsyncDatabase
 from utils.proposal_generator import ProposalGenerator
 from datetime import datetime
 
@@ -35,30 +35,34 @@ class ProposalResponse(BaseModel):
     keywords_used: Optional[str]
     created_at: str
 
+class ProposalStatusUpdate(BaseModel):
+    status: str
+    client_response: Optional[str] = None
+
 # Dependencies
 def get_db():
-    return Database()
+    return AsyncDatabase()
 
 def get_proposal_generator():
     return ProposalGenerator()
 
 @router.post("/generate", response_model=ProposalResponse)
-async def generate_proposal(request: ProposalRequest, db: Database = Depends(get_db)):
+async def generate_proposal(request: ProposalRequest, db: AsyncDatabase = Depends(get_db)):
     """Generate a proposal for a job"""
     try:
         # Get freelancer profile
-        profile = db.get_freelancer_profile(request.freelancer_id)
+        profile = await db.get_freelancer_profile(request.freelancer_id)
         if not profile:
             raise HTTPException(status_code=404, detail="Freelancer profile not found")
         
         # Get past projects for context
-        past_projects = db.get_past_projects(request.freelancer_id)
+        past_projects = await db.get_past_projects(request.freelancer_id)
         
         # Get relevant experience projects
-        relevant_experience_projects = db.get_relevant_experience_projects(request.freelancer_id)
+        relevant_experience_projects = await db.get_relevant_experience_projects(request.freelancer_id)
         
         # Get successful proposals for reference
-        successful_proposals = db.get_successful_proposals(request.freelancer_id)
+        successful_proposals = await db.get_successful_proposals(request.freelancer_id)
         
         # Generate proposal
         generator = get_proposal_generator()
@@ -79,7 +83,7 @@ async def generate_proposal(request: ProposalRequest, db: Database = Depends(get
         )
         
         # Save proposal to database
-        proposal_id = db.add_successful_proposal(
+        proposal_id = await db.add_successful_proposal(
             freelancer_id=request.freelancer_id,
             job_title=request.job_title,
             proposal_text=proposal_text,
@@ -90,12 +94,10 @@ async def generate_proposal(request: ProposalRequest, db: Database = Depends(get
         )
         
         # Get the saved proposal
-        proposals = db.get_successful_proposals(request.freelancer_id)
-        for proposal in proposals:
-            if proposal['id'] == proposal_id:
-                return ProposalResponse(**proposal)
-        
-        raise HTTPException(status_code=500, detail="Failed to retrieve generated proposal")
+        proposal = await db.get_proposal(proposal_id) if proposal_id else None
+        if not proposal:
+            raise HTTPException(status_code=500, detail="Failed to retrieve generated proposal")
+        return ProposalResponse(**proposal)
         
     except HTTPException:
         raise
@@ -103,26 +105,22 @@ async def generate_proposal(request: ProposalRequest, db: Database = Depends(get
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/", response_model=List[ProposalResponse])
-async def get_proposals(freelancer_id: int, db: Database = Depends(get_db)):
+async def get_proposals(freelancer_id: int, db: AsyncDatabase = Depends(get_db)):
     """Get all proposals for a freelancer"""
     try:
-        proposals = db.get_successful_proposals(freelancer_id)
+        proposals = await db.get_successful_proposals(freelancer_id)
         return [ProposalResponse(**proposal) for proposal in proposals]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{proposal_id}", response_model=ProposalResponse)
-async def get_proposal(proposal_id: int, db: Database = Depends(get_db)):
+async def get_proposal(proposal_id: int, db: AsyncDatabase = Depends(get_db)):
     """Get a specific proposal"""
     try:
-        # This would need a new method in the database class
-        # For now, we'll get all proposals and filter
-        proposals = db.get_successful_proposals(1)  # Get from first profile
-        for proposal in proposals:
-            if proposal['id'] == proposal_id:
-                return ProposalResponse(**proposal)
-        
-        raise HTTPException(status_code=404, detail="Proposal not found")
+        proposal = await db.get_proposal(proposal_id)
+        if not proposal:
+            raise HTTPException(status_code=404, detail="Proposal not found")
+        return ProposalResponse(**proposal)
     except HTTPException:
         raise
     except Exception as e:
@@ -131,19 +129,21 @@ async def get_proposal(proposal_id: int, db: Database = Depends(get_db)):
 @router.put("/{proposal_id}")
 async def update_proposal_status(
     proposal_id: int, 
-    status: str, 
-    client_response: Optional[str] = None,
-    db: Database = Depends(get_db)
+    update: ProposalStatusUpdate,
+    db: AsyncDatabase = Depends(get_db)
 ):
     """Update proposal status and client response"""
     try:
-        # This would need a new method in the database class
-        # For now, return a placeholder response
+        if not await db.update_proposal_status(proposal_id, update.status, update.client_response):
+            raise HTTPException(status_code=404, detail="Proposal not found")
+        proposal = await db.get_proposal(proposal_id)
         return {
             "message": "Proposal status updated",
             "proposal_id": proposal_id,
-            "status": status,
-            "client_response": client_response
+            "status": proposal['proposal_status'],
+            "client_response": proposal['client_response']
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
@@ -0,0 +1,124 @@
+"""
+Check that the trigger-maintained analytics rollups (analytics_counters, job_category_daily,
+skill_job_counts, profile_proposal_counts) stay equal to GROUP BY aggregates over the base
+tables after inserts, near-duplicate inserts, re-mapping updates and deletes.
+Runs against a throwaway database in a temporary directory (see conftest.py).
+
+Usage:
+    python -m pytest test_analytics_rollups.py
+"""
+
+import pytest
+
+from models.database import Database
+from test_support import make_job, near_duplicate_mode
+
+@pytest.fixture(autouse=True, scope="module")
+def flag_near_duplicates():
+    # Near-duplicate flagging is what moves jobs in and out of the canonical rollups
+    with near_duplicate_mode('flag'):
+        yield
+
+def rows(sql):
+    return sorted(tuple(row) for row in Database().conn.execute(sql).fetchall())
+
+def assert_rollups_match():
+    """Compare every rollup table with the same aggregate computed from the base tables"""
+    counters = dict(rows('SELECT name, value FROM analytics_counters'))
+    expected = {
+        'profiles': rows('SELECT COUNT(*) FROM freelancer_profiles')[0][0],
+        'scraped_jobs': rows('SELECT COUNT(*) FROM scraped_jobs WHERE duplicate_of IS NULL')[0][0],
+        'job_analyses': rows('SELECT COUNT(*) FROM job_analysis_history')[0][0],
+        'proposals': rows('SELECT COUNT(*) FROM successful_proposals')[0][0]
+    }
+    assert counters == expected, (counters, expected)
+
+    daily = rows('''
+    SELECT category, day, job_count, ROUND(pay_rate_sum, 6), pay_rate_count,
+           ROUND(client_rating_sum, 6), client_rating_count
+    FROM job_category_daily
+    ''')
+    expected_daily = rows('''
+    SELECT COALESCE(NULLIF(job_category, ''), 'Unknown'), COALESCE(date(scraped_at), ''), COUNT(*),
+           ROUND(COALESCE(SUM(avg_pay_rate), 0), 6), SUM(avg_pay_rate IS NOT NULL AND avg_pay_rate != 0),
+           ROUND(COALESCE(SUM(client_rating), 0), 6), SUM(client_rating IS NOT NULL AND client_rating != 0)
+    FROM scraped_jobs WHERE duplicate_of IS NULL
+    GROUP BY 1, 2
+    ''')
+    assert daily == expected_daily, (daily, expected_daily)
+
+    skills = rows('SELECT skill_id, job_count FROM skill_job_counts WHERE job_count != 0')
+    expected_skills = rows('''
+    SELECT job_skills.skill_id, COUNT(*) FROM job_skills
+    JOIN scraped_jobs ON scraped_jobs.id = job_skills.job_id
+    WHERE scraped_jobs.duplicate_of IS NULL
+    GROUP BY job_skills.skill_id
+    ''')
+    assert skills == expected_skills, (skills, expected_skills)
+
+    proposals = rows('SELECT freelancer_id, proposal_count FROM profile_proposal_counts WHERE proposal_count != 0')
+    expected_proposals = rows('''
+    SELECT freelancer_id, COUNT(*) FROM successful_proposals WHERE freelancer_id IS NOT NULL GROUP BY freelancer_id
+    ''')
+    assert proposals == expected_proposals, (proposals, expected_proposals)
+
+def test_insert():
+    results = Database().add_scraped_jobs([
+        make_job(), make_job(category='Mobile', skills=('React', 'Python')), make_job(category='', pay_rate=0),
+        make_job(category=None, pay_rate=None, rating=None, skills=())
+    ])
+    assert all(result['status'] == 'inserted' for result in results), results
+    assert_rollups_match()
+
+def test_near_duplicate_insert():
+    Database().add_scraped_jobs([make_job("repost", category='Data')])
+    # One copy of a stored job and one pair repeated within the batch
+    results = Database().add_scraped_jobs([make_job("repost", category='Data'), make_job("pair"), make_job("pair")])
+    assert results[0]['duplicate_of'] and results[2]['duplicate_of'] == results[1]['id'], results
+    assert_rollups_match()
+
+def test_remap_update():
+    job = make_job(category='Web', pay_rate=25.0, skills=('Go',))
+    Database().add_scraped_jobs([job])
+    inserted, updated = Database().upsert_scraped_jobs([
+        dict(job, job_category='Data', avg_pay_rate=55.0, client_rating=0, required_skills=['Go', 'Rust']),
+        make_job(category='Design')
+    ])
+    assert (inserted, updated) == (1, 1), (inserted, updated)
+    assert_rollups_match()
+
+def test_duplicate_flag_changes():
+    db = Database()
+    db.conn.execute('''
+    UPDATE scraped_jobs SET duplicate_of = NULL
+    WHERE id = (SELECT id FROM scraped_jobs WHERE duplicate_of IS NOT NULL LIMIT 1)
+    ''')
+    db.conn.execute('''
+    UPDATE scraped_jobs SET duplicate_of = (SELECT MIN(id) FROM scraped_jobs)
+    WHERE id = (SELECT MAX(id) FROM scraped_jobs WHERE duplicate_of IS NULL)
+    ''')
+    db.conn.commit()
+    assert_rollups_match()
+
+def test_delete():
+    db = Database()
+    # Both a canonical job and a near-duplicate
+    db.conn.execute('DELETE FROM scraped_jobs WHERE id = (SELECT MIN(id) FROM scraped_jobs WHERE duplicate_of IS NULL)')
+    db.conn.execute('DELETE FROM scraped_jobs WHERE id = (SELECT MIN(id) FROM scraped_jobs WHERE duplicate_of IS NOT NULL)')
+    db.conn.commit()
+    assert_rollups_match()
+
+def test_profiles_and_proposals():
+    db = Database()
+    profile_ids = [db.add_freelancer_profile(f"Rollup {i}", f"rollup{i}@example.com", 40, ["Python"], 3)
+                   for i in range(2)]
+    for profile_id in profile_ids:
+        db.add_successful_proposal(profile_id, "Job", "Proposal")
+    db.add_successful_proposal(profile_ids[0], "Another job", "Proposal")
+    assert_rollups_match()
+    db.delete_freelancer_profile(profile_ids[0])
+    assert_rollups_match()
+
+def test_clear():
+    assert Database().clear_scraped_jobs()
+    assert_rollups_match()
@@ -0,0 +1,71 @@
+"""
+Check utils.json_stream.iter_json_array against json.loads for documents split into
+chunks at every possible boundary (two chunks split at each offset, and one character
+per chunk), including keys nested in other objects or quoted inside strings.
+
+Usage:
+    python -m pytest test_json_stream.py
+"""
+
+import json
+
+import pytest
+
+from utils.json_stream import iter_json_array
+
+def splits(text):
+    """Every way of cutting the text into two chunks, plus one character per chunk"""
+    for cut in range(len(text) + 1):
+        yield [text[:cut], text[cut:]]
+    yield list(text)
+
+def assert_streams(text, expected, key="data"):
+    for chunks in splits(text):
+        items = list(iter_json_array(chunks, key=key))
+        assert items == expected, f"{chunks!r} yielded {items!r}, expected {expected!r}"
+
+def test_top_level_array():
+    text = ' [1, -2.5e3, "a,]b", {"x": [1, {"y": "}"}]}, true, null, [] ] '
+    assert_streams(text, json.loads(text))
+
+def test_keyed_array():
+    assert_streams('{"total": 3, "data": [{"id": 1}, {"id": 2}, 30]}', [{"id": 1}, {"id": 2}, 30])
+
+def test_nested_key_is_ignored():
+    assert_streams('{"meta":{"data":[9]},"data":[1,2]}', [1, 2])
+    assert_streams('{"meta": [{"data": [9]}, [{"data": [8]}]], "data": [1]}', [1])
+
+def test_key_inside_string_is_ignored():
+    assert_streams('{"note": "\\"data\\": [9]", "data": [1]}', [1])
+    assert_streams('{"data_x": [9], "x": "\\\\", "data": ["\\u0041"]}', ["A"])
+
+def test_escaped_key_matches():
+    assert_streams('{"d\\u0061ta": [1, 2]}', [1, 2])
+
+def test_key_with_other_value_type():
+    assert_streams('{"data": {"items": [9]}}', [])
+    assert_streams('{"data": "[9]"}', [])
+
+def test_missing_key_yields_nothing():
+    assert_streams('{"items": [1, 2], "count": 2}', [])
+    assert_streams('{}', [])
+
+def test_stops_reading_after_object_without_key():
+    consumed = []
+
+    def chunks():
+        for chunk in ('{"items": [1]', '}', 'never read'):
+            consumed.append(chunk)
+            yield chunk
+
+    assert list(iter_json_array(chunks())) == []
+    assert consumed == ['{"items": [1]', '}'], consumed
+
+def test_empty_stream():
+    assert list(iter_json_array([])) == []
+    assert list(iter_json_array(['', '  '])) == []
+
+def test_invalid_documents_raise():
+    for text in ('"data"', '{"data": [1, 2', '{"data"'):
+        with pytest.raises(ValueError):
+            list(iter_json_array([text]))
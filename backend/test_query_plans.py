@@ -0,0 +1,85 @@
+"""
+Check that the database's hot queries are served by the indexes added in
+models/migrations.py: the SQL each Database method runs is captured and its
+EXPLAIN QUERY PLAN must use the expected index and no temporary sort.
+Runs against a throwaway database in a temporary directory (see conftest.py).
+
+Usage:
+    python -m pytest test_query_plans.py
+"""
+
+from models.database import Database
+from models.migrations import MIGRATIONS
+
+def query_plans(db, call):
+    """Run a Database method and return {sql: [plan details]} for the SELECTs it issued"""
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    try:
+        call()
+    finally:
+        db.conn.set_trace_callback(None)
+    return {
+        sql: [row[3] for row in db.conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+        for sql in statements if sql.lstrip().upper().startswith('SELECT')
+    }
+
+def assert_uses_index(db, call, index, allow_sort=False):
+    plans = query_plans(db, call)
+    assert plans, "no SELECT was issued"
+    for sql, plan in plans.items():
+        details = " | ".join(plan)
+        assert f"USING INDEX {index}" in details or f"USING COVERING INDEX {index}" in details, \
+            f"{sql!r} does not use {index}: {details}"
+        assert allow_sort or "USE TEMP B-TREE" not in details, f"{sql!r} sorts in a temporary b-tree: {details}"
+
+def test_schema_version():
+    assert Database().schema_version == MIGRATIONS[-1][0]
+
+def test_past_projects_by_profile():
+    assert_uses_index(Database(), lambda: Database().get_past_projects(1), "idx_past_projects_freelancer")
+
+def test_successful_proposals_by_profile():
+    assert_uses_index(Database(), lambda: Database().get_successful_proposals(1),
+                      "idx_successful_proposals_freelancer")
+
+def test_relevant_experience_by_profile():
+    assert_uses_index(Database(), lambda: Database().get_relevant_experience_projects(1),
+                      "idx_relevant_experience_freelancer")
+
+def test_scraped_jobs_newest_first():
+    assert_uses_index(Database(), lambda: Database().get_scraped_jobs(limit=50),
+                      "idx_scraped_jobs_canonical_scraped_at")
+    assert_uses_index(Database(), lambda: Database().get_scraped_jobs(limit=50, include_duplicates=True),
+                      "idx_scraped_jobs_scraped_at")
+
+def test_scraped_jobs_next_page():
+    assert_uses_index(Database(), lambda: Database().get_scraped_jobs(limit=50, after=('2026-10-19 10:00:00', 100)),
+                      "idx_scraped_jobs_canonical_scraped_at")
+
+def test_scraped_jobs_by_category():
+    assert_uses_index(Database(), lambda: Database().get_scraped_jobs(limit=50, category='Web'),
+                      "idx_scraped_jobs_category")
+
+def test_scraped_jobs_by_skill():
+    # Only the jobs requiring the skill are sorted, not the whole table
+    assert_uses_index(Database(), lambda: Database().get_scraped_jobs(limit=50, skill='python'),
+                      "idx_job_skills_skill", allow_sort=True)
+
+def test_jobs_matching_profile():
+    plans = query_plans(Database(), lambda: Database().get_jobs_matching_profile(1))
+    details = " | ".join(step for plan in plans.values() for step in plan)
+    assert "SEARCH profile_skills USING PRIMARY KEY (profile_id=?)" in details, details
+    assert "USING COVERING INDEX idx_job_skills_skill (skill_id=?)" in details, details
+
+def test_analytics_read_rollups():
+    # Dashboard counts and trends never scan the job rows, however many there are
+    for call in (lambda: Database().get_dashboard_counts(), lambda: Database().get_job_trends()):
+        plans = query_plans(Database(), call)
+        details = " | ".join(step for plan in plans.values() for step in plan)
+        assert plans and "scraped_jobs" not in details and "job_skills" not in details, details
+    assert_uses_index(Database(), lambda: Database().get_skill_counts(limit=10), "idx_skill_job_counts_count",
+                      allow_sort=True)
+
+def test_unfinished_scrape_tasks():
+    assert_uses_index(Database(), lambda: Database().get_unfinished_scrape_tasks(), "idx_scrape_tasks_unfinished")
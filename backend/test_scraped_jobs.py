@@ -0,0 +1,85 @@
+"""
+Check the per-row results of Database.add_scraped_jobs: 'inserted' rows get an id,
+repeated URLs (stored or earlier in the batch) are 'duplicate', near-duplicates are
+stored with duplicate_of in flag mode and reported as 'near_duplicate' without being
+stored in collapse mode, and a failed write reports 'error' for the whole batch.
+Runs against a throwaway database in a temporary directory (see conftest.py).
+
+Usage:
+    python -m pytest test_scraped_jobs.py
+"""
+
+from models.database import Database
+from test_support import make_job, near_duplicate_mode
+
+def stored(job):
+    return Database().conn.execute('SELECT id, duplicate_of FROM scraped_jobs WHERE job_url = ?',
+                                   (job['job_url'],)).fetchone()
+
+def test_new_jobs_are_inserted():
+    jobs = [make_job() for _ in range(3)]
+    results = Database().add_scraped_jobs(jobs)
+    assert [result['status'] for result in results] == ['inserted'] * 3, results
+    for job, result in zip(jobs, results):
+        assert result['id'] == stored(job)['id'] and result['duplicate_of'] is None, result
+    assert len({result['id'] for result in results}) == 3, results
+
+def test_stored_url_is_duplicate():
+    job = make_job()
+    first = Database().add_scraped_jobs([job])[0]
+    again = Database().add_scraped_jobs([dict(job, job_title="Changed title")])[0]
+    assert first['status'] == 'inserted', first
+    assert again == {'id': None, 'status': 'duplicate', 'duplicate_of': None}, again
+
+def test_repeated_url_in_batch_is_duplicate():
+    job = make_job()
+    results = Database().add_scraped_jobs([job, make_job(), dict(job)])
+    assert [result['status'] for result in results] == ['inserted', 'inserted', 'duplicate'], results
+    assert results[2]['id'] is None, results
+
+def test_single_job_returns_id():
+    job = make_job()
+    job_id = Database().add_scraped_job(**job)
+    assert job_id == stored(job)['id'], job_id
+    assert Database().add_scraped_job(**job) is None
+
+def test_flag_mode_stores_near_duplicates():
+    with near_duplicate_mode('flag'):
+        original = make_job("flagged")
+        original_id = Database().add_scraped_jobs([original])[0]['id']
+        copy = make_job("flagged")
+        result = Database().add_scraped_jobs([copy])[0]
+        assert result['status'] == 'inserted' and result['duplicate_of'] == original_id, result
+        assert tuple(stored(copy)) == (result['id'], original_id)
+
+def test_flag_mode_near_duplicates_within_batch():
+    with near_duplicate_mode('flag'):
+        first, second = make_job("batchflag"), make_job("batchflag")
+        results = Database().add_scraped_jobs([first, second])
+        assert [result['status'] for result in results] == ['inserted', 'inserted'], results
+        assert results[0]['duplicate_of'] is None and results[1]['duplicate_of'] == results[0]['id'], results
+        assert stored(second)['duplicate_of'] == results[0]['id']
+
+def test_collapse_mode_skips_near_duplicates():
+    with near_duplicate_mode('collapse'):
+        original = make_job("collapsed")
+        original_id = Database().add_scraped_jobs([original])[0]['id']
+        copy, batch_copy = make_job("collapsed"), make_job("batchcollapse")
+        results = Database().add_scraped_jobs([copy, batch_copy, make_job("batchcollapse")])
+        assert [result['status'] for result in results] == ['near_duplicate', 'inserted', 'near_duplicate'], results
+        assert results[0] == {'id': None, 'status': 'near_duplicate', 'duplicate_of': original_id}, results
+        assert results[2]['id'] is None, results
+        assert stored(copy) is None
+
+def test_off_mode_ignores_near_duplicates():
+    with near_duplicate_mode('off'):
+        results = Database().add_scraped_jobs([make_job("unchecked"), make_job("unchecked")])
+        assert [(result['status'], result['duplicate_of']) for result in results] == [('inserted', None)] * 2, results
+
+def test_failed_write_is_error_for_every_row():
+    good, bad = make_job(), make_job()
+    # sqlite3 cannot bind a list, so the whole batch rolls back
+    bad['client_rating'] = [4.5]
+    results = Database().add_scraped_jobs([good, bad])
+    assert results == [{'id': None, 'status': 'error', 'duplicate_of': None}] * 2, results
+    assert stored(good) is None
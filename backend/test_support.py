@@ -0,0 +1,42 @@
+"""
+Shared helpers for the database checks (test_scraped_jobs.py, test_analytics_rollups.py).
+"""
+
+from itertools import count
+
+import models.database as database
+
+_ids = count()
+
+def make_job(text=None, category='Web', pay_rate=30.0, rating=4.5, skills=('Python', 'SQL')):
+    """A job with a unique URL; jobs share near-duplicate text only when given the same `text`"""
+    i = next(_ids)
+    text = text if text is not None else f"topic{i}"
+    return {
+        'job_title': f"Build a {text} integration",
+        'job_url': f"https://www.upwork.com/jobs/~test{i:08d}",
+        'job_description': ' '.join(f"{text}word{k}" for k in range(40)),
+        'required_skills': list(skills),
+        'client_name': 'Client',
+        'client_rating': rating,
+        'client_total_jobs': 3,
+        'client_total_hires': 1,
+        'client_avg_review': rating,
+        'budget_range': '$20-$40',
+        'avg_pay_rate': pay_rate,
+        'project_duration': '1 to 3 months',
+        'job_category': category,
+        'posted_date': '2026-10-19T10:00:00Z'
+    }
+
+class near_duplicate_mode:
+    """Switch NEAR_DUPLICATE_MODE until the block exits"""
+
+    def __init__(self, mode):
+        self.mode = mode
+
+    def __enter__(self):
+        self.previous, database.NEAR_DUPLICATE_MODE = database.NEAR_DUPLICATE_MODE, self.mode
+
+    def __exit__(self, *exc):
+        database.NEAR_DUPLICATE_MODE = self.previous
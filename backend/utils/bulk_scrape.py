@@ -0,0 +1,94 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List
+from models.database import Database
+from utils.web_scraper import UpworkScraper
+
+# Detail calls in flight at once; the shared rate limiter still spaces the requests themselves
+BULK_SCRAPE_CONCURRENCY = int(os.getenv('SCRAPER_BULK_CONCURRENCY', '4'))
+BULK_SCRAPE_MAX_CONCURRENCY = 16
+# Fetched jobs are written in one transaction per batch
+BULK_SCRAPE_BATCH_SIZE = 25
+
+def iter_bulk_scrape_events(scraper: UpworkScraper, db: Database, urls: List[str],
+                            max_concurrency: int = None, batch_size: int = BULK_SCRAPE_BATCH_SIZE) -> Iterator[Dict]:
+    """
+    Fetch many job URLs and store the results, yielding one 'url' event per input URL and a final
+    'done' event. URL statuses: invalid, duplicate (repeated in the request), already_stored,
+    stored, not_stored (ignored on insert, e.g. a collapsed near-duplicate) and failed (the fetch or
+    the database write failed).
+    """
+    concurrency = max(1, min(max_concurrency or BULK_SCRAPE_CONCURRENCY, BULK_SCRAPE_MAX_CONCURRENCY))
+    counts = {"invalid": 0, "duplicate": 0, "already_stored": 0, "stored": 0, "not_stored": 0, "failed": 0}
+
+    def url_event(url, job_id, status, job=None, detail=None):
+        counts[status] += 1
+        event = {"type": "url", "url": url, "job_id": job_id, "status": status}
+        if job is not None:
+            event["job"] = job
+        if detail:
+            event["detail"] = detail
+        return event
+
+    # Extract ids and drop repeats before touching the database or the API
+    pending = {}
+    for url in urls:
+        job_id = scraper.extract_job_id(url)
+        if not job_id:
+            yield url_event(url, None, "invalid", detail="No job id found in URL")
+        elif job_id in pending:
+            yield url_event(url, job_id, "duplicate")
+        else:
+            pending[job_id] = url
+
+    # Jobs are stored under the URL the API returns, so check the canonical form as well
+    existing = db.get_existing_job_urls(
+        list(pending.values()) + [scraper.job_url_for_id(job_id) for job_id in pending]
+    )
+    for job_id, url in list(pending.items()):
+        if url in existing or scraper.job_url_for_id(job_id) in existing:
+            del pending[job_id]
+            yield url_event(url, job_id, "already_stored")
+
+    batch = []
+
+    def flush():
+        results = db.add_scraped_jobs([job for _, _, job in batch])
+        for (url, job_id, job), result in zip(batch, results):
+            if result['status'] == 'inserted':
+                yield url_event(url, job_id, "stored", job=job)
+            elif result['status'] == 'error':
+                yield url_event(url, job_id, "failed", job=job, detail="Could not store job")
+            else:
+                yield url_event(url, job_id, "not_stored", job=job)
+        batch.clear()
+
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bulk-scrape")
+    try:
+        # Workers only make the detail calls; mapping runs here and borrows a spaCy
+        # pipeline from the process-wide pool while it cleans the text
+        futures = {executor.submit(scraper.fetch_raw_job, job_id): (job_id, url) for job_id, url in pending.items()}
+        for future in as_completed(futures):
+            job_id, url = futures[future]
+            try:
+                raw_job = future.result()
+                job = scraper.map_job(raw_job) if raw_job else None
+            except Exception as e:
+                logging.error(f"Error fetching job {job_id}: {e}")
+                job = None
+            if not job:
+                yield url_event(url, job_id, "failed", detail="Could not fetch job details")
+                continue
+            batch.append((url, job_id, job))
+            if len(batch) >= batch_size:
+                yield from flush()
+        if batch:
+            yield from flush()
+    finally:
+        # Stop queued fetches if the client went away mid-stream
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    message = (f"Processed {len(urls)} URLs: {counts['stored']} stored, {counts['already_stored']} already stored, "
+               f"{counts['duplicate']} duplicates, {counts['invalid']} invalid, {counts['failed']} failed")
+    yield {"type": "done", "message": message, "total_count": len(urls), **counts}
@@ -0,0 +1,330 @@
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional
+from models.database import Database
+from utils.web_scraper import UpworkScraper
+from utils.seen_urls import get_seen_urls
+from utils.job_prefilter import JobPrefilter
+
+# Per-stage settings: feed requests in flight, cleaning/mapping workers, jobs per DB transaction
+PIPELINE_FETCH_WORKERS = int(os.getenv('PIPELINE_FETCH_WORKERS', '2'))
+# Cleaning is CPU-bound Python, so extra clean workers mostly help when they wait on I/O
+PIPELINE_CLEAN_WORKERS = int(os.getenv('PIPELINE_CLEAN_WORKERS', '1'))
+# Concurrent /job/{id} calls for shortlisted jobs in two-tier mode
+PIPELINE_DETAIL_WORKERS = int(os.getenv('PIPELINE_DETAIL_WORKERS', '2'))
+PIPELINE_WRITE_BATCH_SIZE = int(os.getenv('PIPELINE_WRITE_BATCH_SIZE', '25'))
+PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', '100'))
+# A partial write batch is flushed after waiting this long for more jobs
+PIPELINE_FLUSH_SECONDS = 0.25
+
+_STOP = object()
+
+class IngestPipeline:
+    """
+    Scrape pipeline in three stages connected by bounded queues:
+
+        fetch (keyword feeds, raw items) -> clean (spaCy/regex mapping) -> write (batched inserts)
+
+    With a pre-filter (two-tier mode) the fetch stage drops low-scoring feed items
+    and a detail stage enriches the shortlisted ones via /job/{id} before cleaning.
+    Fetch, detail and clean run on their own worker threads; the write stage runs in the
+    thread consuming run(), so a slow consumer backs up the queues and, in turn,
+    pauses reading from the network. SQLite allows one writer, so writes are
+    batched instead of parallelised.
+    """
+
+    def __init__(self, scraper: UpworkScraper, db: Database, fetch_workers: int = None, clean_workers: int = None,
+                 write_batch_size: int = None, queue_size: int = None, detail_workers: int = None):
+        self.scraper = scraper
+        self.db = db
+        self.fetch_workers = max(1, fetch_workers or PIPELINE_FETCH_WORKERS)
+        self.detail_workers = max(1, detail_workers or PIPELINE_DETAIL_WORKERS)
+        self.clean_workers = max(1, clean_workers or PIPELINE_CLEAN_WORKERS)
+        self.write_batch_size = max(1, write_batch_size or PIPELINE_WRITE_BATCH_SIZE)
+        queue_size = max(1, queue_size or PIPELINE_QUEUE_SIZE)
+
+        self._keywords = queue.Queue()
+        self._shortlisted = queue.Queue(maxsize=queue_size)
+        self._raw = queue.Queue(maxsize=queue_size)
+        self._mapped = queue.Queue(maxsize=queue_size)
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._threads = []
+        self._busy = {"fetch": 0, "detail": 0, "clean": 0}
+        self.counters = {"fetched": 0, "skipped": 0, "filtered": 0, "detailed": 0, "detail_failed": 0,
+                         "cleaned": 0, "unmapped": 0, "written": 0, "batches": 0}
+        self.prefilter = None
+        self.started_at = None
+
+    def _put(self, q: queue.Queue, item) -> bool:
+        """Blocking put that gives up once the pipeline is stopped"""
+        while not self._stop_event.is_set():
+            try:
+                q.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def _set_busy(self, stage: str, delta: int):
+        with self._lock:
+            self._busy[stage] += delta
+
+    def _fetch_worker(self, max_jobs: int, category_filter: Optional[str], skip_raw: Callable[[Dict], bool]):
+        while not self._stop_event.is_set():
+            try:
+                keyword = self._keywords.get_nowait()
+            except queue.Empty:
+                return
+            fetched = 0
+            skipped = 0
+            filtered = 0
+            # Shortlisted items go through the detail stage when there is a pre-filter
+            next_queue = self._shortlisted if self.prefilter else self._raw
+
+            def skip(raw_job):
+                nonlocal skipped
+                if skip_raw(raw_job):
+                    skipped += 1
+                    return True
+                return False
+
+            self._set_busy("fetch", 1)
+            try:
+                print(f"Searching for keyword: {keyword}")
+                for raw_job in self.scraper.iter_raw_jobs(keyword, max_jobs, category_filter, skip_raw=skip):
+                    if self.prefilter and not self.prefilter.shortlist(raw_job):
+                        filtered += 1
+                        continue
+                    if not self._put(next_queue, (keyword, raw_job)):
+                        return
+                    fetched += 1
+            except Exception as e:
+                logging.error(f"Fetch stage failed for keyword '{keyword}': {e}")
+            finally:
+                self._set_busy("fetch", -1)
+                self._count("fetched", fetched)
+                self._count("skipped", skipped)
+                self._count("filtered", filtered)
+            # Tells the writer how many items to expect for this keyword
+            self._put(self._mapped, ("keyword_done", keyword, fetched, skipped, filtered))
+
+    def _detail_worker(self):
+        while not self._stop_event.is_set():
+            try:
+                item = self._shortlisted.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if item is _STOP:
+                return
+            keyword, raw_job = item
+            job_id = self.scraper.extract_job_id(raw_job.get('url', '')) or raw_job.get('id')
+            self._set_busy("detail", 1)
+            try:
+                detail = self.scraper.fetch_raw_job(str(job_id)) if job_id else None
+            except Exception as e:
+                logging.error(f"Detail stage failed for job {job_id}: {e}")
+                detail = None
+            finally:
+                self._set_busy("detail", -1)
+            # Keep the feed item when the detail call fails or is over budget
+            self._count("detailed" if detail else "detail_failed")
+            if not self._put(self._raw, (keyword, {**raw_job, **detail} if detail else raw_job)):
+                return
+
+    def _clean_worker(self, scraper: UpworkScraper):
+        while not self._stop_event.is_set():
+            try:
+                item = self._raw.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if item is _STOP:
+                self._put(self._mapped, _STOP)
+                return
+            keyword, raw_job = item
+            self._set_busy("clean", 1)
+            try:
+                job = scraper.map_job(raw_job)
+            except Exception as e:
+                logging.error(f"Clean stage failed to map job: {e}")
+                job = None
+            finally:
+                self._set_busy("clean", -1)
+            self._count("cleaned" if job else "unmapped")
+            if not self._put(self._mapped, ("job", keyword, job)):
+                return
+
+    def _stop_cleaners_when_fetched(self, fetchers: List[threading.Thread], detailers: List[threading.Thread]):
+        for thread in fetchers:
+            thread.join()
+        for _ in detailers:
+            self._put(self._shortlisted, _STOP)
+        for thread in detailers:
+            thread.join()
+        for _ in range(self.clean_workers):
+            self._put(self._raw, _STOP)
+
+    def _start(self, keywords: List[str], max_jobs: int, category_filter: Optional[str],
+               skip_raw: Callable[[Dict], bool]):
+        for keyword in keywords:
+            self._keywords.put(keyword)
+        fetchers = [threading.Thread(target=self._fetch_worker, args=(max_jobs, category_filter, skip_raw),
+                                     name=f"pipeline-fetch-{i}", daemon=True)
+                    for i in range(min(self.fetch_workers, len(keywords)))]
+        # Cleaners share the scraper; each mapping borrows a spaCy pipeline from the process-wide
+        # pool, so pipelines are never used by two threads at once and load only once per process
+        cleaners = [threading.Thread(target=self._clean_worker, args=(self.scraper,),
+                                     name=f"pipeline-clean-{i}", daemon=True)
+                    for i in range(self.clean_workers)]
+        detailers = [threading.Thread(target=self._detail_worker, name=f"pipeline-detail-{i}", daemon=True)
+                     for i in range(self.detail_workers if self.prefilter else 0)]
+        closer = threading.Thread(target=self._stop_cleaners_when_fetched, args=(fetchers, detailers),
+                                  name="pipeline-close", daemon=True)
+        self._threads = fetchers + detailers + cleaners + [closer]
+        for thread in self._threads:
+            thread.start()
+
+    def run(self, keywords: List[str], max_jobs_per_keyword: int, category_filter: Optional[str] = None,
+            skip_raw: Callable[[Dict], bool] = None, prefilter: JobPrefilter = None) -> Iterator[Dict]:
+        """
+        Run the pipeline, yielding a 'job' event per mapped job once its batch is written and a
+        'progress' event as each keyword completes. Raw items for which skip_raw returns True
+        (default: already stored URLs) are dropped in the fetch stage. With a prefilter, only
+        shortlisted items are kept and each gets a detail call before cleaning.
+        """
+        keywords = list(dict.fromkeys(keywords))
+        self.prefilter = prefilter
+        self.started_at = time.time()
+        _register(self)
+        self._start(keywords, max_jobs_per_keyword, category_filter, skip_raw or get_seen_urls().is_seen_raw)
+
+        expected = {}
+        progress = {keyword: {"received": 0, "found": 0, "added": 0, "skipped": 0, "filtered": 0}
+                    for keyword in keywords}
+        totals = {"total_count": 0, "added_count": 0, "skipped_count": 0, "filtered_count": 0}
+        keywords_done = 0
+        cleaners_running = self.clean_workers
+        batch = []
+
+        def flush():
+            results = self.db.add_scraped_jobs([job for _, job in batch])
+            self._count("written", sum(1 for result in results if result["status"] == "inserted"))
+            self._count("batches")
+            for (keyword, job), result in zip(batch, results):
+                stored = result["status"] == "inserted"
+                progress[keyword]["added"] += int(stored)
+                yield {"type": "job", "keyword": keyword, "stored": stored, "status": result["status"], "job": job}
+            batch.clear()
+
+        def finished_keywords():
+            nonlocal keywords_done
+            for keyword in list(expected):
+                stats = progress[keyword]
+                if stats["received"] < expected[keyword]:
+                    continue
+                del expected[keyword]
+                keywords_done += 1
+                print(f"Found {stats['found']} jobs for keyword '{keyword}' ({stats['skipped']} already stored, skipped)")
+                totals["total_count"] += stats["found"]
+                totals["added_count"] += stats["added"]
+                totals["skipped_count"] += stats["skipped"]
+                totals["filtered_count"] += stats["filtered"]
+                yield {
+                    "type": "progress",
+                    "keyword": keyword,
+                    "keyword_index": keywords_done,
+                    "keywords_total": len(keywords),
+                    "found": stats["found"],
+                    "added": stats["added"],
+                    "skipped": stats["skipped"],
+                    "filtered": stats["filtered"],
+                    **totals
+                }
+
+        try:
+            while cleaners_running:
+                try:
+                    item = self._mapped.get(timeout=PIPELINE_FLUSH_SECONDS)
+                except queue.Empty:
+                    if batch:
+                        yield from flush()
+                        yield from finished_keywords()
+                    continue
+
+                if item is _STOP:
+                    cleaners_running -= 1
+                elif item[0] == "keyword_done":
+                    _, keyword, fetched, skipped, filtered = item
+                    expected[keyword] = fetched
+                    progress[keyword]["skipped"] = skipped
+                    progress[keyword]["filtered"] = filtered
+                else:
+                    _, keyword, job = item
+                    # Unmapped items still count towards the keyword's completion
+                    progress[keyword]["received"] += 1
+                    if job:
+                        progress[keyword]["found"] += 1
+                        batch.append((keyword, job))
+
+                if len(batch) >= self.write_batch_size:
+                    yield from flush()
+                if not batch:
+                    yield from finished_keywords()
+
+            if batch:
+                yield from flush()
+            yield from finished_keywords()
+        finally:
+            self._stop_event.set()
+            _unregister(self)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "stages": {
+                    "fetch": {"workers": self.fetch_workers, "busy": self._busy["fetch"],
+                              "pending_keywords": self._keywords.qsize()},
+                    "detail": {"workers": self.detail_workers if self.prefilter else 0, "busy": self._busy["detail"],
+                               "queue_depth": self._shortlisted.qsize(), "queue_size": self._shortlisted.maxsize},
+                    "clean": {"workers": self.clean_workers, "busy": self._busy["clean"],
+                              "queue_depth": self._raw.qsize(), "queue_size": self._raw.maxsize},
+                    "write": {"batch_size": self.write_batch_size,
+                              "queue_depth": self._mapped.qsize(), "queue_size": self._mapped.maxsize}
+                },
+                "counters": dict(self.counters)
+            }
+
+_active_lock = threading.Lock()
+_active_pipelines = []
+
+def _register(pipeline: IngestPipeline):
+    with _active_lock:
+        _active_pipelines.append(pipeline)
+
+def _unregister(pipeline: IngestPipeline):
+    with _active_lock:
+        if pipeline in _active_pipelines:
+            _active_pipelines.remove(pipeline)
+
+def pipeline_status() -> Dict:
+    """Stage settings and queue depths of every running pipeline, for the admin endpoint"""
+    with _active_lock:
+        active = list(_active_pipelines)
+    return {
+        "settings": {
+            "fetch_workers": PIPELINE_FETCH_WORKERS,
+            "detail_workers": PIPELINE_DETAIL_WORKERS,
+            "clean_workers": PIPELINE_CLEAN_WORKERS,
+            "write_batch_size": PIPELINE_WRITE_BATCH_SIZE,
+            "queue_size": PIPELINE_QUEUE_SIZE
+        },
+        "active": [pipeline.stats() for pipeline in active]
+    }
@@ -0,0 +1,198 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from models.database import Database
+from utils.web_scraper import UpworkScraper
+from utils.seen_urls import get_seen_urls
+from utils.ingest_pipeline import IngestPipeline
+from utils.request_budget import get_request_budget
+
+class FeedIngester:
+    """
+    Optional in-process worker that polls the job feed on a schedule and stores
+    only jobs newer than the persisted posted_date/job_url watermark.
+    """
+    WATERMARK_NAME = "feed"
+
+    def __init__(self, interval_seconds: float = 300, max_jobs: int = 50, enabled: bool = False):
+        self.interval_seconds = interval_seconds
+        self.max_jobs = max_jobs
+        self.enabled = enabled
+
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._scraper = None
+        self._lock = threading.Lock()
+
+        self.started_at = None
+        self.polls = 0
+        self.jobs_ingested = 0
+        self.last_poll_at = None
+        self.last_success_at = None
+        self.last_poll_duration = None
+        self.last_error = None
+        self.last_error_at = None
+        # (timestamp, jobs ingested) per poll, for the rolling throughput figure
+        self._recent_polls = deque()
+
+    @classmethod
+    def from_env(cls):
+        """Build an ingester from INGESTER_* environment variables"""
+        return cls(
+            interval_seconds=float(os.getenv('INGESTER_INTERVAL_SECONDS', '300')),
+            max_jobs=int(os.getenv('INGESTER_MAX_JOBS', '50')),
+            enabled=os.getenv('INGESTER_ENABLED', '').lower() in ('1', 'true', 'yes')
+        )
+
+    def start(self):
+        """Start the polling thread if it is not already running"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name="feed-ingester", daemon=True)
+        self._thread.start()
+        logging.info(f"Feed ingester started (every {self.interval_seconds}s, up to {self.max_jobs} jobs per poll)")
+
+    def stop(self, timeout: float = 10):
+        """Signal the polling thread to stop and wait for it"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self.poll_once()
+            self._stop_event.wait(self.next_interval())
+
+    def next_interval(self) -> float:
+        """Configured interval, stretched when needed to fit the rest of today's poll budget"""
+        return max(self.interval_seconds, get_request_budget().recommended_poll_interval() or 0)
+
+    def poll_once(self) -> int:
+        """Fetch the feed once and store every job newer than the watermark"""
+        started = time.time()
+        self.last_poll_at = started
+        if self.started_at is None:
+            self.started_at = started
+        ingested = 0
+        try:
+            if self._scraper is None:
+                self._scraper = UpworkScraper(purpose='poll')
+            db = Database()
+            watermark = db.get_ingest_watermark(self.WATERMARK_NAME)
+
+            events = IngestPipeline(self._scraper, db).run(
+                ["latest"],
+                self.max_jobs,
+                skip_raw=lambda job: self._is_ingested(job, watermark) or get_seen_urls().is_seen_raw(job)
+            )
+
+            # The watermark only passes jobs that are in the database (stored now or already),
+            # and stops short of the oldest failed write so that job is fetched again next poll
+            written_keys = []
+            first_failed = None
+            for event in events:
+                if event['type'] != 'job':
+                    continue
+                job = event['job']
+                ingested += int(event['stored'])
+                key = (job.get('posted_date') or '', job.get('job_url') or '')
+                if not key[0]:
+                    continue
+                if event['status'] == 'error':
+                    first_failed = key if first_failed is None else min(first_failed, key)
+                elif event['status'] in ('inserted', 'duplicate'):
+                    written_keys.append(key)
+            newest = max((key for key in written_keys if first_failed is None or key < first_failed), default=None)
+
+            if newest and (watermark is None or newest > (watermark['posted_date'] or '', watermark['job_url'] or '')):
+                db.set_ingest_watermark(self.WATERMARK_NAME, newest[0], newest[1])
+
+            self.last_success_at = time.time()
+        except Exception as e:
+            logging.error(f"Feed ingester poll failed: {e}")
+            self.last_error = str(e)
+            self.last_error_at = time.time()
+        finally:
+            with self._lock:
+                self.polls += 1
+                self.jobs_ingested += ingested
+                self.last_poll_duration = time.time() - started
+                self._recent_polls.append((started, ingested))
+                while self._recent_polls and self._recent_polls[0][0] < started - 3600:
+                    self._recent_polls.popleft()
+        return ingested
+
+    @staticmethod
+    def _is_ingested(job: Dict, watermark: Optional[Dict]) -> bool:
+        """True if a raw feed item is not newer than the watermark (ISO dates compare as strings)"""
+        if not watermark or not watermark.get('posted_date'):
+            return False
+        posted_date = job.get('date_posted') or ''
+        if not posted_date:
+            return False
+        if posted_date != watermark['posted_date']:
+            return posted_date < watermark['posted_date']
+        return job.get('url', '') == watermark.get('job_url')
+
+    @staticmethod
+    def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+        if not value:
+            return None
+        try:
+            parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        except ValueError:
+            return None
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+    def status(self) -> Dict:
+        """Report lag, throughput and last error for the admin endpoint"""
+        now = time.time()
+        watermark = Database().get_ingest_watermark(self.WATERMARK_NAME)
+        newest = self._parse_timestamp(watermark['posted_date']) if watermark else None
+
+        with self._lock:
+            recent_jobs = sum(count for _, count in self._recent_polls)
+            window = min(3600, now - self.started_at) if self.started_at else 0
+
+        def iso(ts):
+            return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat() if ts else None
+
+        return {
+            "enabled": self.enabled,
+            "running": self.running,
+            "interval_seconds": self.interval_seconds,
+            "effective_interval_seconds": round(self.next_interval(), 1),
+            "max_jobs_per_poll": self.max_jobs,
+            "polls": self.polls,
+            "jobs_ingested": self.jobs_ingested,
+            "jobs_per_minute": round(recent_jobs / (window / 60), 2) if window > 0 else 0.0,
+            "watermark": watermark,
+            "lag_seconds": round(now - newest.timestamp(), 1) if newest else None,
+            "seconds_since_last_success": round(now - self.last_success_at, 1) if self.last_success_at else None,
+            "last_poll_at": iso(self.last_poll_at),
+            "last_poll_duration_seconds": round(self.last_poll_duration, 3) if self.last_poll_duration is not None else None,
+            "last_success_at": iso(self.last_success_at),
+            "last_error": self.last_error,
+            "last_error_at": iso(self.last_error_at),
+            "seen_urls": get_seen_urls().status()
+        }
+
+_ingester = None
+
+def get_ingester() -> FeedIngester:
+    """Return the process-wide ingester, configured from the environment"""
+    global _ingester
+    if _ingester is None:
+        _ingester = FeedIngester.from_env()
+    return _ingester
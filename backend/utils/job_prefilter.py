@@ -0,0 +1,77 @@
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+# Profiles with one of these availability statuses are left out of the skill pool
+INACTIVE_STATUSES = {'not available', 'unavailable'}
+
+SKILL_WEIGHT = 0.6
+PAY_WEIGHT = 0.2
+RATING_WEIGHT = 0.2
+
+def _number(value) -> Optional[float]:
+    try:
+        return float(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+class JobPrefilter:
+    """
+    Cheap score for raw feed items, computed before any cleaning or detail call:
+    exact (case-insensitive) skill overlap with the best-matching active profile,
+    plus hourly pay and client rating thresholds (same defaults as JobAnalyzer).
+    """
+
+    def __init__(self, profiles: List[Dict], min_pay_rate: float = 15, min_client_rating: float = 4.0,
+                 cutoff: float = 0.5):
+        self.profile_skills = [
+            {skill.strip().lower() for skill in profile.get('skills') or [] if skill and skill.strip()}
+            for profile in profiles
+            if (profile.get('availability_status') or '').strip().lower() not in INACTIVE_STATUSES
+        ]
+        self.profile_skills = [skills for skills in self.profile_skills if skills]
+        self.min_pay_rate = min_pay_rate
+        self.min_client_rating = min_client_rating
+        self.cutoff = cutoff
+        if not self.profile_skills:
+            logging.warning("No active profiles with skills - the pre-filter will shortlist every job")
+
+    @classmethod
+    def from_db(cls, db) -> "JobPrefilter":
+        """Build a pre-filter from the stored profiles and PREFILTER_* environment variables"""
+        return cls(
+            db.get_all_freelancer_profiles() or [],
+            min_pay_rate=float(os.getenv('PREFILTER_MIN_PAY_RATE', '15')),
+            min_client_rating=float(os.getenv('PREFILTER_MIN_CLIENT_RATING', '4.0')),
+            cutoff=float(os.getenv('PREFILTER_SCORE_CUTOFF', '0.5'))
+        )
+
+    def score(self, raw_job: Dict) -> Tuple[float, Dict]:
+        """Score a raw feed item from 0 to 1, with the parts it was made of"""
+        job_skills = {
+            skill.get('name', '').strip().lower()
+            for skill in raw_job.get('skills') or [] if isinstance(skill, dict) and skill.get('name')
+        }
+        skill_score = 0.0
+        if job_skills:
+            skill_score = max((len(job_skills & skills) / len(job_skills) for skills in self.profile_skills),
+                              default=0.0)
+
+        # Only hourly jobs can be compared with an hourly threshold; fixed-price jobs pass
+        hourly_max = _number(raw_job.get('project_budget_hourly_max')) or _number(raw_job.get('project_budget_hourly_min'))
+        if hourly_max is not None:
+            pay_score = 1.0 if hourly_max >= self.min_pay_rate else 0.0
+        else:
+            pay_score = 1.0 if _number(raw_job.get('project_budget_total')) else 0.5
+
+        rating = _number(raw_job.get('client_score'))
+        rating_score = 0.5 if rating is None else (1.0 if rating >= self.min_client_rating else 0.0)
+
+        total = SKILL_WEIGHT * skill_score + PAY_WEIGHT * pay_score + RATING_WEIGHT * rating_score
+        return total, {"skills": round(skill_score, 2), "pay": pay_score, "rating": rating_score}
+
+    def shortlist(self, raw_job: Dict) -> bool:
+        """True if the job scores at or above the cutoff (always, when there are no profiles to match)"""
+        if not self.profile_skills:
+            return True
+        return self.score(raw_job)[0] >= self.cutoff
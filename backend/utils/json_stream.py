@@ -0,0 +1,129 @@
+import json
+import re
+from typing import Any, Iterable, Iterator
+
+_decoder = json.JSONDecoder()
+_WHITESPACE_RE = re.compile(r'[\s,]*')
+# Characters the key scan stops at outside strings (structure) and inside them (end, escape)
+_SCAN_RE = re.compile(r'["{}\[\]:,]')
+_STRING_RE = re.compile(r'["\\]')
+# Rest of a string up to and including its closing quote
+_STRING_REST_RE = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+
+def iter_json_array(chunks: Iterable[str], key: str = "data") -> Iterator[Any]:
+    """
+    Incrementally yield the elements of a JSON array from a stream of text chunks.
+    The array may be the top-level value or the value of `key` in a top-level object;
+    keys of nested objects and text inside strings are not matched. Only the element
+    currently being decoded is held in memory: other values in the object are scanned
+    and discarded, and an object without the key yields nothing.
+    """
+    chunks = iter(chunks)
+    buffer = ''
+    eof = False
+
+    def read_more():
+        nonlocal buffer, eof
+        for chunk in chunks:
+            if chunk:
+                buffer += chunk
+                return True
+        eof = True
+        return False
+
+    # Locate the opening bracket of the array
+    while not buffer.strip():
+        buffer = ''
+        if not read_more():
+            return
+    buffer = buffer.lstrip()
+    if buffer[0] == '[':
+        buffer = buffer[1:]
+    elif buffer[0] == '{':
+        # Scan the top-level object, tracking nesting depth and string state across chunks.
+        # Scanned text is dropped from the buffer, except a depth-1 key while it is being read.
+        depth = 0
+        in_string = escaped = reading_key = False
+        expect_key = value_pending = False
+        current_key = None
+        pos = 0
+        while True:
+            if escaped and pos < len(buffer):
+                pos += 1
+                escaped = False
+            match = None if escaped else (_STRING_RE if in_string else _SCAN_RE).search(buffer, pos)
+            if match is None:
+                if reading_key:
+                    pos = len(buffer)
+                else:
+                    buffer, pos = '', 0
+                if not read_more():
+                    raise ValueError("Unexpected end of JSON object")
+                continue
+            char = match.group()
+            pos = match.end()
+            if in_string:
+                if char == '\\':
+                    escaped = True
+                    continue
+                in_string = False
+                if reading_key:
+                    current_key = json.loads('"' + buffer[:pos - 1] + '"')
+                    reading_key = False
+                    buffer, pos = buffer[pos:], 0
+                continue
+            # The value of the last depth-1 key starts at the first structural character after ':'
+            if depth == 1 and value_pending:
+                value_pending = False
+                if char == '[' and current_key == key:
+                    buffer = buffer[pos:]
+                    break
+            if char == '"':
+                if depth == 1 and expect_key:
+                    expect_key = False
+                    reading_key = True
+                    buffer, pos = buffer[pos:], 0
+                    in_string = True
+                    continue
+                # Skip a string that is complete in the buffer in one step
+                rest = _STRING_REST_RE.match(buffer, pos)
+                if rest:
+                    pos = rest.end()
+                else:
+                    in_string = True
+            elif char in '{[':
+                depth += 1
+                expect_key = depth == 1
+            elif char in '}]':
+                depth -= 1
+                if depth == 0:
+                    return
+            elif char == ',' and depth == 1:
+                expect_key = True
+            elif char == ':' and depth == 1:
+                value_pending = True
+    else:
+        raise ValueError("Response is not a JSON array or object")
+
+    while True:
+        pos = _WHITESPACE_RE.match(buffer).end()
+        if pos == len(buffer):
+            buffer = ''
+            if not read_more():
+                raise ValueError("Unexpected end of JSON array")
+            continue
+        if buffer[pos] == ']':
+            return
+        try:
+            item, end = _decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if not read_more():
+                raise
+            continue
+        # A number or literal is only complete once a delimiter follows it
+        if not isinstance(item, (dict, list, str)) and not eof:
+            rest = buffer[end:].lstrip()
+            if (not rest or rest[0] not in ',]') and read_more():
+                continue
+        buffer = buffer[end:]
+        yield item
@@ -0,0 +1,112 @@
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Mapping, Optional
+from utils.rate_limiter import RateLimiter, parse_retry_after
+
+class PooledKey:
+    """One API key with its own token bucket and health state"""
+
+    def __init__(self, key: str, limiter: RateLimiter):
+        self.key = key
+        self.rate_limiter = limiter
+        self.benched_until = 0.0
+        self.bench_reason = None
+        self.calls = 0
+        self.failures = 0
+
+    @property
+    def label(self) -> str:
+        """Masked key for logs and status output"""
+        return f"...{self.key[-4:]}" if len(self.key) > 4 else "..."
+
+    def status(self) -> Dict:
+        benched_for = self.benched_until - time.monotonic()
+        return {
+            "key": self.label,
+            "state": "benched" if benched_for > 0 else "healthy",
+            "benched_for_seconds": round(benched_for, 1) if benched_for > 0 else None,
+            "bench_reason": self.bench_reason if benched_for > 0 else None,
+            "calls": self.calls,
+            "failures": self.failures,
+            "rate_limiter": self.rate_limiter.status()
+        }
+
+class KeyPool:
+    """
+    Spreads upstream requests over several RapidAPI keys (one subscription each).
+    Every request goes to the key whose token bucket frees up soonest; keys that
+    answer 401/403 are benched for `auth_bench_seconds` and keys that answer 429
+    are benched until Retry-After (or a short backoff), so the others take over.
+    """
+
+    def __init__(self, keys: List[str], min_interval: float = 2.0, auth_bench_seconds: float = 3600.0):
+        if not keys:
+            raise ValueError("KeyPool needs at least one API key")
+        self.keys = [PooledKey(key, RateLimiter(min_interval=min_interval)) for key in dict.fromkeys(keys)]
+        self.auth_bench_seconds = auth_bench_seconds
+        self._lock = threading.Lock()
+
+    def acquire(self, max_wait: Optional[float] = None) -> Optional[PooledKey]:
+        """Wait for the key with the earliest free slot. Returns None if every key is further away than max_wait."""
+        with self._lock:
+            key = min(self.keys, key=lambda k: k.rate_limiter.next_slot_in())
+        if key.rate_limiter.acquire(max_wait):
+            return key
+        return None
+
+    def next_slot_in(self) -> float:
+        return min(k.rate_limiter.next_slot_in() for k in self.keys)
+
+    def bench(self, key: PooledKey, seconds: float, reason: str):
+        """Take a key out of rotation for the given number of seconds"""
+        key.rate_limiter.pause(seconds)
+        with self._lock:
+            key.benched_until = max(key.benched_until, time.monotonic() + seconds)
+            key.bench_reason = reason
+        logging.warning(f"API key {key.label} benched for {seconds:.0f}s: {reason}")
+
+    def report(self, key: PooledKey, status_code: Optional[int], headers: Mapping[str, str] = None,
+               backoff: float = 1.0):
+        """Update a key's bucket and health from the outcome of a request made with it"""
+        with self._lock:
+            key.calls += 1
+            if status_code != 200:
+                key.failures += 1
+        if headers is not None:
+            key.rate_limiter.update_from_headers(headers)
+        if status_code in (401, 403):
+            self.bench(key, self.auth_bench_seconds, f"status {status_code}")
+        elif status_code == 429:
+            retry_after = parse_retry_after((headers or {}).get('Retry-After'))
+            self.bench(key, retry_after if retry_after is not None else backoff, "429 Too Many Requests")
+        elif status_code is None or status_code >= 500:
+            key.rate_limiter.pause(backoff)
+
+    def status(self) -> Dict:
+        keys = [key.status() for key in self.keys]
+        return {
+            "keys_total": len(keys),
+            "keys_healthy": sum(1 for key in keys if key["state"] == "healthy"),
+            "next_slot_in_seconds": round(self.next_slot_in(), 3),
+            "keys": keys
+        }
+
+def keys_from_env(default: str = None) -> List[str]:
+    """RAPIDAPI_KEYS (comma-separated), falling back to the single RAPIDAPI_KEY"""
+    keys = [key.strip() for key in os.getenv('RAPIDAPI_KEYS', '').split(',') if key.strip()]
+    if not keys:
+        key = os.getenv('RAPIDAPI_KEY', default)
+        keys = [key] if key else []
+    return keys
+
+_registry_lock = threading.Lock()
+_key_pools: Dict[str, KeyPool] = {}
+
+def get_key_pool(name: str, **kwargs) -> KeyPool:
+    """Process-wide key pool for a host, so every scraper instance shares the keys' buckets"""
+    with _registry_lock:
+        if name not in _key_pools:
+            _key_pools[name] = KeyPool(**kwargs)
+        return _key_pools[name]
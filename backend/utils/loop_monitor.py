@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Dict, Optional
+
+class EventLoopLagMonitor:
+    """
+    Measures how late the event loop wakes a task that sleeps for a fixed interval.
+    The lag is the time the loop spent running something else, typically blocking
+    code in an async route; every request waiting on the loop waits at least as long.
+    """
+
+    def __init__(self, interval_ms: float = 100, window: int = 600, warn_ms: float = 250):
+        self.interval = interval_ms / 1000
+        self.warn_ms = warn_ms
+        # Lag in ms of the latest samples (window * interval of history)
+        self._samples = deque(maxlen=window)
+        self._task: Optional[asyncio.Task] = None
+        self.started_at = None
+        self.samples_total = 0
+        self.max_lag_ms = 0.0
+        self.slow_samples = 0
+
+    @classmethod
+    def from_env(cls) -> "EventLoopLagMonitor":
+        return cls(
+            interval_ms=float(os.getenv('LOOP_LAG_INTERVAL_MS', '100')),
+            window=int(os.getenv('LOOP_LAG_WINDOW', '600')),
+            warn_ms=float(os.getenv('LOOP_LAG_WARN_MS', '250'))
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start sampling on the running event loop"""
+        if self.running:
+            return
+        self.started_at = time.time()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def reset(self):
+        self._samples.clear()
+        self.samples_total = 0
+        self.max_lag_ms = 0.0
+        self.slow_samples = 0
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, (loop.time() - expected) * 1000))
+
+    def record(self, lag_ms: float):
+        self._samples.append(lag_ms)
+        self.samples_total += 1
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+        if lag_ms >= self.warn_ms:
+            self.slow_samples += 1
+            logging.warning(f"Event loop blocked for {lag_ms:.0f} ms")
+
+    def status(self) -> Dict:
+        """Report recent and all-time lag for the admin endpoint"""
+        samples = sorted(self._samples)
+
+        def percentile(p):
+            return round(samples[min(len(samples) - 1, int(len(samples) * p))], 2) if samples else None
+
+        return {
+            "running": self.running,
+            "interval_ms": self.interval * 1000,
+            "window_samples": len(samples),
+            "current_lag_ms": round(self._samples[-1], 2) if samples else None,
+            "p50_lag_ms": percentile(0.5),
+            "p99_lag_ms": percentile(0.99),
+            "window_max_lag_ms": round(samples[-1], 2) if samples else None,
+            "max_lag_ms": round(self.max_lag_ms, 2),
+            "samples": self.samples_total,
+            "slow_samples": self.slow_samples,
+            "warn_ms": self.warn_ms
+        }
+
+_loop_monitor = None
+
+def get_loop_monitor() -> EventLoopLagMonitor:
+    """Return the process-wide event loop lag monitor, configured from the environment"""
+    global _loop_monitor
+    if _loop_monitor is None:
+        _loop_monitor = EventLoopLagMonitor.from_env()
+    return _loop_monitor
@@ -0,0 +1,63 @@
+import hashlib
+import os
+import re
+from typing import List, Optional
+import numpy as np
+
+# MinHash signature of NUM_PERM values, split into BANDS bands of ROWS rows for LSH.
+# 16 bands x 4 rows puts the candidate threshold near 0.5 Jaccard; candidates are
+# then confirmed against NEAR_DUPLICATE_THRESHOLD using the full signatures.
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+
+# 'flag' stores near-duplicates with duplicate_of set, 'collapse' drops them, 'off' disables detection
+NEAR_DUPLICATE_MODE = os.getenv('NEAR_DUPLICATE_MODE', 'flag').lower()
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv('NEAR_DUPLICATE_THRESHOLD', '0.8'))
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+# Fixed seed so signatures stored in the database stay comparable across restarts
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+
+_WORD_RE = re.compile(r'\w+')
+
+def _shingles(text: str) -> set:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+def minhash_signature(title: str, description: str) -> Optional[np.ndarray]:
+    """MinHash signature (uint32 array) of a job's title and description, or None if there is no text"""
+    shingles = _shingles(f"{title or ''} {description or ''}")
+    if not shingles:
+        return None
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'little') for s in shingles],
+        dtype=np.uint64
+    )
+    permuted = (np.outer(hashes, _PERM_A) + _PERM_B) % _MERSENNE_PRIME & _MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+def signature_to_blob(signature: np.ndarray) -> bytes:
+    return signature.astype('<u4').tobytes()
+
+def signature_from_blob(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype='<u4')
+
+def lsh_buckets(signature: np.ndarray) -> List[tuple]:
+    """(band, bucket) keys for the LSH index; near-duplicates share at least one with high probability"""
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS:(band + 1) * ROWS].astype('<u4').tobytes()
+        bucket = int.from_bytes(hashlib.blake2b(rows, digest_size=8).digest(), 'little', signed=True)
+        buckets.append((band, bucket))
+    return buckets
+
+def estimate_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures"""
+    return float(np.mean(a == b))
@@ -0,0 +1,140 @@
+import gzip
+import io
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # optional, gzip is used without it
+    zstandard = None
+
+COMPRESSIONS = ('zstd', 'gzip')
+_EXTENSIONS = {'zstd': '.jsonl.zst', 'gzip': '.jsonl.gz'}
+
+class PayloadArchive:
+    """
+    Append-only store of raw provider payloads, keyed by job id, so jobs can be
+    re-mapped later without refetching. Records are JSON lines in daily segment
+    files; every append adds one compressed frame (zstd) or member (gzip) to the
+    current segment, and readers decode the concatenated frames in order.
+    """
+
+    def __init__(self, directory: str = None, compression: str = None, enabled: bool = True):
+        self.directory = Path(directory or os.getenv('PAYLOAD_ARCHIVE_DIR', 'data/archive'))
+        compression = (compression or os.getenv('PAYLOAD_ARCHIVE_COMPRESSION', '')).lower()
+        if compression not in COMPRESSIONS:
+            compression = 'zstd' if zstandard is not None else 'gzip'
+        if compression == 'zstd' and zstandard is None:
+            logging.warning("zstandard is not installed, archiving payloads with gzip")
+            compression = 'gzip'
+        self.compression = compression
+        self.enabled = enabled
+        self.records_written = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "PayloadArchive":
+        return cls(enabled=os.getenv('PAYLOAD_ARCHIVE_ENABLED', 'true').lower() in ('1', 'true', 'yes'))
+
+    def _segment_path(self) -> Path:
+        day = datetime.now(timezone.utc).strftime('%Y%m%d')
+        return self.directory / f"payloads-{day}{_EXTENSIONS[self.compression]}"
+
+    def append(self, payloads: List[Dict], source: str = "feed"):
+        """Archive raw payloads as one compressed frame; ids come from the payload's id or URL"""
+        if not self.enabled or not payloads:
+            return
+        fetched_at = datetime.now(timezone.utc).isoformat()
+        lines = []
+        for payload in payloads:
+            if not isinstance(payload, dict):
+                continue
+            lines.append(json.dumps({
+                "id": payload_job_id(payload),
+                "source": source,
+                "fetched_at": fetched_at,
+                "payload": payload
+            }, separators=(',', ':')))
+        if not lines:
+            return
+        data = ('\n'.join(lines) + '\n').encode('utf-8')
+        if self.compression == 'zstd':
+            frame = zstandard.ZstdCompressor(level=3).compress(data)
+        else:
+            frame = gzip.compress(data, compresslevel=6)
+        try:
+            with self._lock:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                with open(self._segment_path(), 'ab') as f:
+                    f.write(frame)
+                self.records_written += len(lines)
+        except OSError as e:
+            logging.error(f"Error archiving raw payloads: {e}")
+
+    def segments(self) -> List[Path]:
+        """Archive segment files, oldest first"""
+        if not self.directory.exists():
+            return []
+        return sorted(p for p in self.directory.iterdir()
+                      if p.name.startswith('payloads-') and p.name.endswith(tuple(_EXTENSIONS.values())))
+
+    def iter_records(self, segment: Path = None) -> Iterator[Dict]:
+        """Yield archived records in the order they were written"""
+        for path in ([segment] if segment else self.segments()):
+            for line in _read_segment(path):
+                if line.strip():
+                    yield json.loads(line)
+
+    def latest_payloads(self) -> Dict[str, Dict]:
+        """
+        Raw payload per job id: the most recent feed payload overlaid with the most
+        recent detail payload, so a later feed record does not hide the fuller detail
+        fields and fields missing from the detail response keep their feed values.
+        """
+        latest = {}
+        for record in self.iter_records():
+            key = record.get('id') or record['payload'].get('url')
+            if key:
+                latest.setdefault(key, {})[record.get('source') or 'feed'] = record['payload']
+        merged = {}
+        for key, by_source in latest.items():
+            payload = {}
+            # Detail payloads are applied last so their values win
+            for source in sorted(by_source, key=lambda source: source == 'detail'):
+                payload.update((field, value) for field, value in by_source[source].items() if value is not None)
+            merged[key] = payload
+        return merged
+
+def _read_segment(path: Path) -> Iterator[str]:
+    if path.name.endswith(_EXTENSIONS['zstd']):
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is required to read {path}")
+        with open(path, 'rb') as f:
+            reader = zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True)
+            yield from io.TextIOWrapper(reader, encoding='utf-8')
+    else:
+        # gzip reads concatenated members as one stream
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            yield from f
+
+def payload_job_id(payload: Dict) -> Optional[str]:
+    """Upwork job id of a raw payload, from its id field or its job URL"""
+    if payload.get('id'):
+        return str(payload['id'])
+    from utils.web_scraper import JOB_URL_ID_RE
+    match = JOB_URL_ID_RE.search(payload.get('url') or '')
+    return match.group(1) if match else None
+
+_archive = None
+
+def get_payload_archive() -> PayloadArchive:
+    """Return the process-wide payload archive"""
+    global _archive
+    if _archive is None:
+        _archive = PayloadArchive.from_env()
+    return _archive
@@ -0,0 +1,195 @@
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either as seconds or as an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+def _header_number(headers: Mapping[str, str], name: str) -> Optional[float]:
+    try:
+        value = headers.get(name)
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+class RateLimiter:
+    """
+    Thread-safe token bucket (GCRA) shared by every scraper talking to one host.
+    The request interval adapts to the provider's remaining-quota headers and
+    Retry-After pauses, never dropping below the configured minimum interval.
+    """
+
+    def __init__(self, min_interval: float = 2.0, burst: int = 1, max_interval: float = 3600.0):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.burst = max(1, burst)
+        self.interval = min_interval
+        self.quota_remaining = None
+        self.quota_limit = None
+        self.quota_reset_seconds = None
+        self._tat = 0.0  # theoretical arrival time of the next request
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, max_wait: Optional[float] = None) -> bool:
+        """Wait for a request slot. Returns False without waiting if the wait would exceed max_wait."""
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._tat, now)
+            start = max(now, tat - (self.burst - 1) * self.interval, self._paused_until)
+            wait = start - now
+            if max_wait is not None and wait > max_wait:
+                return False
+            self._tat = max(tat, start) + self.interval
+        if wait > 0:
+            logging.info(f"Rate limiting: waiting {wait:.2f} seconds")
+            time.sleep(wait)
+        return True
+
+    def next_slot_in(self) -> float:
+        """Seconds until a request would be allowed"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, max(self._tat, now) - (self.burst - 1) * self.interval, self._paused_until)
+            return start - now
+
+    def pause(self, seconds: float):
+        """Hold all requests for the given number of seconds (e.g. from Retry-After)"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """Adjust the request rate from Retry-After and RapidAPI quota headers"""
+        retry_after = parse_retry_after(headers.get('Retry-After'))
+        remaining = _header_number(headers, 'X-RateLimit-Requests-Remaining')
+        limit = _header_number(headers, 'X-RateLimit-Requests-Limit')
+        reset = _header_number(headers, 'X-RateLimit-Requests-Reset')
+
+        if remaining is not None:
+            self.quota_remaining = int(remaining)
+        if limit is not None:
+            self.quota_limit = int(limit)
+        if reset is not None:
+            self.quota_reset_seconds = reset
+
+        if retry_after is not None:
+            self.pause(retry_after)
+        if remaining is not None and reset is not None:
+            if remaining <= 0:
+                # Quota exhausted: nothing can succeed before the window resets
+                self.pause(reset)
+            else:
+                # Spread what is left of the quota evenly over the rest of the window
+                interval = min(self.max_interval, max(self.min_interval, reset / remaining))
+                with self._lock:
+                    self.interval = interval
+
+    def status(self) -> Dict:
+        return {
+            "interval_seconds": round(self.interval, 3),
+            "min_interval_seconds": self.min_interval,
+            "next_slot_in_seconds": round(self.next_slot_in(), 3),
+            "quota_remaining": self.quota_remaining,
+            "quota_limit": self.quota_limit,
+            "quota_reset_seconds": self.quota_reset_seconds
+        }
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failed requests so callers fail fast,
+    then lets a single trial request through once `reset_timeout` has passed.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.last_failure = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def is_available(self) -> bool:
+        """True unless the breaker is open and still cooling down"""
+        return self.state != self.OPEN
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self, reason: str = None):
+        with self._lock:
+            self.consecutive_failures += 1
+            self.last_failure = reason
+            if self._trial_in_flight or self.consecutive_failures >= self.failure_threshold:
+                if self.opened_at is None or self._trial_in_flight:
+                    logging.warning(f"Circuit breaker opened after {self.consecutive_failures} failures: {reason}")
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def status(self) -> Dict:
+        with self._lock:
+            state = self._state()
+            retry_in = None
+            if state == self.OPEN:
+                retry_in = round(self.reset_timeout - (time.monotonic() - self.opened_at), 1)
+            return {
+                "state": state,
+                "consecutive_failures": self.consecutive_failures,
+                "failure_threshold": self.failure_threshold,
+                "retry_in_seconds": retry_in,
+                "last_failure": self.last_failure
+            }
+
+_registry_lock = threading.Lock()
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+
+def get_circuit_breaker(name: str, **kwargs) -> CircuitBreaker:
+    """Process-wide circuit breaker for a host"""
+    with _registry_lock:
+        if name not in _circuit_breakers:
+            _circuit_breakers[name] = CircuitBreaker(**kwargs)
+        return _circuit_breakers[name]
@@ -0,0 +1,172 @@
+import calendar
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Mapping, Optional
+from models.database import Database
+
+# Who an upstream call is made for: background feed polls, user-triggered scrapes, job detail fetches
+PURPOSES = ('poll', 'user', 'detail')
+DEFAULT_SHARES = {'poll': 0.4, 'user': 0.4, 'detail': 0.2}
+
+def parse_shares(value: Optional[str]) -> Dict[str, float]:
+    """Parse 'poll=0.4,user=0.4,detail=0.2' into shares normalised to sum to 1"""
+    shares = dict(DEFAULT_SHARES)
+    if value:
+        try:
+            for part in value.split(','):
+                purpose, share = part.split('=')
+                if purpose.strip() in PURPOSES:
+                    shares[purpose.strip()] = max(0.0, float(share))
+        except ValueError:
+            logging.warning(f"Invalid RAPIDAPI_BUDGET_SHARES '{value}', using defaults")
+            shares = dict(DEFAULT_SHARES)
+    total = sum(shares.values()) or 1.0
+    return {purpose: share / total for purpose, share in shares.items()}
+
+def _sql_timestamp(value: datetime) -> str:
+    # Matches CURRENT_TIMESTAMP, which api_calls.called_at defaults to (UTC)
+    return value.strftime('%Y-%m-%d %H:%M:%S')
+
+def _header_int(headers: Mapping[str, str], name: str) -> Optional[int]:
+    try:
+        value = headers.get(name)
+        return int(float(value)) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+class RequestBudget:
+    """
+    Records every upstream call in api_calls and plans the request budget.
+    What is left of the monthly budget is spread evenly over the remaining days
+    (capped by the daily budget and the provider's remaining quota), and each
+    day's allowance is split between purposes by share. Background polls are
+    also paced across the day so they cannot use up their share by mid-morning.
+    A budget of 0 means unlimited.
+    """
+
+    def __init__(self, daily_budget: int = 0, monthly_budget: int = 0, shares: Dict[str, float] = None):
+        self.daily_budget = daily_budget
+        self.monthly_budget = monthly_budget
+        self.shares = shares or dict(DEFAULT_SHARES)
+        # Calls allowed but not yet logged, so concurrent callers cannot overshoot a cap
+        self._reserved = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "RequestBudget":
+        return cls(
+            daily_budget=int(os.getenv('RAPIDAPI_DAILY_BUDGET', '0')),
+            monthly_budget=int(os.getenv('RAPIDAPI_MONTHLY_BUDGET', '0')),
+            shares=parse_shares(os.getenv('RAPIDAPI_BUDGET_SHARES'))
+        )
+
+    def record(self, endpoint: str, purpose: str, status_code: Optional[int], latency_ms: float,
+               headers: Mapping[str, str] = None, reserved: bool = False):
+        """Log one upstream call with the quota the provider reported on it, settling its reservation"""
+        headers = headers or {}
+        Database().add_api_call(
+            endpoint, purpose, status_code, round(latency_ms, 1),
+            quota_remaining=_header_int(headers, 'X-RateLimit-Requests-Remaining'),
+            quota_limit=_header_int(headers, 'X-RateLimit-Requests-Limit')
+        )
+        if reserved:
+            self.release(purpose)
+
+    def plan(self) -> Dict:
+        """Today's allowance per purpose from usage so far"""
+        db = Database()
+        now = datetime.now(timezone.utc)
+        day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        month_start = day_start.replace(day=1)
+        days_left = calendar.monthrange(now.year, now.month)[1] - now.day + 1
+        day_fraction = (now - day_start).total_seconds() / 86400
+
+        used_today = db.get_api_call_counts(_sql_timestamp(day_start))
+        used_month = sum(db.get_api_call_counts(_sql_timestamp(month_start)).values())
+        total_today = sum(used_today.values())
+
+        allowance = None
+        if self.monthly_budget:
+            used_before_today = used_month - total_today
+            allowance = max(0.0, (self.monthly_budget - used_before_today) / days_left)
+        if self.daily_budget:
+            allowance = self.daily_budget if allowance is None else min(allowance, self.daily_budget)
+        quota = db.get_latest_api_quota()
+        if quota and quota['quota_remaining'] is not None:
+            provider_cap = total_today + quota['quota_remaining']
+            allowance = provider_cap if allowance is None else min(allowance, provider_cap)
+
+        purposes = {}
+        for purpose in PURPOSES:
+            used = used_today.get(purpose, 0)
+            cap = allowance * self.shares.get(purpose, 0) if allowance is not None else None
+            available = cap
+            if cap is not None and purpose == 'poll':
+                # Release the poll share gradually over the day (at least one hour's worth)
+                available = cap * max(day_fraction, 1 / 24)
+            purposes[purpose] = {
+                "used_today": used,
+                "daily_cap": round(cap, 1) if cap is not None else None,
+                "available_now": round(available, 1) if available is not None else None,
+                "allowed": available is None or used < available
+            }
+
+        return {
+            "daily_budget": self.daily_budget or None,
+            "monthly_budget": self.monthly_budget or None,
+            "used_today": total_today,
+            "used_this_month": used_month,
+            "allowance_today": round(allowance, 1) if allowance is not None else None,
+            "days_left_in_month": days_left,
+            "provider_quota": quota,
+            "purposes": purposes
+        }
+
+    def reserve(self, purpose: str) -> bool:
+        """Claim one call for this purpose if it fits today's plan; settle it with record() or release()"""
+        if not (self.daily_budget or self.monthly_budget):
+            return True
+        with self._lock:
+            plan = self.plan()["purposes"].get(purpose)
+            if plan is None or plan["available_now"] is None:
+                return True
+            if plan["used_today"] + self._reserved.get(purpose, 0) >= plan["available_now"]:
+                return False
+            self._reserved[purpose] = self._reserved.get(purpose, 0) + 1
+            return True
+
+    def release(self, purpose: str):
+        """Give back a reservation that did not turn into a call"""
+        with self._lock:
+            if self._reserved.get(purpose):
+                self._reserved[purpose] -= 1
+
+    def recommended_poll_interval(self) -> Optional[float]:
+        """Seconds between polls that would spread the rest of today's poll share evenly"""
+        if not (self.daily_budget or self.monthly_budget):
+            return None
+        poll = self.plan()["purposes"]["poll"]
+        now = datetime.now(timezone.utc)
+        seconds_left = 86400 - (now - now.replace(hour=0, minute=0, second=0, microsecond=0)).total_seconds()
+        remaining = (poll["daily_cap"] or 0) - poll["used_today"]
+        if remaining <= 0:
+            return seconds_left
+        return seconds_left / remaining
+
+    def status(self) -> Dict:
+        plan = self.plan()
+        plan["shares"] = self.shares
+        interval = self.recommended_poll_interval()
+        plan["recommended_poll_interval_seconds"] = round(interval, 1) if interval is not None else None
+        return plan
+
+_budget = None
+
+def get_request_budget() -> RequestBudget:
+    """Return the process-wide request budget"""
+    global _budget
+    if _budget is None:
+        _budget = RequestBudget.from_env()
+    return _budget
@@ -0,0 +1,69 @@
+from typing import Dict, Iterator, List, Optional
+from models.database import Database
+from utils.web_scraper import UpworkScraper
+from utils.ingest_pipeline import IngestPipeline
+from utils.job_prefilter import JobPrefilter
+
+# feed: map and store every feed item; two_tier: pre-filter the feed, then fetch details for the shortlist
+SCRAPE_MODES = ('feed', 'two_tier')
+
+def iter_scrape_events(scraper: UpworkScraper, db: Database, keywords: List[str], max_jobs_per_keyword: int,
+                       category_filter: Optional[str] = None, mode: str = 'feed') -> Iterator[Dict]:
+    """
+    Scrape each keyword and store jobs in batches as they are mapped, yielding events:
+    a 'job' event per written job, a 'progress' event as each keyword completes and a final 'done' event.
+    In 'two_tier' mode only jobs shortlisted against the stored profiles are enriched and stored.
+    """
+    if not scraper.is_available():
+        # Upstream is failing: answer immediately from what is already stored
+        stored_jobs = db.get_scraped_jobs(limit=max_jobs_per_keyword * len(keywords))
+        for job in stored_jobs:
+            yield {"type": "job", "keyword": None, "stored": False, "job": job}
+        yield {
+            "type": "done",
+            "message": (f"Job API is temporarily unavailable (circuit breaker open). "
+                        f"Showing {len(stored_jobs)} previously stored jobs."),
+            "added_count": 0,
+            "total_count": len(stored_jobs),
+            "source": "stored"
+        }
+        return
+
+    # Fetch, cleaning and DB writes overlap in separate stages (see IngestPipeline)
+    prefilter = JobPrefilter.from_db(db) if mode == 'two_tier' else None
+    totals = {"total_count": 0, "added_count": 0, "skipped_count": 0, "filtered_count": 0}
+    for event in IngestPipeline(scraper, db).run(keywords, max_jobs_per_keyword, category_filter,
+                                                 prefilter=prefilter):
+        if event["type"] == "progress":
+            totals = {name: event[name] for name in totals}
+        yield event
+
+    yield {
+        "type": "done",
+        "message": scrape_summary(totals["total_count"], totals["added_count"], totals["skipped_count"],
+                                  totals["filtered_count"]),
+        **totals,
+        "source": "api"
+    }
+
+def scrape_summary(total_count: int, added_count: int, skipped_count: int = 0, filtered_count: int = 0) -> str:
+    """Human-readable summary of a scrape run"""
+    if total_count == 0 and filtered_count:
+        return f"No jobs matched your profiles ({filtered_count} filtered out, {skipped_count} already stored)"
+    if total_count == 0 and skipped_count:
+        return f"No new jobs found ({skipped_count} already stored jobs skipped)"
+    if total_count == 0:
+        return (f"No jobs found for the given keywords. Possible reasons: "
+                f"- No relevant jobs available at this time. "
+                f"- API may be rate limited or unavailable. "
+                f"- The keyword(s) may be too specific. "
+                f"Try different keywords or check your API settings.")
+    message = f"Scraped {total_count} jobs"
+    duplicate_count = total_count - added_count
+    if duplicate_count > 0:
+        message += f" ({added_count} new, {duplicate_count} duplicates ignored)"
+    if skipped_count:
+        message += f"; {skipped_count} already stored jobs skipped"
+    if filtered_count:
+        message += f"; {filtered_count} jobs filtered out before detail fetch"
+    return message
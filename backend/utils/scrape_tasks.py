@@ -0,0 +1,110 @@
+import logging
+import queue
+import threading
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+from models.database import Database
+from utils.scrape_runner import iter_scrape_events
+from utils.web_scraper import UpworkScraper
+
+class ScrapeTaskWorker:
+    """
+    Runs background scrape tasks one at a time from a queue backed by the
+    scrape_tasks table. Tasks still queued or running when the process stopped
+    are picked up again by start().
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the worker thread and requeue unfinished tasks from the database"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            for task in Database().get_unfinished_scrape_tasks():
+                logging.info(f"Resuming scrape task {task['id']} ({task['status']})")
+                self._queue.put(task['id'])
+            self._thread = threading.Thread(target=self._run, name="scrape-tasks", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10):
+        self._stop_event.set()
+        self._queue.put(None)
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def enqueue(self, keywords: List[str], max_jobs_per_keyword: int, category_filter: Optional[str] = None,
+                mode: str = 'feed') -> str:
+        """Persist a new task and queue it, returning its id"""
+        # Start first so only tasks left over from earlier runs are requeued from the database
+        self.start()
+        task_id = uuid.uuid4().hex
+        request = {
+            "keywords": keywords,
+            "max_jobs_per_keyword": max_jobs_per_keyword,
+            "category_filter": category_filter,
+            "mode": mode
+        }
+        if not Database().add_scrape_task(task_id, request, len(keywords)):
+            raise RuntimeError("Failed to persist scrape task")
+        self._queue.put(task_id)
+        return task_id
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            task_id = self._queue.get()
+            if task_id is None:
+                break
+            self._process(task_id)
+
+    def _process(self, task_id: str):
+        db = Database()
+        task = db.get_scrape_task(task_id)
+        if not task or task['status'] not in ('queued', 'running'):
+            return
+
+        request = task['request']
+        errors = task['errors'] or []
+        db.update_scrape_task(task_id, status='running', started_at=datetime.now(),
+                              keywords_done=0, total_count=0, added_count=0)
+        try:
+            for event in iter_scrape_events(UpworkScraper(), db, request['keywords'],
+                                            request['max_jobs_per_keyword'], request.get('category_filter'),
+                                            request.get('mode', 'feed')):
+                if event['type'] == 'progress':
+                    if event['found'] == 0 and not event['skipped'] and not event.get('filtered'):
+                        errors.append(f"No jobs returned for keyword '{event['keyword']}'")
+                    db.update_scrape_task(task_id, keywords_done=event['keyword_index'],
+                                          total_count=event['total_count'], added_count=event['added_count'],
+                                          errors=errors)
+                elif event['type'] == 'done':
+                    db.update_scrape_task(task_id, status='completed', message=event['message'],
+                                          total_count=event['total_count'], added_count=event['added_count'],
+                                          finished_at=datetime.now(), errors=errors)
+        except Exception as e:
+            logging.error(f"Scrape task {task_id} failed: {e}")
+            errors.append(str(e))
+            db.update_scrape_task(task_id, status='failed', message=str(e), finished_at=datetime.now(),
+                                  errors=errors)
+
+    def status(self) -> Dict:
+        return {
+            "running": bool(self._thread and self._thread.is_alive()),
+            "queued": self._queue.qsize()
+        }
+
+_worker = None
+
+def get_task_worker() -> ScrapeTaskWorker:
+    """Return the process-wide scrape task worker"""
+    global _worker
+    if _worker is None:
+        _worker = ScrapeTaskWorker()
+    return _worker
@@ -0,0 +1,59 @@
+import hashlib
+import threading
+from typing import Dict, Iterable, Optional
+
+def _url_key(url: str) -> int:
+    """64-bit hash of a job URL; collisions are negligible at scraped_jobs sizes"""
+    return int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'big')
+
+class SeenJobUrls:
+    """
+    In-memory hash set of every job URL stored in scraped_jobs (plus near-duplicates
+    collapsed since startup), loaded when the database opens and kept current on
+    insert/clear. The scraper checks raw feed items against it so duplicates are
+    dropped before any cleaning or mapping.
+    """
+
+    def __init__(self):
+        self._keys = set()
+        self._lock = threading.Lock()
+        self.loaded = False
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, urls: Iterable[str]):
+        keys = {_url_key(url) for url in urls if url}
+        with self._lock:
+            self._keys = keys
+            self.loaded = True
+
+    def add(self, url: Optional[str]):
+        if url:
+            key = _url_key(url)
+            with self._lock:
+                self._keys.add(key)
+
+    def clear(self):
+        with self._lock:
+            self._keys.clear()
+
+    def __contains__(self, url: str) -> bool:
+        return bool(url) and _url_key(url) in self._keys
+
+    def is_seen_raw(self, job: Dict) -> bool:
+        """True if a raw feed item's URL is already stored (usable as a scraper skip_raw predicate)"""
+        seen = job.get('url', '') in self
+        if seen:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return seen
+
+    def status(self) -> Dict:
+        return {"loaded": self.loaded, "size": len(self._keys), "hits": self.hits, "misses": self.misses}
+
+_seen_urls = SeenJobUrls()
+
+def get_seen_urls() -> SeenJobUrls:
+    """Return the process-wide seen job URL set"""
+    return _seen_urls
@@ -1,79 +1,197 @@
 import requests
 import logging
 import os
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator, Callable
 import time
 import random
 import re
+import threading
+from contextlib import contextmanager
 import spacy
+from utils.json_stream import iter_json_array
+from utils.rate_limiter import get_circuit_breaker
+from utils.key_pool import get_key_pool, keys_from_env
+from utils.payload_archive import get_payload_archive
+from utils.request_budget import get_request_budget
+
+# Words that commonly prefix job titles without describing the work itself
+_TITLE_FILLER_RE = re.compile(
+    r'^(?:(?:urgent(?:ly)?|asap|need(?:ed)?|looking\s+for|seeking|hiring|wanted|required)\b[\s:!-]*)+',
+    re.IGNORECASE
+)
+# Separators after which a title usually trails off into budget/timeline details
+_TITLE_SPLIT_RE = re.compile(r'\s+[-\u2013\u2014|]\s+|[|:(\[]')
+
+# Job id in an Upwork job URL, e.g. https://www.upwork.com/jobs/~0123456789abcdef
+JOB_URL_ID_RE = re.compile(r'/jobs/~([a-zA-Z0-9_]+)')
+
+CLEANING_MODES = ('spacy', 'fast')
+
+# Loaded spaCy pipelines per cleaning mode, shared by every scraper in the process. A pipeline
+# is only used by one thread at a time, so models load once per concurrent user, not per scraper
+_nlp_pools = {}
+_nlp_pools_lock = threading.Lock()
+
+def _load_nlp(cleaning_mode: str):
+    if cleaning_mode == 'fast':
+        nlp = spacy.blank('en')
+        nlp.add_pipe('sentencizer')
+        return nlp
+    try:
+        return spacy.load('en_core_web_sm')
+    except Exception:
+        os.system('python -m spacy download en_core_web_sm')
+        return spacy.load('en_core_web_sm')
+
+@contextmanager
+def borrow_nlp(cleaning_mode: str):
+    """Take a pipeline for the cleaning mode from the shared pool (loading one if all are in use)"""
+    with _nlp_pools_lock:
+        pool = _nlp_pools.setdefault(cleaning_mode, [])
+        nlp = pool.pop() if pool else None
+    if nlp is None:
+        nlp = _load_nlp(cleaning_mode)
+    try:
+        yield nlp
+    finally:
+        with _nlp_pools_lock:
+            pool.append(nlp)
+RAPIDAPI_HOST = "upwork-jobs-api2.p.rapidapi.com"
+
+def get_scraper_key_pool():
+    """Process-wide pool of RapidAPI keys for the job API host"""
+    return get_key_pool(
+        RAPIDAPI_HOST,
+        keys=keys_from_env(default='484377fa76mshc9a5b3875e2f583p15804bjsn5cbe55889a7e'),
+        min_interval=float(os.getenv('SCRAPER_MIN_DELAY', '2')),
+        auth_bench_seconds=float(os.getenv('SCRAPER_KEY_BENCH_SECONDS', '3600'))
+    )
 
 class UpworkScraper:
-    def __init__(self):
-        # Get API key from environment variable or use a default one
-        self.rapidapi_key = os.getenv('RAPIDAPI_KEY', '484377fa76mshc9a5b3875e2f583p15804bjsn5cbe55889a7e')
+    def __init__(self, cleaning_mode: str = None, purpose: str = 'user'):
         # Using RapidAPI service for Upwork jobs
-        self.rapidapi_host = "upwork-jobs-api2.p.rapidapi.com"
-        self.base_url = "https://upwork-jobs-api2.p.rapidapi.com"
+        self.rapidapi_host = RAPIDAPI_HOST
+        # Override to point at a local stand-in (see fake_rapidapi.py) for load testing
+        self.base_url = os.getenv('RAPIDAPI_BASE_URL', "https://upwork-jobs-api2.p.rapidapi.com").rstrip('/')
         
-        # Rate limiting settings
-        self.min_delay = 5  # Minimum delay between requests in seconds (increased from 2)
-        self.max_delay = 15  # Maximum delay between requests in seconds (increased from 10)
-        self.last_request_time = 0
+        # API keys from RAPIDAPI_KEYS (or the single RAPIDAPI_KEY, or a default one). Each key
+        # has its own token bucket that slows down further when the provider's quota headers
+        # or Retry-After ask for it; keys answering 401/403/429 are benched. The pool and
+        # breaker are shared by every scraper instance for this host.
+        self.key_pool = get_scraper_key_pool()
+        self.rapidapi_key = self.key_pool.keys[0].key
+        self.circuit_breaker = get_circuit_breaker(
+            self.rapidapi_host,
+            failure_threshold=int(os.getenv('SCRAPER_BREAKER_THRESHOLD', '3')),
+            reset_timeout=float(os.getenv('SCRAPER_BREAKER_COOLDOWN_SECONDS', '60'))
+        )
+        # Every call is logged for quota accounting and checked against the request budget;
+        # feed requests are attributed to this scraper's purpose ('user' or 'poll')
+        self.purpose = purpose
+        self.budget = get_request_budget()
+        # Longest a request may wait for the limiter or a Retry-After before failing fast
+        self.max_wait = float(os.getenv('SCRAPER_MAX_WAIT_SECONDS', '20'))
 
-        try:
-            self.nlp = spacy.load('en_core_web_sm')
-        except Exception:
-            os.system('python -m spacy download en_core_web_sm')
-            self.nlp = spacy.load('en_core_web_sm')
-
-    def _rate_limit(self):
-        """Implement rate limiting to avoid 429 errors"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.min_delay:
-            sleep_time = self.min_delay - time_since_last
-            logging.info(f"Rate limiting: waiting {sleep_time:.2f} seconds")
-            time.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
+        # Opt-in dump of the start of each raw feed response, capped in size
+        self.debug_payload = os.getenv('SCRAPER_DEBUG_PAYLOAD', '').lower() in ('1', 'true', 'yes')
+        self.debug_payload_max_chars = int(os.getenv('SCRAPER_DEBUG_PAYLOAD_MAX_CHARS', '2000'))
+
+        # Text cleaning mode: 'spacy' runs the full en_core_web_sm pipeline,
+        # 'fast' uses a rule-based sentencizer and a title heuristic instead
+        self.cleaning_mode = (cleaning_mode or os.getenv('SCRAPER_CLEANING_MODE', 'spacy')).lower()
+        if self.cleaning_mode not in CLEANING_MODES:
+            logging.warning(f"Unknown cleaning mode '{self.cleaning_mode}', falling back to 'spacy'")
+            self.cleaning_mode = 'spacy'
+
+        # Load the first pipeline for this mode now (once per process) rather than on the first job
+        with borrow_nlp(self.cleaning_mode):
+            pass
+
+    def is_available(self) -> bool:
+        """False while the circuit breaker is open, i.e. upstream calls would fail fast"""
+        return self.circuit_breaker.is_available()
 
-    def _make_request_with_retry(self, url: str, headers: dict, params: dict = None, max_retries: int = 3) -> Optional[requests.Response]:
-        """Make HTTP request with exponential backoff and retry logic"""
+    def _make_request_with_retry(self, url: str, headers: dict, params: dict = None, max_retries: int = 3,
+                                 stream: bool = False, endpoint: str = None,
+                                 purpose: str = None) -> Optional[requests.Response]:
+        """Make HTTP request with adaptive rate limiting, header-driven backoff and a circuit breaker"""
+        endpoint = endpoint or url.rsplit('/', 1)[-1]
+        purpose = purpose or self.purpose
+        if not self.budget.reserve(purpose):
+            logging.warning(f"Request budget for '{purpose}' calls is used up for today - skipping upstream request")
+            return None
+        if not self.circuit_breaker.allow_request():
+            self.budget.release(purpose)
+            logging.warning("Circuit breaker open - skipping upstream request")
+            return None
+
+        failure = None
+        # The budget reservation covers the first attempt; retries are logged as they happen
+        reserved = True
         for attempt in range(max_retries):
+            key = self.key_pool.acquire(max_wait=self.max_wait)
+            if key is None:
+                logging.warning(f"Next request slot is more than {self.max_wait:.0f}s away on every key - failing fast")
+                failure = "rate limit wait too long"
+                break
+            backoff = (2 ** attempt) + random.uniform(0, 1)
+            started = time.perf_counter()
             try:
-                self._rate_limit()
-                
-                response = requests.get(url, headers=headers, params=params, timeout=15)
-                
-                if response.status_code == 200:
-                    return response
-                elif response.status_code == 429:
-                    # Rate limited - wait longer
-                    wait_time = (2 ** attempt) + random.uniform(0, 1)
-                    logging.warning(f"Rate limited (429). Waiting {wait_time:.2f} seconds before retry {attempt + 1}/{max_retries}")
-                    time.sleep(wait_time)
-                else:
-                    logging.warning(f"API returned status {response.status_code}")
-                    if attempt < max_retries - 1:
-                        time.sleep(1)
-                    
+                response = requests.get(url, headers={**headers, "X-RapidAPI-Key": key.key}, params=params,
+                                        timeout=15, stream=stream)
             except requests.exceptions.RequestException as e:
+                self.budget.record(endpoint, purpose, None, (time.perf_counter() - started) * 1000,
+                                   reserved=reserved)
+                reserved = False
+                self.key_pool.report(key, None, backoff=backoff)
                 logging.error(f"Request error on attempt {attempt + 1}: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(1)
-        
+                failure = str(e)
+                continue
+
+            # Latency is time to response headers; streamed bodies are read afterwards
+            self.budget.record(endpoint, purpose, response.status_code,
+                               (time.perf_counter() - started) * 1000, response.headers, reserved=reserved)
+            reserved = False
+            self.key_pool.report(key, response.status_code, response.headers, backoff=backoff)
+            if response.status_code == 200:
+                self.circuit_breaker.record_success()
+                return response
+            response.close()
+
+            if response.status_code == 429:
+                # The key is benched until Retry-After (or the backoff); the next attempt uses another key
+                logging.warning(f"Rate limited (429) on key {key.label}. Next slot in "
+                                f"{self.key_pool.next_slot_in():.2f} seconds, retry {attempt + 1}/{max_retries}")
+                failure = "429 Too Many Requests"
+            elif response.status_code in (401, 403):
+                # Bad or unsubscribed key: benched, retry with another one
+                logging.warning(f"API returned status {response.status_code} for key {key.label}")
+                failure = f"status {response.status_code}"
+            elif response.status_code >= 500:
+                logging.warning(f"API returned status {response.status_code}")
+                failure = f"status {response.status_code}"
+            else:
+                # Other client errors (unknown job) will not succeed on retry
+                logging.warning(f"API returned status {response.status_code}")
+                self.circuit_breaker.record_success()
+                return None
+
+        if reserved:
+            self.budget.release(purpose)
+        self.circuit_breaker.record_failure(failure)
         return None
 
-    def search_jobs(self, keywords: List[str], max_jobs: int = 1, category_filter: str = None) -> List[Dict]:
+    def search_jobs(self, keywords: List[str], max_jobs: int = 1, category_filter: str = None,
+                    skip_raw: Callable[[Dict], bool] = None) -> List[Dict]:
         """
         Search for jobs using RapidAPI Upwork Jobs API. Returns professional error if API is unavailable.
+        Raw feed items for which skip_raw returns True are dropped before any cleaning.
         """
         all_jobs = []
         
         for keyword in keywords:
             logging.info(f"Searching for keyword: {keyword}")
-            jobs = self._search_jobs_primary(keyword, max_jobs, category_filter)
+            jobs = self._search_jobs_primary(keyword, max_jobs, category_filter, skip_raw)
             
             if jobs:
                 all_jobs.extend(jobs)
@@ -93,10 +211,48 @@ class UpworkScraper:
         
         return all_jobs
 
-    def _search_jobs_primary(self, keyword: str, max_jobs: int, category_filter: str = None) -> List[Dict]:
+    def iter_jobs(self, keyword: str, max_jobs: int, category_filter: str = None,
+                  skip_raw: Callable[[Dict], bool] = None) -> Iterator[Dict]:
+        """
+        Yield mapped jobs for a keyword as soon as each one has been parsed and cleaned
+        """
+        logging.info(f"Streaming jobs for keyword: {keyword}")
+        return self._iter_jobs_primary(keyword, max_jobs, category_filter, skip_raw)
+
+    def iter_raw_jobs(self, keyword: str, max_jobs: int, category_filter: str = None,
+                      skip_raw: Callable[[Dict], bool] = None) -> Iterator[Dict]:
+        """
+        Yield raw feed items for a keyword without cleaning or mapping them (see map_job)
+        """
+        logging.info(f"Streaming raw jobs for keyword: {keyword}")
+        return self._iter_raw_jobs_primary(keyword, max_jobs, category_filter, skip_raw)
+
+    def map_job(self, raw_job: Dict) -> Optional[Dict]:
+        """Clean and map one raw feed item, or None if it cannot be mapped"""
+        mapped = self._map_api_jobs([raw_job])
+        return mapped[0] if mapped else None
+
+    def _search_jobs_primary(self, keyword: str, max_jobs: int, category_filter: str = None,
+                             skip_raw: Callable[[Dict], bool] = None) -> List[Dict]:
         """
         Search using primary RapidAPI service
         """
+        return list(self._iter_jobs_primary(keyword, max_jobs, category_filter, skip_raw))
+
+    def _iter_jobs_primary(self, keyword: str, max_jobs: int, category_filter: str = None,
+                           skip_raw: Callable[[Dict], bool] = None) -> Iterator[Dict]:
+        """
+        Yield mapped jobs from the primary RapidAPI feed as they arrive
+        """
+        for job in self._iter_raw_jobs_primary(keyword, max_jobs, category_filter, skip_raw):
+            yield from self._map_api_jobs([job])
+
+    def _iter_raw_jobs_primary(self, keyword: str, max_jobs: int, category_filter: str = None,
+                               skip_raw: Callable[[Dict], bool] = None) -> Iterator[Dict]:
+        """
+        Stream-parse the primary RapidAPI feed and yield raw items as they arrive,
+        closing the connection once max_jobs have been collected
+        """
         url = f"{self.base_url}/active-freelance-1h"
         headers = {
             "X-RapidAPI-Key": self.rapidapi_key,
@@ -106,43 +262,78 @@ class UpworkScraper:
             "limit": max_jobs
         }
         
-        response = self._make_request_with_retry(url, headers, params)
+        response = self._make_request_with_retry(url, headers, params, stream=True, endpoint="active-freelance-1h")
         
         if response is None:
             logging.error("Failed to get response from primary API after all retries")
-            return []
+            return
         
+        fetched = 0
+        skipped = 0
+        raw_jobs = []
         try:
-            data = response.json()
-            print("RAW API DATA:", data)  # Debug print to show raw API response
-            # New API returns a list directly, not a dict with 'data' key
-            if isinstance(data, list):
-                jobs = data
-            else:
-                jobs = data.get("data", [])
-            logging.info(f"Fetched {len(jobs)} jobs from API for keyword '{keyword}' (no filtering applied).")
-            jobs = jobs[:max_jobs]
-            return self._map_api_jobs(jobs)
+            # The feed declares no charset, so decode explicitly to get text chunks
+            response.encoding = response.encoding or 'utf-8'
+            chunks = response.iter_content(chunk_size=16384, decode_unicode=True)
+            if self.debug_payload:
+                chunks = self._tee_debug_payload(chunks)
+            # New API returns a list directly, older responses wrap it in a 'data' key
+            for job in iter_json_array(chunks, key="data"):
+                if fetched >= max_jobs:
+                    break
+                if skip_raw and isinstance(job, dict) and skip_raw(job):
+                    skipped += 1
+                    continue
+                fetched += 1
+                raw_jobs.append(job)
+                yield job
+            logging.info(f"Fetched {fetched} jobs from API for keyword '{keyword}' ({skipped} skipped before mapping).")
         except Exception as e:
             logging.error(f"Error processing response from primary API: {e}")
-            return []
+        finally:
+            response.close()
+            # Keep the raw payloads so jobs can be re-mapped later without refetching
+            get_payload_archive().append(raw_jobs, source="feed")
+
+    def _tee_debug_payload(self, chunks: Iterator[str]) -> Iterator[str]:
+        """Pass chunks through, printing at most debug_payload_max_chars of the raw payload"""
+        preview = ''
+        printed = False
+        for chunk in chunks:
+            if not printed:
+                preview += chunk[:self.debug_payload_max_chars - len(preview)]
+                if len(preview) >= self.debug_payload_max_chars:
+                    print("RAW API DATA (truncated):", preview)
+                    printed = True
+            yield chunk
+        if not printed and preview:
+            print("RAW API DATA:", preview)
 
     def _clean_job_title(self, title: str) -> str:
+        if self.cleaning_mode == 'fast':
+            return self._clean_job_title_fast(title)
         # Use spaCy to extract the main noun chunk or just clean up extra symbols
-        doc = self.nlp(title)
-        noun_chunks = list(doc.noun_chunks)
-        if noun_chunks:
-            return noun_chunks[0].text.strip()
+        with borrow_nlp(self.cleaning_mode) as nlp:
+            noun_chunks = list(nlp(title).noun_chunks)
+            if noun_chunks:
+                return noun_chunks[0].text.strip()
         return title.strip()
 
+    def _clean_job_title_fast(self, title: str) -> str:
+        """Trim filler prefixes and trailing details from a title without parsing it"""
+        cleaned = _TITLE_FILLER_RE.sub('', title.strip())
+        cleaned = _TITLE_SPLIT_RE.split(cleaned, maxsplit=1)[0].strip(' -!.,')
+        return cleaned or title.strip()
+
     def _clean_job_description(self, desc: str) -> str:
-        # Use spaCy to extract the most relevant sentences (first 2-3)
-        doc = self.nlp(desc)
-        sentences = list(doc.sents)
-        if len(sentences) >= 2:
-            return ' '.join([sent.text.strip() for sent in sentences[:2]])
-        elif sentences:
-            return sentences[0].text.strip()
+        # Use spaCy to extract the most relevant sentences (first 2-3).
+        # In fast mode the pipeline only tokenizes and runs the rule-based sentencizer.
+        with borrow_nlp(self.cleaning_mode) as nlp:
+            sentences = list(nlp(desc).sents)
+            if len(sentences) >= 2:
+                return ' '.join([sent.text.strip() for sent in sentences[:2]])
+            elif sentences:
+                return sentences[0].text.strip()
         return desc.strip()
 
     def _extract_pay_rate(self, job: dict) -> float:
@@ -264,18 +455,34 @@ class UpworkScraper:
             return engagement.get('label', '')
         return ''
 
+    @staticmethod
+    def extract_job_id(url: str) -> Optional[str]:
+        """Extract the Upwork job id from a job URL, or None if the URL has none"""
+        job_id_match = JOB_URL_ID_RE.search(url or '')
+        return job_id_match.group(1) if job_id_match else None
+
+    @staticmethod
+    def job_url_for_id(job_id: str) -> str:
+        """Canonical job URL for an Upwork job id"""
+        return f"https://www.upwork.com/jobs/~{job_id}"
+
     def scrape_job_from_url(self, url: str) -> Optional[Dict]:
         """
         Scrape a specific job from URL using RapidAPI
         """
+        job_id = self.extract_job_id(url)
+        if not job_id:
+            return None
+        return self.fetch_job(job_id)
+
+    def fetch_job(self, job_id: str) -> Optional[Dict]:
+        """Fetch and map a single job by its Upwork id (one detail call under the shared rate limit)"""
+        job_data = self.fetch_raw_job(job_id)
+        return self.map_job(job_data) if job_data else None
+
+    def fetch_raw_job(self, job_id: str) -> Optional[Dict]:
+        """Fetch the raw detail payload of a job by its Upwork id"""
         try:
-            # Extract job ID from URL
-            job_id_match = re.search(r'/jobs/~([a-zA-Z0-9_]+)', url)
-            if not job_id_match:
-                return None
-            
-            job_id = job_id_match.group(1)
-            
             # Try to get job details from API
             api_url = f"{self.base_url}/job/{job_id}"
             headers = {
@@ -283,15 +490,18 @@ class UpworkScraper:
                 "X-RapidAPI-Host": self.rapidapi_host
             }
             
-            response = self._make_request_with_retry(api_url, headers)
+            response = self._make_request_with_retry(api_url, headers, endpoint="job", purpose="detail")
             
             if response is None:
                 logging.error("Failed to get job details from API after all retries")
                 return None
             
             job_data = response.json()
-            return self._map_api_jobs([job_data])[0] if job_data else None
+            if not isinstance(job_data, dict) or not job_data:
+                return None
+            get_payload_archive().append([job_data], source="detail")
+            return job_data
                 
         except Exception as e:
-            logging.error(f"Error scraping job from URL: {e}")
+            logging.error(f"Error fetching job {job_id}: {e}")
             return None
\ No newline at end of file
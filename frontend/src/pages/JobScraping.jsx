@@ -1,5 +1,5 @@
 import { useState, useEffect } from 'react';
-import { scrapeJobs, getScrapedJobs, clearScrapedJobs } from '../services/api';
+import { scrapeJobsStream, getScrapedJobs, clearScrapedJobs } from '../services/api';
 
 const JobScraping = () => {
   const [keywords, setKeywords] = useState('');
@@ -8,12 +8,14 @@ const JobScraping = () => {
   const [scrapedJobs, setScrapedJobs] = useState([]);
   const [error, setError] = useState('');
   const [success, setSuccess] = useState('');
+  const [progress, setProgress] = useState('');
 
   const handleSubmit = async (e) => {
     e.preventDefault();
     setIsLoading(true);
     setError('');
     setSuccess('');
+    setProgress('');
 
     try {
       const keywordList = keywords.split('\n').filter(k => k.trim());
@@ -22,15 +24,23 @@ const JobScraping = () => {
         return;
       }
 
-      const response = await scrapeJobs({
+      // Show jobs as soon as the backend stores them instead of waiting for every keyword
+      setScrapedJobs([]);
+      await scrapeJobsStream({
         keywords: keywordList,
         max_jobs_per_keyword: maxJobs
+      }, (event) => {
+        if (event.type === 'job') {
+          setScrapedJobs(prev => [...prev, event.job]);
+        } else if (event.type === 'progress') {
+          setProgress(`Finished request ${event.keyword_index} of ${event.keywords_total} ("${event.keyword}"): ${event.found} jobs`);
+        } else if (event.type === 'done') {
+          // Simplified message: jobs are not filtered by keyword anymore
+          setSuccess(`Scraped ${event.total_count} jobs (no keyword filtering applied).`);
+        } else if (event.type === 'error') {
+          setError(event.detail || 'Failed to scrape jobs');
+        }
       });
-
-      // Simplified message: jobs are not filtered by keyword anymore
-      const message = `Scraped ${response.total_count} jobs (no keyword filtering applied).`;
-      setSuccess(message);
-      setScrapedJobs(response.jobs);
       
       // Refresh the scraped jobs list
       loadScrapedJobs();
@@ -38,6 +48,7 @@ const JobScraping = () => {
       setError(err.message || 'Failed to scrape jobs');
     } finally {
       setIsLoading(false);
+      setProgress('');
     }
   };
 
@@ -120,6 +131,10 @@ const JobScraping = () => {
           </button>
         </form>
 
+        {isLoading && progress && (
+          <p className="mt-4 text-sm text-gray-600">{progress}</p>
+        )}
+
         {error && (
           <div className="mt-4 p-3 bg-red-50 border border-red-200 rounded-md">
             <p className="text-red-700 text-sm">{error}</p>
@@ -65,9 +65,12 @@ export const jobsAPI = {
   // Scrape jobs
   scrape: (scrapingData) => api.post('/jobs/scrape', scrapingData),
   
-  // Get scraped jobs
-  getScraped: (limit = 50) => api.get(`/jobs/scraped?limit=${limit}`),
+  // Get scraped jobs (filters: category, min_pay_rate, min_client_rating, posted_after, posted_before, skill, cursor)
+  getScraped: (limit = 50, filters = {}) => api.get('/jobs/scraped', { params: { limit, ...filters } }),
   
+  // Full-text search over scraped jobs (best match first)
+  search: (q, limit = 20, cursor = null) => api.get('/jobs/search', { params: { q, limit, ...(cursor ? { cursor } : {}) } }),
+
   // Clear scraped jobs
   clearScraped: () => api.delete('/jobs/scraped'),
   
@@ -80,9 +83,40 @@ export const jobsAPI = {
 
 // Convenience functions for job scraping
 export const scrapeJobs = (scrapingData) => jobsAPI.scrape(scrapingData).then(response => response.data);
-export const getScrapedJobs = (limit = 50) => jobsAPI.getScraped(limit).then(response => response.data);
+export const getScrapedJobs = (limit = 50, filters = {}) => jobsAPI.getScraped(limit, filters).then(response => response.data);
+// One page of scraped jobs plus the cursor for the next page (null on the last page)
+export const getScrapedJobsPage = (limit = 50, filters = {}) => jobsAPI.getScraped(limit, filters)
+  .then(response => ({ jobs: response.data, nextCursor: response.headers['x-next-cursor'] || null }));
 export const clearScrapedJobs = () => jobsAPI.clearScraped().then(response => response.data);
 
+// Stream scrape results as NDJSON events ('job', 'progress', 'done', 'error').
+// onEvent is called for each event as soon as the backend has stored it.
+export const scrapeJobsStream = async (scrapingData, onEvent) => {
+  const response = await fetch(`${api.defaults.baseURL}/jobs/scrape/stream`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(scrapingData),
+  });
+  if (!response.ok || !response.body) {
+    throw new Error(`Scrape request failed with status ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  for (;;) {
+    const { done, value } = await reader.read();
+    buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+    const lines = buffer.split('\n');
+    buffer = lines.pop();
+    for (const line of lines) {
+      if (line.trim()) onEvent(JSON.parse(line));
+    }
+    if (done) break;
+  }
+  if (buffer.trim()) onEvent(JSON.parse(buffer));
+};
+
 // Proposals API
 export const proposalsAPI = {
   // Generate proposal